@@ -0,0 +1,67 @@
+"""
+Startup-time benchmark for the doc-scraper and doc-scraper-fc CLIs.
+
+Runs each lightweight command in a fresh interpreter several times and
+reports the wall time, plus any heavy dependency the command imported.
+
+    python benchmarks/bench_startup.py --runs 20
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Modules a `version` / `--help` / config check must not pull in
+HEAVY_MODULES = ["requests", "bs4", "markdownify", "firecrawl", "pydantic_settings", "dotenv"]
+
+COMMANDS = [
+    ("doc-scraper version", ROOT, ["-m", "doc_scraper.cli", "version"]),
+    ("doc-scraper --help", ROOT, ["-m", "doc_scraper.cli", "--help"]),
+    ("doc-scraper-fc version", ROOT / "doc_scraper_fc", ["cli.py", "version"]),
+    ("doc-scraper-fc --help", ROOT / "doc_scraper_fc", ["cli.py", "--help"]),
+    ("doc-scraper-fc validate-config", ROOT / "doc_scraper_fc", ["cli.py", "validate-config"]),
+]
+
+def time_command(cwd: Path, args, runs: int):
+    """Wall-clock seconds for each run of the command."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, *args], cwd=cwd, check=True,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def heavy_imports(cwd: Path, args):
+    """Heavy modules imported while running the command."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args], cwd=cwd,
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    )
+    imported = {line.rsplit("|", 1)[-1].strip() for line in result.stderr.splitlines()}
+    return [module for module in HEAVY_MODULES if module in imported]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10, help="Runs per command")
+    args = parser.parse_args()
+
+    baseline = time_command(ROOT, ["-c", "pass"], args.runs)
+    print(f"{'interpreter only':32} median {statistics.median(baseline) * 1000:7.1f} ms")
+    for name, cwd, command in COMMANDS:
+        timings = time_command(cwd, command, args.runs)
+        heavy = heavy_imports(cwd, command)
+        print(
+            f"{name:32} median {statistics.median(timings) * 1000:7.1f} ms"
+            f"  min {min(timings) * 1000:7.1f} ms"
+            f"  heavy imports: {', '.join(heavy) or 'none'}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,12 @@
 import typer
 from pathlib import Path
-from typing import Optional
-from rich.console import Console
+from typing import List, Optional
 
-from .scraper import main as scraper_main
+# Keep module import light: the scraper (requests, bs4, markdownify, pydantic)
+# and rich are only imported by the commands that need them, so `version`
+# and `--help` start fast.
 
 app = typer.Typer(help="Documentation scraper CLI")
-console = Console()
 
 @app.command()
 def scrape(
@@ -20,22 +20,277 @@ def scrape(
         None,
         "--config", "-c",
         help="Path to configuration file"
+    ),
+    duplicates: Optional[str] = typer.Option(
+        None,
+        "--duplicates",
+        help="Drop or link near-duplicate pages ('drop' or 'link')"
+    ),
+    metrics: Optional[Path] = typer.Option(
+        None,
+        "--metrics",
+        help="Write a JSON summary of per-stage metrics to this file"
+    ),
+    prometheus: Optional[Path] = typer.Option(
+        None,
+        "--prometheus",
+        help="Write run metrics in Prometheus text format to this file"
+    ),
+    profile: Optional[Path] = typer.Option(
+        None,
+        "--profile",
+        help="Sample all threads during the run and write collapsed stacks (flamegraph input) to this file"
+    ),
+    quiet: bool = typer.Option(
+        False,
+        "--quiet", "-q",
+        help="Log through a background queue and print periodic summaries instead of a line per page"
+    ),
+    snapshot: Optional[Path] = typer.Option(
+        None,
+        "--snapshot",
+        help="Record a hash per page section in this JSON Lines file for `diff`"
+    ),
+    link_graph: Optional[Path] = typer.Option(
+        None,
+        "--link-graph",
+        help="Export the link graph with page scores to this JSON file; an existing one orders the crawl"
+    ),
+    max_pages: int = typer.Option(
+        0,
+        "--max-pages",
+        help="Stop after this many pages (0 = unlimited)"
     )
 ):
     """
     Scrape documentation from a website.
     """
+    from rich.console import Console
+    from .scraper import main as scraper_main
+
+    try:
+        scraper_main(
+            url,
+            str(output_dir) if output_dir else None,
+            duplicates,
+            str(metrics) if metrics else None,
+            str(prometheus) if prometheus else None,
+            str(profile) if profile else None,
+            quiet,
+            str(snapshot) if snapshot else None,
+            str(link_graph) if link_graph else None,
+            max_pages
+        )
+    except Exception as e:
+        Console().print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+
+@app.command("scrape-all")
+def scrape_all(
+    config: Optional[Path] = typer.Option(
+        None,
+        "--config", "-c",
+        help="Site profiles file (defaults to the bundled sites_config.yaml)"
+    ),
+    output_dir: Optional[Path] = typer.Option(
+        None,
+        "--output-dir", "-o",
+        help="Directory for the per-site outputs and the run summary"
+    ),
+    site: Optional[List[str]] = typer.Option(
+        None,
+        "--site", "-s",
+        help="Only crawl these profiles (repeatable)"
+    ),
+    max_workers: int = typer.Option(
+        10,
+        "--max-workers", "-w",
+        help="Maximum concurrent requests across all sites"
+    ),
+    max_sites: Optional[int] = typer.Option(
+        None,
+        "--max-sites",
+        help="Maximum number of sites crawled at the same time"
+    ),
+    quiet: bool = typer.Option(
+        False,
+        "--quiet", "-q",
+        help="Log through a background queue and print periodic summaries instead of a line per page"
+    )
+):
+    """
+    Crawl every site profile concurrently from one process.
+    """
+    import json
+    from rich.console import Console
+    from .logs import setup_logging, stop_logging
+    from .sites import DEFAULT_SITES_CONFIG, load_site_profiles, scrape_all as run_all
+
+    console = Console()
+    setup_logging(quiet=quiet)
+    try:
+        profiles = load_site_profiles(config or DEFAULT_SITES_CONFIG, output_dir, site)
+        if not profiles:
+            console.print("[yellow]No site profiles with a base_url found.[/yellow]")
+            raise typer.Exit(1)
+        summary_dir = output_dir or next(iter(profiles.values())).save_dir
+        summary_dir.mkdir(parents=True, exist_ok=True)
+        summary_file = summary_dir / "run_summary.json"
+        summary = run_all(profiles, max_workers, max_sites, summary_file, show_progress=True)
+    except typer.Exit:
+        raise
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+    finally:
+        stop_logging()
+
+    console.print(json.dumps(summary["totals"], indent=2))
+    console.print(f"\nRun summary saved at: {summary_file}")
+    if summary["totals"]["failed"]:
+        raise typer.Exit(1)
+
+@app.command()
+def worker(
+    url: str = typer.Argument(..., help="URL of the documentation site to scrape"),
+    frontier: Path = typer.Option(
+        ...,
+        "--frontier", "-f",
+        help="Shared SQLite crawl store (created if missing)"
+    ),
+    worker_id: Optional[str] = typer.Option(
+        None,
+        "--worker-id",
+        help="Name of this worker in the store (defaults to host-pid)"
+    ),
+    lease_seconds: float = typer.Option(
+        300.0,
+        "--lease-seconds",
+        help="Seconds before an unfinished URL is handed to another worker"
+    ),
+    max_workers: int = typer.Option(
+        10,
+        "--max-workers", "-w",
+        help="Concurrent requests in this worker"
+    ),
+    metrics: Optional[Path] = typer.Option(
+        None,
+        "--metrics",
+        help="Write a JSON summary of this worker's per-stage metrics to this file"
+    ),
+    profile: Optional[Path] = typer.Option(
+        None,
+        "--profile",
+        help="Sample all threads during the run and write collapsed stacks (flamegraph input) to this file"
+    ),
+    quiet: bool = typer.Option(
+        False,
+        "--quiet", "-q",
+        help="Log through a background queue and print periodic summaries instead of a line per page"
+    )
+):
+    """
+    Run one distributed crawl worker against a shared frontier.
+
+    Start the same command on as many processes or hosts as needed; pages
+    are collected in the store and written out with `export`.
+    """
+    import json
+    from rich.console import Console
+    from .distributed import DistributedScraper, SQLiteCrawlStore
+    from .logs import setup_logging, stop_logging
+    from .profiling import SamplingProfiler
+    from .scraper import ScraperSettings
+
+    console = Console()
+    setup_logging(quiet=quiet)
+    profiler = SamplingProfiler().start() if profile else None
     try:
-        scraper_main(url, str(output_dir) if output_dir else None)
+        settings = ScraperSettings(base_url=url, max_workers=max_workers, metrics_file=metrics)
+        store = SQLiteCrawlStore(frontier, lease_seconds=lease_seconds)
+        DistributedScraper(settings, store, worker_id=worker_id).scrape()
+        console.print(json.dumps(store.stats(), indent=2))
+        store.close()
     except Exception as e:
         console.print(f"[red]Error: {e}[/red]")
         raise typer.Exit(1)
+    finally:
+        stop_logging()
+        if profiler:
+            profiler.stop()
+            report = profiler.write_report(profile)
+            console.print(f"Profile written to: {report['folded']} (summary: {report['summary']})")
+
+@app.command()
+def export(
+    output_file: Path = typer.Argument(..., help="Markdown file to write"),
+    frontier: Path = typer.Option(
+        ...,
+        "--frontier", "-f",
+        help="Shared SQLite crawl store written by the workers"
+    )
+):
+    """
+    Write the pages collected by distributed workers to one markdown file.
+    """
+    from rich.console import Console
+    from .distributed import SQLiteCrawlStore
+
+    console = Console()
+    if not frontier.exists():
+        console.print(f"[red]Error: crawl store not found: {frontier}[/red]")
+        raise typer.Exit(1)
+    store = SQLiteCrawlStore(frontier)
+    stats = store.stats()
+    if stats["pending"] or stats["leased"]:
+        console.print(
+            f"[yellow]Crawl still in progress ({stats['pending']} pending, "
+            f"{stats['leased']} leased); exporting pages collected so far.[/yellow]"
+        )
+    count = store.export(output_file)
+    store.close()
+    console.print(f"\n{count} pages saved at: {output_file}")
+
+@app.command()
+def diff(
+    old_snapshot: Path = typer.Argument(..., help="Snapshot of the earlier run"),
+    new_snapshot: Path = typer.Argument(..., help="Snapshot of the later run"),
+    output: Optional[Path] = typer.Option(
+        None,
+        "--output", "-o",
+        help="Write the JSON report to this file instead of stdout"
+    )
+):
+    """
+    Report the pages and sections added, removed or modified between two runs.
+    """
+    import json
+    from rich.console import Console
+    from .snapshots import diff_snapshots
+
+    console = Console(stderr=True)
+    try:
+        report = diff_snapshots(old_snapshot, new_snapshot)
+    except (OSError, ValueError, KeyError) as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+
+    if output:
+        output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    else:
+        typer.echo(json.dumps(report, indent=2))
+    pages, sections = report["pages"], report["sections"]
+    console.print(
+        f"Pages: {pages['added']} added, {pages['removed']} removed, {pages['modified']} modified, "
+        f"{pages['unchanged']} unchanged; sections: {sections['added']} added, "
+        f"{sections['removed']} removed, {sections['modified']} modified"
+    )
 
 @app.command()
 def version():
     """Show the version of doc-scraper."""
     from . import __version__
-    console.print(f"doc-scraper version: {__version__}")
+    typer.echo(f"doc-scraper version: {__version__}")
 
 if __name__ == "__main__":
-    app() 
\ No newline at end of file
+    app()
@@ -0,0 +1,186 @@
+"""
+HTML to markdown with a fast path for code blocks and tables.
+"""
+import re
+import secrets
+from typing import Dict, List, Optional, Sequence
+
+from bs4 import Comment, NavigableString, Tag
+from markdownify import MarkdownConverter
+
+# Matches the code_blocks selectors of the Firecrawl scraper configuration
+CODE_SELECTORS = ["pre", ".highlight"]
+
+_LANGUAGE_RE = re.compile(r"^(?:language|lang|highlight|sourceCode)-([\w+#.-]+)$")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+def code_language(element: Tag) -> Optional[str]:
+    """Language hint from ``language-x``, ``lang-x`` or ``highlight-x`` classes.
+
+    The block itself, its ``code`` child and the wrapper around it are checked,
+    covering Prism, highlight.js, Sphinx and Pygments markup.
+    """
+    candidates = [element, element.find("code"), element.parent]
+    for candidate in candidates:
+        if not isinstance(candidate, Tag):
+            continue
+        if candidate.get("data-language"):
+            return candidate["data-language"]
+        for css_class in candidate.get("class") or []:
+            match = _LANGUAGE_RE.match(css_class)
+            if match and match.group(1) not in ("default", "none", "text"):
+                return match.group(1)
+    return None
+
+def code_block(element: Tag) -> str:
+    """Fenced markdown for a ``pre`` or highlighter wrapper element."""
+    language = code_language(element)
+    # Pygments tables put line numbers in their own cell
+    pre = element.select_one("td.code pre") or (element if element.name == "pre" else element.find("pre")) or element
+    for line_number in pre.select(".linenos, .lineno"):
+        line_number.decompose()
+    code = pre.get_text().strip("\n")
+    longest = max((len(run) for run in re.findall(r"`+", code)), default=0)
+    fence = "`" * max(3, longest + 1)
+    return f"{fence}{language or ''}\n{code}\n{fence}"
+
+def _is_code_block(element: Tag) -> bool:
+    """Whether a code selector match is a block: a ``pre`` or a wrapper around one."""
+    return element.name == "pre" or element.find("pre") is not None
+
+def _inline(node: Tag) -> str:
+    """Markdown for the inline content of a table cell."""
+    parts = []
+    for child in node.children:
+        if isinstance(child, Comment):
+            continue
+        if isinstance(child, NavigableString):
+            parts.append(str(child))
+        elif child.name in ("script", "style"):
+            continue
+        elif child.name == "br":
+            parts.append(" ")
+        elif child.name == "code":
+            parts.append(f"`{child.get_text()}`")
+        elif child.name == "a" and child.get("href"):
+            parts.append(f"[{_inline(child).strip()}]({child['href']})")
+        elif child.name in ("strong", "b"):
+            parts.append(f"**{_inline(child).strip()}**")
+        elif child.name in ("em", "i"):
+            parts.append(f"*{_inline(child).strip()}*")
+        else:
+            parts.append(_inline(child))
+    return "".join(parts)
+
+def _cell(cell: Tag) -> str:
+    return _WHITESPACE_RE.sub(" ", _inline(cell)).strip().replace("|", "\\|")
+
+def pipe_table(table: Tag) -> Optional[str]:
+    """Pipe table for a simple table, or None if it needs the full converter.
+
+    Nested tables and block code (which a pipe table cannot hold) are left to
+    markdownify.
+    """
+    if table.find(["table", "pre"]):
+        return None
+    rows = []
+    header = None
+    for tr in table.find_all("tr"):
+        cells = []
+        tags = tr.find_all(["th", "td"], recursive=False)
+        for cell in tags:
+            cells.append(_cell(cell))
+            # Keep columns aligned under cells spanning several columns
+            span = str(cell.get("colspan", "1"))
+            if span.isdigit() and int(span) > 1:
+                cells.extend([""] * (int(span) - 1))
+        if not cells:
+            continue
+        is_header = tr.find_parent("thead") is not None or all(tag.name == "th" for tag in tags)
+        if header is None and not rows and is_header:
+            header = cells
+        else:
+            rows.append(cells)
+    if not rows and header is None:
+        return None
+    width = max(len(row) for row in ([header] if header else []) + rows)
+    # Like markdownify, a table without header cells gets an empty header row
+    header = header or [""] * width
+    lines = [header + [""] * (width - len(header)), ["---"] * width]
+    lines += [row + [""] * (width - len(row)) for row in rows]
+    return "\n".join("| " + " | ".join(row) + " |" for row in lines)
+
+class FastMarkdownConverter:
+    """Convert a content element, handling code blocks and tables natively.
+
+    Code blocks and simple tables are cut out of the tree and replaced by
+    placeholder paragraphs before markdownify runs, so the general converter
+    never walks their (often huge) subtrees. The placeholders are alphanumeric
+    so markdownify's escaping leaves them intact, and the rendered blocks are
+    spliced back in afterwards with the placeholder's indentation (list items,
+    blockquotes). The element is converted in place, without serializing it
+    back to HTML and parsing it again.
+
+    The element is modified; convert a copy if the tree is needed afterwards.
+    """
+
+    def __init__(self, code_selectors: Sequence[str] = CODE_SELECTORS, **markdownify_options):
+        self.code_selectors = list(code_selectors)
+        self.converter = MarkdownConverter(**markdownify_options)
+
+    def _code_elements(self, element: Tag) -> List[Tag]:
+        found = []
+        for selector in self.code_selectors:
+            for match in element.select(selector):
+                # A selector such as "pre code" matches inside the block
+                if match.name == "code" and match.parent is not None and match.parent.name == "pre":
+                    match = match.parent
+                # Highlighters also mark inline spans (e.g. a search hit as .highlight)
+                if _is_code_block(match):
+                    found.append(match)
+        # Only the outermost blocks: a .highlight wrapper owns its pre
+        ids = {id(match) for match in found}
+        outermost, seen = [], set()
+        for match in found:
+            if id(match) in seen or any(id(parent) in ids for parent in match.parents):
+                continue
+            # Code in a table cell stays put; the table goes through markdownify
+            if match.find_parent("table") is not None:
+                continue
+            seen.add(id(match))
+            outermost.append(match)
+        return outermost
+
+    def convert(self, element: Tag) -> str:
+        nonce = secrets.token_hex(4)
+        blocks: Dict[str, str] = {}
+
+        def replace(node: Tag, markdown: str) -> None:
+            token = f"mdblock{nonce}x{len(blocks)}"
+            blocks[token] = markdown
+            placeholder = Tag(name="p")
+            placeholder.string = token
+            node.replace_with(placeholder)
+
+        for node in self._code_elements(element):
+            replace(node, code_block(node))
+        for table in element.find_all("table"):
+            if table.parent is None or table.find_parent("table"):
+                continue
+            if any(_is_code_block(match) for selector in self.code_selectors for match in table.select(selector)):
+                continue
+            markdown = pipe_table(table)
+            if markdown is not None:
+                replace(table, markdown)
+
+        # Block-level whitespace around the element is only trimmed for a
+        # document root; trim it here to match markdownify(str(element))
+        markdown = self.converter.convert_soup(element).strip("\n")
+        if not blocks:
+            return markdown
+
+        def splice(match: re.Match) -> str:
+            prefix, token = match.group(1), match.group(2)
+            return "\n".join(prefix + line if line else prefix.rstrip() for line in blocks[token].split("\n"))
+
+        return re.sub(rf"^([ \t>]*)(mdblock{nonce}x\d+)[ \t]*$", splice, markdown, flags=re.MULTILINE)
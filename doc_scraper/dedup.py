@@ -0,0 +1,122 @@
+"""
+Near-duplicate page detection using SimHash fingerprints.
+"""
+import hashlib
+import re
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+_WORD_RE = re.compile(r"\w+")
+
+def simhash(text: str, shingle_size: int = 3) -> int:
+    """Compute a 64-bit SimHash fingerprint over word shingles of the text."""
+    words = _WORD_RE.findall(text.lower())
+    if len(words) <= shingle_size:
+        shingles = {" ".join(words)}
+    else:
+        shingles = {
+            " ".join(words[i:i + shingle_size])
+            for i in range(len(words) - shingle_size + 1)
+        }
+
+    digests = [
+        hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest()
+        for shingle in shingles
+    ]
+
+    # Count byte values per position instead of looping over every bit of
+    # every shingle; the per-bit weights are derived from at most 256 values.
+    fingerprint = 0
+    for position in range(8):
+        ones = [0] * 8
+        for value, count in Counter(d[position] for d in digests).items():
+            for bit in range(8):
+                if value >> bit & 1:
+                    ones[bit] += count
+        for bit in range(8):
+            if ones[bit] * 2 > len(digests):
+                fingerprint |= 1 << (position * 8 + bit)
+    return fingerprint
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two fingerprints."""
+    return bin(a ^ b).count("1")
+
+class NearDuplicateIndex:
+    """Thread-safe SimHash index for spotting near-duplicate pages.
+
+    Fingerprints are split into ``max_distance + 1`` bands. Two fingerprints
+    within ``max_distance`` bits of each other must agree on at least one band,
+    so a lookup only compares against pages sharing a band value instead of
+    scanning the whole index.
+    """
+
+    def __init__(self, max_distance: int = 3, shingle_size: int = 3, min_words: int = 20):
+        if not 0 <= max_distance < 64:
+            raise ValueError("max_distance must be between 0 and 63")
+        self.max_distance = max_distance
+        self.shingle_size = shingle_size
+        self.min_words = min_words
+        self.pages_indexed = 0
+        self.duplicates: List[Dict] = []
+        self._lock = threading.Lock()
+        self._bands = self._band_masks(max_distance + 1)
+        self._tables: List[Dict[int, List[Tuple[int, str]]]] = [{} for _ in self._bands]
+
+    @staticmethod
+    def _band_masks(count: int) -> List[Tuple[int, int]]:
+        """Split 64 bits into ``count`` contiguous (shift, mask) bands."""
+        bands = []
+        shift = 0
+        for i in range(count):
+            width = 64 // count + (1 if i < 64 % count else 0)
+            bands.append((shift, (1 << width) - 1))
+            shift += width
+        return bands
+
+    def find(self, fingerprint: int) -> Optional[Tuple[str, int]]:
+        """Return the closest indexed (url, distance) within the threshold."""
+        best = None
+        for (shift, mask), table in zip(self._bands, self._tables):
+            for other, url in table.get(fingerprint >> shift & mask, ()):
+                distance = hamming_distance(fingerprint, other)
+                if distance <= self.max_distance and (best is None or distance < best[1]):
+                    best = (url, distance)
+                    if distance == 0:
+                        return best
+        return best
+
+    def add(self, url: str, text: str) -> Optional[str]:
+        """Index a page and return the URL it duplicates, or None if it is new.
+
+        Pages with fewer than ``min_words`` words are never flagged.
+        """
+        if len(_WORD_RE.findall(text)) < self.min_words:
+            return None
+
+        fingerprint = simhash(text, self.shingle_size)
+        with self._lock:
+            match = self.find(fingerprint)
+            if match:
+                self.duplicates.append({
+                    "url": url,
+                    "duplicate_of": match[0],
+                    "distance": match[1],
+                })
+                return match[0]
+
+            for (shift, mask), table in zip(self._bands, self._tables):
+                table.setdefault(fingerprint >> shift & mask, []).append((fingerprint, url))
+            self.pages_indexed += 1
+            return None
+
+    def report(self) -> Dict:
+        """Summary of the run suitable for JSON serialization."""
+        with self._lock:
+            return {
+                "pages_indexed": self.pages_indexed,
+                "duplicate_count": len(self.duplicates),
+                "max_distance": self.max_distance,
+                "duplicates": list(self.duplicates),
+            }
@@ -0,0 +1,280 @@
+"""
+Distributed crawling: workers share a frontier, visited set and page store.
+"""
+import logging
+import os
+import socket
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from .scraper import DocsScraper, PageSkipped, ScraperSettings, format_page
+
+logger = logging.getLogger(__name__)
+
+class CrawlStore(ABC):
+    """Shared crawl state for distributed workers.
+
+    A store holds every URL ever discovered (the frontier plus the visited
+    set) and the pages produced by the workers. URLs are handed out as
+    time-limited leases: a worker that dies without completing its URLs
+    simply lets the lease expire and another worker picks them up.
+    Implement this interface to back a crawl with a networked database.
+    """
+
+    @abstractmethod
+    def add(self, urls: Iterable[str]) -> int:
+        """Queue URLs not seen before; returns how many were new."""
+
+    @abstractmethod
+    def lease(self, worker_id: str, limit: int) -> List[str]:
+        """Lease up to ``limit`` pending (or expired) URLs to a worker."""
+
+    @abstractmethod
+    def complete(self, url: str, worker_id: str, content: Optional[str] = None) -> None:
+        """Mark a leased URL as done, storing its page content if any."""
+
+    @abstractmethod
+    def fail(self, url: str, worker_id: str) -> None:
+        """Give a leased URL back, or mark it failed after too many attempts."""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, int]:
+        """Number of URLs per state, plus stored pages."""
+
+    @abstractmethod
+    def pages(self) -> Iterator[Tuple[str, str]]:
+        """Stored (url, content) pairs in discovery order."""
+
+    def is_done(self) -> bool:
+        """True once nothing is pending or leased."""
+        stats = self.stats()
+        return not stats.get("pending") and not stats.get("leased")
+
+    def export(self, output_file: Union[str, Path]) -> int:
+        """Write all stored pages to one markdown file; returns the page count."""
+        count = 0
+        with open(output_file, "w", encoding="utf-8") as f:
+            for url, content in self.pages():
+                f.write(format_page(url, content))
+                count += 1
+        return count
+
+class SQLiteCrawlStore(CrawlStore):
+    """Crawl store in a SQLite database shared by worker processes.
+
+    Suitable for workers on one machine (or a filesystem with reliable
+    locking). Writes use ``BEGIN IMMEDIATE`` transactions so two workers
+    can never lease the same URL, and WAL mode keeps readers unblocked.
+    A connection is bound to the thread that created the store.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS urls (
+            url TEXT PRIMARY KEY,
+            state TEXT NOT NULL DEFAULT 'pending',
+            worker TEXT,
+            lease_expires REAL,
+            attempts INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE INDEX IF NOT EXISTS urls_state ON urls (state, lease_expires);
+        CREATE TABLE IF NOT EXISTS pages (
+            url TEXT PRIMARY KEY,
+            worker TEXT,
+            content TEXT NOT NULL,
+            saved_at REAL NOT NULL
+        );
+    """
+
+    def __init__(self, path: Union[str, Path], lease_seconds: float = 300.0, max_attempts: int = 3):
+        self.path = Path(path)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.conn = sqlite3.connect(str(self.path), timeout=60, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.SCHEMA)
+
+    def _transaction(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def add(self, urls: Iterable[str]) -> int:
+        urls = [(url,) for url in urls]
+        if not urls:
+            return 0
+        conn = self._transaction()
+        try:
+            before = conn.total_changes
+            conn.executemany("INSERT OR IGNORE INTO urls (url) VALUES (?)", urls)
+            added = conn.total_changes - before
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return added
+
+    def lease(self, worker_id: str, limit: int) -> List[str]:
+        now = time.time()
+        conn = self._transaction()
+        try:
+            # Expired leases that already used up their attempts are given up
+            conn.execute(
+                "UPDATE urls SET state = 'failed', worker = NULL, lease_expires = NULL "
+                "WHERE state = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (now, self.max_attempts)
+            )
+            urls = [row[0] for row in conn.execute(
+                "SELECT url FROM urls WHERE state = 'pending' "
+                "OR (state = 'leased' AND lease_expires < ?) ORDER BY rowid LIMIT ?",
+                (now, limit)
+            )]
+            conn.executemany(
+                "UPDATE urls SET state = 'leased', worker = ?, lease_expires = ?, "
+                "attempts = attempts + 1 WHERE url = ?",
+                [(worker_id, now + self.lease_seconds, url) for url in urls]
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return urls
+
+    def complete(self, url: str, worker_id: str, content: Optional[str] = None) -> None:
+        conn = self._transaction()
+        try:
+            updated = conn.execute(
+                "UPDATE urls SET state = 'done', lease_expires = NULL WHERE url = ? AND worker = ?",
+                (url, worker_id)
+            ).rowcount
+            # A worker whose lease was taken over must not overwrite the page
+            if content is not None and updated == 1:
+                conn.execute(
+                    "INSERT OR REPLACE INTO pages (url, worker, content, saved_at) VALUES (?, ?, ?, ?)",
+                    (url, worker_id, content, time.time())
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def fail(self, url: str, worker_id: str) -> None:
+        conn = self._transaction()
+        try:
+            conn.execute(
+                "UPDATE urls SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "worker = NULL, lease_expires = NULL WHERE url = ? AND worker = ?",
+                (self.max_attempts, url, worker_id)
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def stats(self) -> Dict[str, int]:
+        stats = {"pending": 0, "leased": 0, "done": 0, "failed": 0}
+        stats.update(dict(self.conn.execute("SELECT state, COUNT(*) FROM urls GROUP BY state")))
+        stats["pages"] = self.conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+        return stats
+
+    def pages(self) -> Iterator[Tuple[str, str]]:
+        yield from self.conn.execute(
+            "SELECT pages.url, pages.content FROM pages JOIN urls ON urls.url = pages.url ORDER BY urls.rowid"
+        )
+
+    def close(self) -> None:
+        self.conn.close()
+
+class DistributedScraper(DocsScraper):
+    """Scraper worker that pulls URLs from a shared crawl store.
+
+    Any number of workers, in separate processes or on separate hosts, can
+    run against the same store. Each one leases a batch of URLs, processes
+    it with its own thread pool and pushes new links and page content back.
+    Only the thread running ``scrape`` talks to the store.
+    """
+
+    def __init__(
+        self,
+        settings: ScraperSettings,
+        store: CrawlStore,
+        worker_id: Optional[str] = None,
+        poll_interval: float = 2.0,
+        **kwargs
+    ):
+        kwargs.setdefault("show_progress", False)
+        super().__init__(settings, **kwargs)
+        self.store = store
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.poll_interval = poll_interval
+        self._contents: Dict[str, str] = {}
+        self._fetch_failed: Set[str] = set()
+
+    def fetch_page(self, url):
+        """Fetch a page, remembering URLs whose fetch failed for good.
+
+        ``process_page`` logs and swallows errors, so the failure is recorded
+        here for ``scrape`` to hand the URL back to the store for a retry.
+        """
+        try:
+            return super().fetch_page(url)
+        except PageSkipped:
+            raise
+        except Exception:
+            with self.content_lock:
+                self._fetch_failed.add(url)
+            raise
+
+    def save_content(self, url: str, content: str):
+        """Hold the page until its URL is completed in the store."""
+        self._contents[url] = content
+
+    def scrape(self):
+        """Work through the shared frontier until no URL is pending or leased."""
+        self.store.add([str(self.settings.base_url)])
+        with ThreadPoolExecutor(max_workers=self.settings.max_workers) as executor:
+            while True:
+                urls = self.store.lease(self.worker_id, self.settings.max_workers)
+                if not urls:
+                    if self.store.is_done():
+                        break
+                    # Other workers hold the remaining leases; wait for them
+                    # to finish or expire.
+                    time.sleep(self.poll_interval)
+                    continue
+
+                future_to_url = {executor.submit(self.process_page, url): url for url in urls}
+                for future in as_completed(future_to_url):
+                    url = future_to_url[future]
+                    self.visited_links.add(url)
+                    try:
+                        new_links = future.result()
+                    except Exception as e:
+                        logger.error(f"Error processing {url}: {e}")
+                        new_links = None
+                    with self.content_lock:
+                        fetch_failed = url in self._fetch_failed
+                        self._fetch_failed.discard(url)
+                    if new_links is None or fetch_failed:
+                        with self.content_lock:
+                            self._contents.pop(url, None)
+                        self.store.fail(url, self.worker_id)
+                        self.metrics.inc("urls_failed")
+                        continue
+                    added = self.store.add(link for link in new_links if self.admit(link))
+                    with self.content_lock:
+                        content = self._contents.pop(url, None)
+                    self.store.complete(url, self.worker_id, content)
+                    self.metrics.inc("links_added", added)
+
+                stats = self.store.stats()
+                self.metrics.set_gauge("pending", stats["pending"])
+                logger.info(
+                    f"[{self.worker_id}] Processed: {len(self.visited_links)}, "
+                    f"Pending: {stats['pending']}, Leased: {stats['leased']}, Done: {stats['done']}"
+                )
+
+        self.write_metrics()
@@ -0,0 +1,173 @@
+"""
+Link graph of a crawl with in-degree and PageRank page scores.
+"""
+import json
+import threading
+from array import array
+from itertools import accumulate
+from operator import mul
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple, Union
+
+SCORE_METRICS = ("pagerank", "in_degree")
+
+class LinkGraph:
+    """Directed graph of the in-site links found while crawling.
+
+    URLs are interned to integer ids and every edge is stored as a pair of
+    entries in two ``array('I')`` columns, 8 bytes per link. Only pages whose
+    links were recorded count as crawled; pages that are only linked to are
+    nodes without outgoing edges.
+    """
+
+    def __init__(self):
+        self.urls: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._sources = array("I")
+        self._targets = array("I")
+        self._crawled = set()
+        self._lock = threading.Lock()
+
+    def _node(self, url: str) -> int:
+        node = self._ids.get(url)
+        if node is None:
+            node = self._ids[url] = len(self.urls)
+            self.urls.append(url)
+        return node
+
+    def add_links(self, source: str, targets: Iterable[str]) -> None:
+        """Record the links of one page; self-links are ignored."""
+        with self._lock:
+            source_id = self._node(source)
+            self._crawled.add(source_id)
+            for target in targets:
+                target_id = self._node(target)
+                if target_id != source_id:
+                    self._sources.append(source_id)
+                    self._targets.append(target_id)
+
+    def __len__(self) -> int:
+        return len(self.urls)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self._sources)
+
+    def in_degree(self) -> List[int]:
+        counts = [0] * len(self.urls)
+        for target in self._targets:
+            counts[target] += 1
+        return counts
+
+    def _incoming(self) -> Tuple[array, array]:
+        """CSR index of the edges by target: ``sources[offsets[t]:offsets[t + 1]]`` link to ``t``."""
+        order = sorted(range(len(self._targets)), key=self._targets.__getitem__)
+        sources = array("I", map(self._sources.__getitem__, order))
+        offsets = array("I", accumulate(self.in_degree(), initial=0))
+        return sources, offsets
+
+    def pagerank(self, damping: float = 0.85, iterations: int = 50, tolerance: float = 1e-6) -> List[float]:
+        """PageRank of every node by power iteration; the scores sum to 1.
+
+        Rank of pages without outgoing links is spread evenly over all
+        pages. Iteration stops once the total change drops below
+        ``tolerance``. Each iteration sums the incoming shares of all nodes
+        as one running total over the CSR index, so the per-edge work stays
+        in ``map`` and ``accumulate``.
+        """
+        count = len(self.urls)
+        if not count:
+            return []
+        sources, offsets = self._incoming()
+        out_degree = [0] * count
+        for source in self._sources:
+            out_degree[source] += 1
+        weights = [1.0 / degree if degree else 0.0 for degree in out_degree]
+        dangling = [node for node, degree in enumerate(out_degree) if not degree]
+
+        rank = [1.0 / count] * count
+        for _ in range(iterations):
+            share = list(map(mul, rank, weights))
+            running = list(accumulate(map(share.__getitem__, sources), initial=0.0))
+            bounds = list(map(running.__getitem__, offsets))
+            base = (1.0 - damping) / count + damping * sum(map(rank.__getitem__, dangling)) / count
+            updated = [base + damping * (end - start) for start, end in zip(bounds, bounds[1:])]
+            change = sum(abs(new - old) for new, old in zip(updated, rank))
+            rank = updated
+            if change < tolerance:
+                break
+        return rank
+
+    def scores(self, metric: str = "pagerank") -> Dict[str, float]:
+        """Score per URL by ``pagerank`` or ``in_degree``."""
+        if metric not in SCORE_METRICS:
+            raise ValueError(f"Unknown page score '{metric}', expected one of {', '.join(SCORE_METRICS)}")
+        values = self.pagerank() if metric == "pagerank" else self.in_degree()
+        return dict(zip(self.urls, values))
+
+    def merge(self, other: "LinkGraph") -> "LinkGraph":
+        """Add the links of ``other`` (an earlier run) for pages not crawled here.
+
+        Pages crawled in this graph keep only their current links, so removed
+        links disappear; pages ``other`` crawled and this one did not (e.g. a
+        run stopped by a page budget) keep their earlier links.
+        """
+        with self._lock:
+            recrawled = set(self._crawled)
+            for node, url in enumerate(other.urls):
+                node_id = self._node(url)
+                if node in other._crawled:
+                    self._crawled.add(node_id)
+            for source, target in zip(other._sources, other._targets):
+                source_id = self._ids[other.urls[source]]
+                if source_id not in recrawled:
+                    self._sources.append(source_id)
+                    self._targets.append(self._ids[other.urls[target]])
+        return self
+
+    def export(self, path: Union[str, Path]) -> Dict:
+        """Write the graph as JSON: one node per URL with its scores, then the edges.
+
+        Node ``i`` has id ``i`` in ``edges``; ``crawled`` tells whether the
+        page's links were recorded. Returns a summary of the graph.
+        """
+        with self._lock:
+            in_degree = self.in_degree()
+            pagerank = self.pagerank()
+            nodes = [
+                {
+                    "url": url,
+                    "crawled": node in self._crawled,
+                    "in_degree": in_degree[node],
+                    "pagerank": round(pagerank[node], 10),
+                }
+                for node, url in enumerate(self.urls)
+            ]
+            edges = [list(edge) for edge in zip(self._sources, self._targets)]
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"nodes": nodes, "edges": edges}), encoding="utf-8")
+        top = sorted(nodes, key=lambda node: node["pagerank"], reverse=True)[:10]
+        return {"nodes": len(nodes), "edges": len(edges), "top_pages": [node["url"] for node in top]}
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "LinkGraph":
+        """Graph written by ``export``."""
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        graph = cls()
+        for node in data["nodes"]:
+            node_id = graph._node(node["url"])
+            if node["crawled"]:
+                graph._crawled.add(node_id)
+        for source, target in data["edges"]:
+            graph._sources.append(source)
+            graph._targets.append(target)
+        return graph
+
+    @staticmethod
+    def load_scores(path: Union[str, Path], metric: str = "pagerank") -> Dict[str, float]:
+        """Score per URL from a graph written by ``export``."""
+        if metric not in SCORE_METRICS:
+            raise ValueError(f"Unknown page score '{metric}', expected one of {', '.join(SCORE_METRICS)}")
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        return {node["url"]: node[metric] for node in data["nodes"]}
@@ -0,0 +1,150 @@
+"""
+Logging setup for the documentation scraper.
+"""
+import atexit
+import logging
+import logging.handlers
+import queue
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import List, Optional
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.handlers.QueueHandler] = None
+_handlers: List[logging.Handler] = []
+
+class BatchingHandler(logging.Handler):
+    """Condense routine records into one summary line per interval.
+
+    Records below ``immediate_level`` are only counted per level, keeping the
+    latest message; every ``interval`` seconds a single INFO record reporting
+    the counts and that message is passed to ``target``. Records at or above
+    ``immediate_level`` go to ``target`` right away.
+    """
+
+    def __init__(self, target: logging.Handler, interval: float = 10.0, immediate_level: int = logging.ERROR):
+        super().__init__(target.level)
+        self.target = target
+        self.interval = interval
+        self.immediate_level = immediate_level
+        self.counts: Counter = Counter()
+        self.latest: Optional[str] = None
+        self.started = time.monotonic()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="log-summary", daemon=True)
+        self._thread.start()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if record.levelno >= self.immediate_level:
+            self.target.handle(record)
+            return
+        self.counts[record.levelname] += 1
+        self.latest = record.getMessage()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self.flush()
+
+    def flush(self) -> None:
+        """Pass a summary of the records counted since the last one to the target."""
+        with self.lock:
+            if not self.counts:
+                return
+            counts, latest, started = self.counts, self.latest, self.started
+            self.counts, self.latest, self.started = Counter(), None, time.monotonic()
+        total = sum(counts.values())
+        levels = ", ".join(f"{level}: {count}" for level, count in sorted(counts.items()))
+        record = logging.LogRecord(
+            __name__, logging.INFO, __file__, 0,
+            f"{total} messages in {time.monotonic() - started:.0f}s ({levels}); last: {latest}",
+            None, None
+        )
+        self.target.handle(record)
+
+    def close(self) -> None:
+        self._stopped.set()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join()
+        self.flush()
+        self.target.close()
+        super().close()
+
+def stop_logging() -> None:
+    """Stop the queue listener of a quiet run, writing out queued records."""
+    global _listener, _queue_handler
+    if _listener is None:
+        return
+    logging.getLogger().removeHandler(_queue_handler)
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = _queue_handler = None
+
+def setup_logging(
+    log_dir: str = "logs",
+    quiet: bool = False,
+    summary_interval: float = 10.0,
+    console_format: str = '%(asctime)s - %(levelname)s - %(message)s',
+    backup_count: int = 2
+) -> logging.Logger:
+    """Configure logging with both file and console handlers.
+
+    With ``quiet``, log calls only put records on a queue: a listener thread
+    formats and writes them, and the console receives one summary line every
+    ``summary_interval`` seconds instead of a line per page (errors are still
+    shown at once). The file log keeps every record. The Firecrawl package
+    passes its own ``console_format`` and ``backup_count``.
+
+    Calling it again replaces the handlers installed by the previous call.
+    """
+    global _listener, _queue_handler
+    stop_logging()
+    root_logger = logging.getLogger()
+    for handler in _handlers:
+        root_logger.removeHandler(handler)
+        handler.close()
+    _handlers.clear()
+
+    log_dir = Path(log_dir)
+    log_dir.mkdir(exist_ok=True)
+    log_file = log_dir / "scraper.log"
+
+    # Create formatters and handlers
+    file_formatter = logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+    console_formatter = logging.Formatter(console_format, datefmt='%Y-%m-%d %H:%M:%S')
+
+    # File handler with rotation (1MB per file, keep backup_count backup files)
+    file_handler = logging.handlers.RotatingFileHandler(
+        log_file, maxBytes=1024*1024, backupCount=backup_count
+    )
+    file_handler.setFormatter(file_formatter)
+    file_handler.setLevel(logging.DEBUG)
+
+    # Console handler
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(console_formatter)
+    console_handler.setLevel(logging.INFO)
+
+    # Root logger configuration
+    root_logger.setLevel(logging.DEBUG)
+    if quiet:
+        records = queue.SimpleQueue()
+        _listener = logging.handlers.QueueListener(
+            records, file_handler, BatchingHandler(console_handler, summary_interval),
+            respect_handler_level=True
+        )
+        _listener.start()
+        atexit.register(stop_logging)
+        _queue_handler = logging.handlers.QueueHandler(records)
+        root_logger.addHandler(_queue_handler)
+    else:
+        _handlers.extend([file_handler, console_handler])
+        for handler in _handlers:
+            root_logger.addHandler(handler)
+
+    return root_logger
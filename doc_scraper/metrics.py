@@ -0,0 +1,183 @@
+"""
+Per-stage crawl metrics with JSON and Prometheus text exports.
+"""
+import json
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Sequence, Union
+
+# Latency histogram bucket upper bounds, in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+class Histogram:
+    """Fixed-bucket latency histogram."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile as the upper bound of the bucket that contains it."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def cumulative(self) -> List[int]:
+        """Cumulative counts per bucket, ending with the +Inf bucket."""
+        running, result = 0, []
+        for count in self.counts:
+            running += count
+            result.append(running)
+        return result
+
+    def to_dict(self) -> Dict:
+        return {
+            "count": self.count,
+            "sum_seconds": round(self.total, 6),
+            "mean_seconds": round(self.total / self.count, 6) if self.count else 0.0,
+            "min_seconds": round(self.min, 6) if self.count else 0.0,
+            "max_seconds": round(self.max, 6),
+            "p50_seconds": self.quantile(0.5),
+            "p95_seconds": self.quantile(0.95),
+            "buckets": {
+                str(bound): count
+                for bound, count in zip(self.buckets + ("+Inf",), self.cumulative())
+            },
+        }
+
+class CrawlMetrics:
+    """Thread-safe metrics for the stages of a crawl pipeline.
+
+    Tracks latency histograms, error counts and data sizes per stage, plus
+    free-form event counters (retries, pages saved) and gauges (queue depths,
+    keeping the last and the peak value).
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.started = time.time()
+        self.latency: Dict[str, Histogram] = {}
+        self.errors: Counter = Counter()
+        self.bytes_in: Counter = Counter()
+        self.bytes_out: Counter = Counter()
+        self.counters: Counter = Counter()
+        self.gauges: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time a block as one run of ``name``; exceptions count as errors."""
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            with self._lock:
+                self.errors[name] += 1
+            raise
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def observe(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self.latency.get(stage)
+            if histogram is None:
+                histogram = self.latency[stage] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def add_bytes(self, stage: str, bytes_in: int = 0, bytes_out: int = 0) -> None:
+        """Record input and output sizes for a stage (characters for text stages)."""
+        with self._lock:
+            self.bytes_in[stage] += bytes_in
+            self.bytes_out[stage] += bytes_out
+
+    def error(self, stage: str) -> None:
+        with self._lock:
+            self.errors[stage] += 1
+
+    def inc(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self.counters[name] += value
+
+    def set_gauge(self, name: str, value: float) -> None:
+        with self._lock:
+            gauge = self.gauges.setdefault(name, {"last": value, "max": value})
+            gauge["last"] = value
+            gauge["max"] = max(gauge["max"], value)
+
+    def summary(self) -> Dict:
+        """Snapshot of all metrics suitable for JSON serialization."""
+        with self._lock:
+            stages = sorted(set(self.latency) | set(self.errors) | set(self.bytes_in) | set(self.bytes_out))
+            return {
+                "elapsed_seconds": round(time.time() - self.started, 3),
+                "stages": {
+                    stage: {
+                        "latency": (self.latency[stage].to_dict() if stage in self.latency
+                                    else Histogram(self.buckets).to_dict()),
+                        "errors": self.errors[stage],
+                        "bytes_in": self.bytes_in[stage],
+                        "bytes_out": self.bytes_out[stage],
+                    }
+                    for stage in stages
+                },
+                "counters": dict(self.counters),
+                "gauges": {name: dict(values) for name, values in self.gauges.items()},
+            }
+
+    def write_json(self, path: Union[str, Path]) -> None:
+        Path(path).write_text(json.dumps(self.summary(), indent=2), encoding="utf-8")
+
+    def prometheus(self, prefix: str = "doc_scraper") -> str:
+        """Render the metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            lines += [
+                f"# HELP {prefix}_stage_duration_seconds Time spent per pipeline stage.",
+                f"# TYPE {prefix}_stage_duration_seconds histogram",
+            ]
+            for stage, histogram in sorted(self.latency.items()):
+                for bound, count in zip(histogram.buckets + ("+Inf",), histogram.cumulative()):
+                    lines.append(f'{prefix}_stage_duration_seconds_bucket{{stage="{stage}",le="{bound}"}} {count}')
+                lines.append(f'{prefix}_stage_duration_seconds_sum{{stage="{stage}"}} {histogram.total}')
+                lines.append(f'{prefix}_stage_duration_seconds_count{{stage="{stage}"}} {histogram.count}')
+
+            for metric, values, help_text in (
+                ("stage_errors_total", self.errors, "Errors raised per pipeline stage."),
+                ("stage_bytes_in_total", self.bytes_in, "Data consumed per pipeline stage."),
+                ("stage_bytes_out_total", self.bytes_out, "Data produced per pipeline stage."),
+            ):
+                lines += [f"# HELP {prefix}_{metric} {help_text}", f"# TYPE {prefix}_{metric} counter"]
+                lines += [f'{prefix}_{metric}{{stage="{stage}"}} {value}' for stage, value in sorted(values.items())]
+
+            lines += [f"# HELP {prefix}_events_total Crawl events.", f"# TYPE {prefix}_events_total counter"]
+            lines += [f'{prefix}_events_total{{event="{name}"}} {value}' for name, value in sorted(self.counters.items())]
+
+            lines += [f"# HELP {prefix}_gauge Last observed value.", f"# TYPE {prefix}_gauge gauge"]
+            lines += [f'{prefix}_gauge{{name="{name}"}} {values["last"]}' for name, values in sorted(self.gauges.items())]
+            lines += [f"# HELP {prefix}_gauge_max Peak observed value.", f"# TYPE {prefix}_gauge_max gauge"]
+            lines += [f'{prefix}_gauge_max{{name="{name}"}} {values["max"]}' for name, values in sorted(self.gauges.items())]
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: Union[str, Path], prefix: str = "doc_scraper") -> None:
+        Path(path).write_text(self.prometheus(prefix), encoding="utf-8")
@@ -0,0 +1,123 @@
+"""
+Low-overhead sampling profiler covering every thread of a crawl run.
+"""
+import os
+import re
+import sys
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Tuple, Union
+
+# Leaf frames in these modules mean the thread is parked, not working
+_IDLE_MODULES = ("threading.py", "queue.py", "selectors.py")
+# Idle ThreadPoolExecutor workers block inside C code called from _worker
+_IDLE_FUNCTIONS = {("thread.py", "_worker")}
+
+class SamplingProfiler:
+    """Periodically samples the Python stack of every running thread.
+
+    A background thread reads ``sys._current_frames()`` every ``interval``
+    seconds, so worker threads are covered without wrapping them and the
+    scraped code runs unmodified. Samples are merged per stack, with worker
+    thread names normalized so that all pool threads fold together, and are
+    written in the collapsed-stack format understood by flamegraph.pl,
+    speedscope and inferno, alongside a plain-text top-functions summary.
+    """
+
+    def __init__(self, interval: float = 0.005, include_idle: bool = False):
+        self.interval = interval
+        self.include_idle = include_idle
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> "SamplingProfiler":
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "SamplingProfiler":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.sample(skip=own_id)
+
+    @staticmethod
+    def _thread_label(name: str) -> str:
+        """Fold numbered pool threads (ThreadPoolExecutor-3_1) into one root."""
+        return re.sub(r"[-_]\d+", "", name)
+
+    @staticmethod
+    def _is_idle(frame) -> bool:
+        module = os.path.basename(frame.f_code.co_filename)
+        return module in _IDLE_MODULES or (module, frame.f_code.co_name) in _IDLE_FUNCTIONS
+
+    def sample(self, skip: int = None) -> None:
+        """Record the current stack of every thread except ``skip``."""
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == skip:
+                continue
+            if not self.include_idle and self._is_idle(frame):
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            stack.append(self._thread_label(names.get(thread_id, "thread")))
+            self.stacks[";".join(reversed(stack))] += 1
+        self.samples += 1
+
+    def top_functions(self, limit: int = 25) -> Tuple[List[Tuple[str, int]], List[Tuple[str, int]]]:
+        """Most sampled functions as (self samples, inclusive samples) rankings."""
+        own: Counter = Counter()
+        total: Counter = Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(";")[1:]
+            if not frames:
+                continue
+            own[frames[-1]] += count
+            for frame in set(frames):
+                total[frame] += count
+        return own.most_common(limit), total.most_common(limit)
+
+    def write_folded(self, path: Union[str, Path]) -> None:
+        """Write collapsed stacks (``frame;frame;frame count`` per line)."""
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write(f"{stack} {count}\n")
+
+    def write_report(self, path: Union[str, Path]) -> Dict[str, Path]:
+        """Write the folded stacks to ``path`` and a text summary next to it."""
+        path = Path(path)
+        summary_path = path.with_name(f"{path.stem}.summary.txt")
+        self.write_folded(path)
+
+        total_samples = sum(self.stacks.values()) or 1
+        own, inclusive = self.top_functions()
+        lines = [
+            f"Sampling interval: {self.interval * 1000:.1f} ms, "
+            f"sampling rounds: {self.samples}, stack samples: {sum(self.stacks.values())}",
+            "",
+            "Top functions by self samples:",
+        ]
+        lines += [f"{count:8d} {count / total_samples:7.1%}  {name}" for name, count in own]
+        lines += ["", "Top functions by inclusive samples:"]
+        lines += [f"{count:8d} {count / total_samples:7.1%}  {name}" for name, count in inclusive]
+        summary_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        return {"folded": path, "summary": summary_path}
@@ -1,167 +1,487 @@
 import os
 import re
+import json
 import time
 import logging
-import logging.handlers
 import threading
+from contextlib import nullcontext
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from threading import Lock
-from typing import Set, List, Dict, Optional
+from typing import Set, List, Dict, Optional, Literal
 from urllib.parse import urljoin, urlparse
 
 import requests
 import yaml
 import typer
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Tag
 from markdownify import markdownify as md
 from pydantic_settings import BaseSettings
 from pydantic import HttpUrl, Field
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TimeRemainingColumn
 
-def setup_logging(log_dir: str = "logs") -> logging.Logger:
-    """Configure logging with both file and console handlers."""
-    log_dir = Path(log_dir)
-    log_dir.mkdir(exist_ok=True)
-    log_file = log_dir / "scraper.log"
+from .convert import CODE_SELECTORS, FastMarkdownConverter
+from .dedup import NearDuplicateIndex
+from .linkgraph import LinkGraph
+from .logs import setup_logging, stop_logging
+from .metrics import CrawlMetrics
+from .profiling import SamplingProfiler
+from .snapshots import SnapshotWriter
+from .template import TemplateLearner
+from .traps import TrapDetector
+from .urlset import PriorityFrontier, SpillingFrontier, make_url_set
 
-    # Create formatters and handlers
-    file_formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    console_formatter = logging.Formatter(
-        '%(asctime)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
+# Handlers are attached by setup_logging() when a run starts, not on import
+logger = logging.getLogger(__name__)
+console = Console()
 
-    # File handler with rotation (1MB per file, keep 2 backup files)
-    file_handler = logging.handlers.RotatingFileHandler(
-        log_file, maxBytes=1024*1024, backupCount=2
-    )
-    file_handler.setFormatter(file_formatter)
-    file_handler.setLevel(logging.DEBUG)
+# Text left over by page chrome, removed from the converted markdown
+CLEAN_PATTERNS = [
+    r"Table of Contents",
+    r"On this page",
+    r"Share this page",
+    r"Last modified",
+    r"Edit this page",
+    r"\d+\s*min read",
+    r"Previous\s+Next"
+]
 
-    # Console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(console_formatter)
-    console_handler.setLevel(logging.INFO)
+# Page chrome removed from the content element before markdown conversion on
+# every site. Classes are matched as whole words ("toc" but not "protocol");
+# broader rules (forms, buttons, substring matches) belong in a site profile's
+# xpath clean patterns in config/sites_config.yaml.
+BOILERPLATE_SELECTORS = [
+    "script", "style", "noscript", "template", "svg",
+    "nav", "footer", "[role='navigation']",
+    # Not every aside: Starlight and others render callouts as <aside>
+    "aside[class~='sidebar']",
+    "div[class~='sidebar']",
+    "div[class~='breadcrumb']",
+    "div[class~='breadcrumbs']",
+    "div[class~='toc']",
+    "div[class~='table-of-contents']",
+    "div[class~='edit-meta']",
+    "div[class~='last-updated']",
+]
 
-    # Root logger configuration
-    root_logger = logging.getLogger()
-    root_logger.setLevel(logging.DEBUG)
-    root_logger.addHandler(file_handler)
-    root_logger.addHandler(console_handler)
+_XPATH_RE = re.compile(r"^//(\w+|\*)(?:\[(.+)\])?$")
+_XPATH_EQUALS_RE = re.compile(r"^@([\w-]+)\s*=\s*['\"](.+?)['\"]$")
+_XPATH_CONTAINS_RE = re.compile(r"^contains\(\s*@([\w-]+)\s*,\s*['\"](.+?)['\"]\s*\)$")
 
-    return root_logger
+def xpath_to_css(xpath: str) -> Optional[str]:
+    """Translate the simple xpath rules used in site configs into a CSS selector.
 
-logger = setup_logging()
-console = Console()
+    Supports ``//tag``, ``//tag[@attr='value']`` and
+    ``//tag[contains(@attr, 'value')]``; returns None for anything else.
+    """
+    match = _XPATH_RE.match(xpath.strip())
+    if not match:
+        return None
+    tag, predicate = match.groups()
+    css = "" if tag == "*" else tag
+    if predicate:
+        equals = _XPATH_EQUALS_RE.match(predicate.strip())
+        contains = _XPATH_CONTAINS_RE.match(predicate.strip())
+        if equals:
+            css += f"[{equals.group(1)}='{equals.group(2)}']"
+        elif contains:
+            css += f"[{contains.group(1)}*='{contains.group(2)}']"
+        else:
+            return None
+    return css or "*"
+
+# Linked assets that are usually not HTML; checked with a HEAD request first
+HEAD_CHECK_EXTENSIONS = [
+    ".pdf", ".zip", ".gz", ".tgz", ".tar", ".whl", ".exe", ".dmg", ".iso",
+    ".png", ".jpg", ".jpeg", ".gif", ".svg", ".webp", ".ico",
+    ".mp4", ".webm", ".mp3", ".woff", ".woff2", ".ttf", ".csv", ".json", ".xml",
+]
+
+class PageSkipped(Exception):
+    """A URL that is not worth downloading (wrong content type or too large)."""
+
+def page_title(url: str) -> str:
+    """Markdown heading for a page, derived from the last URL segment."""
+    return f"# {url.split('/')[-1].replace('-', ' ').title()}"
+
+def format_page(url: str, content: str) -> str:
+    """Section appended to the output file for one page."""
+    return f"\n\n{page_title(url)}\n\n{content}\n"
 
 class ScraperSettings(BaseSettings):
     """Settings for the documentation scraper."""
     base_url: HttpUrl = Field(..., description="Base URL to scrape")
     save_dir: Path = Field(default=Path("scraped_docs"), description="Directory to save scraped docs")
-    output_file: Path = Field(default=None, description="Output file path")
+    output_file: Optional[Path] = Field(default=None, description="Output file path")
     max_workers: int = Field(default=5, description="Maximum number of concurrent workers")
     timeout: int = Field(default=10, description="Request timeout in seconds")
     retry_attempts: int = Field(default=3, description="Number of retry attempts")
     delay_between_requests: float = Field(default=1.0, description="Delay between requests in seconds")
+    content_selectors: List[str] = Field(
+        default=["article", ".markdown-body", "#content-wrapper", ".docs-content"],
+        description="CSS selectors for the main content, tried in order"
+    )
+    boilerplate_selectors: List[str] = Field(
+        default_factory=lambda: list(BOILERPLATE_SELECTORS),
+        description="CSS selectors for page chrome removed before markdown conversion"
+    )
+    include_patterns: List[str] = Field(
+        default_factory=list,
+        description="Only follow links whose path contains one of these patterns"
+    )
+    exclude_patterns: List[str] = Field(
+        default_factory=list,
+        description="Never follow links whose path contains one of these patterns"
+    )
+    clean_patterns: List[str] = Field(
+        default_factory=list,
+        description="Extra regular expressions removed from the markdown"
+    )
+    template_sample_pages: int = Field(
+        default=10,
+        description="Pages sampled to learn the blocks a site repeats on every page (0 disables)"
+    )
+    template_min_ratio: float = Field(
+        default=0.6,
+        description="Share of sampled pages a block must appear on to count as template"
+    )
+    duplicate_action: Optional[Literal["drop", "link"]] = Field(
+        default=None,
+        description="Handling of near-duplicate pages: 'drop', 'link' or None to keep them"
+    )
+    duplicate_distance: int = Field(default=3, description="Maximum SimHash bit distance for near-duplicates")
+    visited_backend: Literal["set", "hash", "bloom"] = Field(
+        default="set",
+        description="Visited-set storage: full URLs, 64-bit URL hashes or a scalable Bloom filter"
+    )
+    visited_capacity: int = Field(default=100_000, description="Initial capacity of the hash or Bloom visited set")
+    visited_error_rate: float = Field(default=1e-4, description="False-positive rate of the Bloom visited set")
+    frontier_memory_limit: int = Field(
+        default=100_000,
+        description="URLs kept in memory before the frontier spills to disk"
+    )
+    frontier_spill_dir: Optional[Path] = Field(default=None, description="Directory for frontier spill files")
+    min_content_chars: int = Field(
+        default=0,
+        description="Pages with less markdown than this are not saved but listed in low_content_urls"
+    )
+    fast_markdown: bool = Field(
+        default=True,
+        description="Convert code blocks and tables natively and only the rest with markdownify"
+    )
+    code_selectors: List[str] = Field(
+        default_factory=lambda: list(CODE_SELECTORS),
+        description="CSS selectors for code blocks converted to fenced code with their language"
+    )
+    trap_detection: bool = Field(default=True, description="Prune URLs that look like crawler traps")
+    max_path_repeats: int = Field(default=3, description="Times one path segment may repeat in a URL")
+    max_query_variants: int = Field(
+        default=50,
+        description="Distinct query strings followed per path (pagination, facets, calendars; 0 disables)"
+    )
+    prefix_budgets: Dict[str, int] = Field(
+        default_factory=dict,
+        description="Maximum URLs crawled under a path prefix, e.g. {'/blog/': 200}"
+    )
+    default_prefix_budget: int = Field(
+        default=0,
+        description="Maximum URLs per path prefix of prefix_depth segments (0 disables)"
+    )
+    prefix_depth: int = Field(default=2, description="Path segments forming a prefix for default_prefix_budget")
+    trap_content_distance: Optional[int] = Field(
+        default=None,
+        description="SimHash distance under which a page counts as near-identical and its links are not followed (None disables)"
+    )
+    max_page_bytes: int = Field(
+        default=5 * 1024 * 1024,
+        description="Abort downloads larger than this many bytes (0 disables the limit)"
+    )
+    allowed_content_types: List[str] = Field(
+        default=["text/html", "application/xhtml+xml"],
+        description="Content types that are downloaded and parsed; anything else is skipped"
+    )
+    head_check_extensions: List[str] = Field(
+        default_factory=lambda: list(HEAD_CHECK_EXTENSIONS),
+        description="URL path extensions checked with a HEAD request before downloading"
+    )
+    metrics_file: Optional[Path] = Field(default=None, description="JSON file for the per-stage metrics summary")
+    prometheus_file: Optional[Path] = Field(default=None, description="Prometheus text file for the run metrics")
+    snapshot_file: Optional[Path] = Field(
+        default=None,
+        description="JSON Lines file recording a hash per page section, compared between runs with `diff`"
+    )
+    max_pages: int = Field(default=0, description="Stop after processing this many pages (0 = unlimited)")
+    link_graph_file: Optional[Path] = Field(
+        default=None,
+        description="JSON file for the link graph and page scores; an existing one orders the frontier by its scores"
+    )
+    page_score: Literal["pagerank", "in_degree"] = Field(
+        default="pagerank", description="Page score used to prioritize URLs from an earlier link graph"
+    )
+
+def crawl_progress() -> Progress:
+    """Progress display with one bar per crawl."""
+    return Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
+        TextColumn("{task.completed}/{task.total} pages"),
+        TimeRemainingColumn()
+    )
 
 class DocsScraper:
     """Documentation scraper with concurrent processing and progress tracking."""
     
-    def __init__(self, settings: ScraperSettings):
+    def __init__(
+        self,
+        settings: ScraperSettings,
+        session: Optional[requests.Session] = None,
+        fetch_limiter: Optional[threading.Semaphore] = None,
+        show_progress: bool = True,
+        progress: Optional[Progress] = None,
+        snapshots: Optional[SnapshotWriter] = None
+    ):
         self.settings = settings
-        self.visited_links = set()
-        self.session = requests.Session()
+        self.visited_links = self.new_url_set()
+        self.session = session or requests.Session()
+        # Shared across scrapers to cap concurrent requests of a multi-site run
+        self.fetch_limiter = fetch_limiter or nullcontext()
+        self.show_progress = show_progress
         self.content_lock = threading.Lock()
-        self.progress = Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            BarColumn(),
-            TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
-            TimeRemainingColumn()
+        # Pages without (enough) content, e.g. rendered client-side
+        self.low_content_urls: List[str] = []
+        self.clean_patterns = [
+            re.compile(pattern, re.IGNORECASE | re.MULTILINE)
+            for pattern in CLEAN_PATTERNS + settings.clean_patterns
+        ]
+        self.metrics = CrawlMetrics()
+        self.template = (
+            TemplateLearner(settings.template_sample_pages, settings.template_min_ratio)
+            if settings.template_sample_pages > 0 else None
         )
+        self.duplicates = (
+            NearDuplicateIndex(max_distance=settings.duplicate_distance)
+            if settings.duplicate_action else None
+        )
+        self.converter = FastMarkdownConverter(settings.code_selectors) if settings.fast_markdown else None
+        self.traps = (
+            TrapDetector(
+                max_path_repeats=settings.max_path_repeats,
+                max_query_variants=settings.max_query_variants,
+                prefix_budgets=settings.prefix_budgets,
+                default_prefix_budget=settings.default_prefix_budget,
+                prefix_depth=settings.prefix_depth,
+                content_distance=settings.trap_content_distance
+            )
+            if settings.trap_detection else None
+        )
+        # A writer shared with another stage (hybrid mode) is closed by its owner
+        self.owns_snapshots = snapshots is None
+        self.snapshots = snapshots or (SnapshotWriter(settings.snapshot_file) if settings.snapshot_file else None)
+        self.link_graph = LinkGraph() if settings.link_graph_file else None
+        # A display shared by several scrapers is started by its owner
+        self.progress = progress or crawl_progress()
+        self.owns_progress = progress is None
+
+    def check_response_headers(self, headers) -> None:
+        """Raise PageSkipped if the headers announce a non-HTML or oversized body."""
+        content_type = headers.get("Content-Type", "").split(";")[0].strip().lower()
+        if content_type and content_type not in self.settings.allowed_content_types:
+            raise PageSkipped(f"content type {content_type}")
+        length = headers.get("Content-Length")
+        if self.settings.max_page_bytes and length and length.isdigit() \
+                and int(length) > self.settings.max_page_bytes:
+            raise PageSkipped(f"{length} bytes exceeds max_page_bytes")
+
+    def head_check(self, url: str) -> None:
+        """HEAD pre-check for URLs whose extension suggests a binary asset."""
+        path = urlparse(url).path.lower()
+        if not path.endswith(tuple(self.settings.head_check_extensions)):
+            return
+        with self.fetch_limiter:
+            response = self.session.head(url, timeout=self.settings.timeout, allow_redirects=True)
+        # Servers that reject HEAD are checked again on the streamed GET
+        if response.ok:
+            self.check_response_headers(response.headers)
 
     def fetch_page(self, url):
-        """Fetch a page with retry logic."""
+        """Fetch a page with retry logic.
+
+        The body is streamed: the headers are checked before anything is
+        downloaded and the transfer is aborted as soon as it exceeds
+        ``max_page_bytes``. Skipped pages raise PageSkipped and are not retried.
+        """
         for attempt in range(self.settings.retry_attempts):
             try:
-                response = self.session.get(url, timeout=self.settings.timeout)
-                response.raise_for_status()
-                return response.text
+                self.head_check(url)
+                with self.fetch_limiter:
+                    with self.session.get(url, timeout=self.settings.timeout, stream=True) as response:
+                        response.raise_for_status()
+                        self.check_response_headers(response.headers)
+                        body = self.read_body(response)
+                self.metrics.add_bytes("fetch", bytes_in=len(body))
+                # Without an explicit charset requests assumes ISO-8859-1 for
+                # text/*, which garbles the UTF-8 almost every docs site uses.
+                explicit = "charset" in response.headers.get("Content-Type", "").lower()
+                return body.decode(response.encoding if explicit else "utf-8", errors="replace")
+            except PageSkipped:
+                raise
             except Exception as e:
                 if attempt == self.settings.retry_attempts - 1:
                     logger.error(f"Failed to fetch {url}: {e}")
                     raise
+                self.metrics.inc("fetch_retries")
                 time.sleep(self.settings.delay_between_requests)
 
+    def read_body(self, response: requests.Response) -> bytes:
+        """Read a streamed body, aborting once it exceeds max_page_bytes."""
+        limit = self.settings.max_page_bytes
+        chunks, size = [], 0
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            size += len(chunk)
+            if limit and size > limit:
+                self.metrics.add_bytes("fetch", bytes_in=size)
+                raise PageSkipped(f"body exceeds max_page_bytes ({limit} bytes)")
+            chunks.append(chunk)
+        return b"".join(chunks)
+
     def process_page(self, url: str) -> Set[str]:
         """Process a single page and extract links."""
+        metrics = self.metrics
         try:
-            html = self.fetch_page(url)
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            # Extract content using selectors
-            content = ""
-            for selector in ["article", ".markdown-body", "#content-wrapper", ".docs-content"]:
-                element = soup.select_one(selector)
-                if element:
-                    content = str(element)
-                    break
+            with metrics.stage("fetch"):
+                try:
+                    html = self.fetch_page(url)
+                except PageSkipped as e:
+                    # Not an error: the URL is simply not a page worth parsing
+                    logger.info(f"Skipped {url}: {e}")
+                    html = None
+            if html is None:
+                metrics.inc("pages_skipped")
+                return set()
+            with metrics.stage("parse"):
+                soup = BeautifulSoup(html, 'html.parser')
+                # Extract links before boilerplate (navigation included) is pruned
+                links = self.extract_links(soup, url)
             
-            if not content:
+            # Extract content without page chrome
+            with metrics.stage("extract"):
+                content = self.extract_content(soup)
+                # Strip blocks repeated on every page of the site
+                if content is not None and self.template:
+                    self.template.process(content)
+            if content is None:
                 logger.warning(f"No content found for {url}")
-                return set()
+                metrics.inc("pages_without_content")
+                with self.content_lock:
+                    self.low_content_urls.append(url)
+                # Client-rendered pages often still serve their navigation
+                return links
 
             # Convert to markdown
-            markdown = md(content)
+            if self.converter:
+                # Works on the tree directly, the HTML size is not measured
+                with metrics.stage("markdown"):
+                    markdown = self.converter.convert(content)
+                metrics.add_bytes("markdown", bytes_out=len(markdown))
+            else:
+                content = str(content)
+                with metrics.stage("markdown"):
+                    markdown = md(content)
+                metrics.add_bytes("markdown", len(content), len(markdown))
             
             # Clean content
-            markdown = self.clean_content(markdown)
+            with metrics.stage("clean"):
+                cleaned = self.clean_content(markdown)
+            metrics.add_bytes("clean", len(markdown), len(cleaned))
+            markdown = cleaned
+            
+            if len(markdown.strip()) < self.settings.min_content_chars:
+                logger.info(f"Low content ({len(markdown.strip())} characters): {url}")
+                metrics.inc("pages_low_content")
+                with self.content_lock:
+                    self.low_content_urls.append(url)
+                return links
+            
+            # Pages nearly identical to an earlier one (calendar days, facet
+            # combinations) only lead to more of the same: don't follow them
+            if self.traps:
+                with metrics.stage("traps"):
+                    if self.traps.check_content(url, markdown):
+                        metrics.inc("pages_trapped")
+                        links = set()
+            
+            # Skip or link near-duplicates of pages already saved
+            if self.duplicates:
+                with metrics.stage("dedup"):
+                    original = self.duplicates.add(url, markdown)
+                if original:
+                    logger.debug(f"Near-duplicate of {original}: {url}")
+                    metrics.inc("pages_duplicate")
+                    if self.settings.duplicate_action == "drop":
+                        return links
+                    markdown = f"Duplicate of: {original}"
             
             # Save content
-            with self.content_lock:
+            with metrics.stage("save"), self.content_lock:
                 self.save_content(url, markdown)
+            metrics.add_bytes("save", bytes_out=len(markdown))
+            metrics.inc("pages_saved")
+            if self.snapshots:
+                with metrics.stage("snapshot"):
+                    self.snapshots.add(url, markdown)
             
-            # Extract links
-            return self.extract_links(soup)
+            return links
             
         except Exception as e:
             logger.error(f"Error processing {url}: {e}")
             return set()
 
+    def extract_content(self, soup: BeautifulSoup) -> Optional[Tag]:
+        """Return the main content element with boilerplate nodes removed.
+
+        Content selectors are tried in order and the first element that still
+        has text once navigation, sidebars, footers and TOCs are pruned wins.
+        The pruning happens on the DOM so markdownify never sees the chrome.
+        """
+        boilerplate = ", ".join(self.settings.boilerplate_selectors)
+        for selector in self.settings.content_selectors:
+            element = soup.select_one(selector)
+            if element is None:
+                continue
+            if boilerplate:
+                for node in element.select(boilerplate):
+                    if not node.decomposed:
+                        node.decompose()
+            if next(element.stripped_strings, None):
+                return element
+        return None
+
     def clean_content(self, content: str) -> str:
         """Clean the content using patterns from config."""
-        patterns = [
-            r"Table of Contents",
-            r"On this page",
-            r"Share this page",
-            r"Last modified",
-            r"Edit this page",
-            r"\d+\s*min read",
-            r"Previous\s+Next"
-        ]
-        
-        for pattern in patterns:
-            content = re.sub(pattern, "", content, flags=re.IGNORECASE)
+        for pattern in self.clean_patterns:
+            content = pattern.sub("", content)
         
         return content.strip()
 
     def save_content(self, url: str, content: str):
         """Save the processed content."""
         try:
+            title = page_title(url)
             with open(self.settings.output_file, "a", encoding="utf-8") as f:
-                title = f"# {url.split('/')[-1].replace('-', ' ').title()}"
-                f.write(f"\n\n{title}\n\n{content}\n")
+                f.write(format_page(url, content))
             logger.info(f"Successfully appended: {title} (Content length: {len(content)} characters)")
         except Exception as e:
             logger.error(f"Error saving content for {url}: {e}")
 
-    def extract_links(self, soup: BeautifulSoup) -> Set[str]:
-        """Extract valid links from the page."""
+    def extract_links(self, soup: BeautifulSoup, url: Optional[str] = None) -> Set[str]:
+        """Extract valid links from the page.
+
+        All of them are recorded in the link graph as edges from ``url``;
+        only the ones not visited yet are returned.
+        """
         links = set()
         base_url = str(self.settings.base_url)
         
@@ -170,41 +490,203 @@ class DocsScraper:
             if not href.startswith(("http", "https")):
                 href = urljoin(base_url, href)
             
-            if href.startswith(base_url) and href not in self.visited_links:
+            if href.startswith(base_url) and self.is_allowed(href):
                 links.add(href)
         
-        return links
+        if self.link_graph is not None and url:
+            self.link_graph.add_links(url, links)
+        return {link for link in links if link not in self.visited_links}
+
+    def is_allowed(self, url: str) -> bool:
+        """Check a URL against the include and exclude patterns."""
+        path = urlparse(url).path
+        if any(pattern in path for pattern in self.settings.exclude_patterns):
+            return False
+        return not self.settings.include_patterns or any(
+            pattern in path for pattern in self.settings.include_patterns
+        )
+
+    def new_url_set(self):
+        """Empty visited set of the configured backend."""
+        return make_url_set(
+            self.settings.visited_backend,
+            self.settings.visited_capacity,
+            self.settings.visited_error_rate
+        )
+
+    def admit(self, url: str) -> bool:
+        """Check a newly discovered URL against the trap heuristics."""
+        if not self.traps:
+            return True
+        reason = self.traps.check(url)
+        if reason:
+            logger.debug(f"Pruned {url}: {reason}")
+            self.metrics.inc("links_pruned")
+            return False
+        return True
 
     def scrape(self):
-        """Main scraping function with concurrent processing."""
-        to_visit = {str(self.settings.base_url)}
-        self.visited_links = set()
+        """Main scraping function with concurrent processing.
+
+        URLs are marked as seen when they are queued, so ``visited_links``
+        doubles as the frontier's dedup set and every URL is fetched once.
+        """
+        start_url = str(self.settings.base_url)
+        self.visited_links = seen = self.new_url_set()
+        seen.add(start_url)
+        processed = 0
+        max_pages = self.settings.max_pages
         
-        with self.progress:
-            while to_visit:
+        with self.new_frontier() as to_visit, \
+                (self.progress if self.show_progress and self.owns_progress else nullcontext()):
+            task = (
+                self.progress.add_task(f"Crawling {urlparse(start_url).netloc}", total=1)
+                if self.show_progress else None
+            )
+            to_visit.push(start_url)
+            while to_visit and not (max_pages and processed >= max_pages):
+                size = min(self.settings.max_workers, max_pages - processed) if max_pages else self.settings.max_workers
+                batch = to_visit.pop_batch(size)
                 with ThreadPoolExecutor(max_workers=self.settings.max_workers) as executor:
-                    future_to_url = {
-                        executor.submit(self.process_page, url): url 
-                        for url in list(to_visit)[:self.settings.max_workers]
-                    }
+                    future_to_url = {executor.submit(self.process_page, url): url for url in batch}
                     
                     for future in as_completed(future_to_url):
                         url = future_to_url[future]
-                        to_visit.remove(url)
-                        self.visited_links.add(url)
+                        processed += 1
                         
                         try:
-                            new_links = future.result()
-                            to_visit.update(new_links - self.visited_links)
-                            logger.info(f"Processed: {len(self.visited_links)}, To visit: {len(to_visit)}")
+                            for link in future.result():
+                                if link not in seen and self.admit(link):
+                                    seen.add(link)
+                                    to_visit.push(link)
+                            logger.info(f"Processed: {processed}, To visit: {len(to_visit)}")
                         except Exception as e:
                             logger.error(f"Error processing {url}: {e}")
+                        self.metrics.set_gauge("to_visit", len(to_visit))
+                        if task is not None:
+                            self.progress.update(task, completed=processed, total=processed + len(to_visit))
+                        self.metrics.set_gauge("visited", processed)
+                self.metrics.set_gauge("frontier_spilled", to_visit.spilled)
+
+        if self.snapshots and self.owns_snapshots:
+            self.snapshots.close()
+        if self.template and self.template.learned:
+            logger.info(
+                f"Site template: {self.template.template_size} repeated blocks, "
+                f"{self.template.blocks_removed} removed"
+            )
+        if self.duplicates:
+            self.write_duplicate_report()
+        if self.traps:
+            self.write_trap_report()
+        if self.link_graph is not None:
+            self.write_link_graph()
+        self.write_metrics()
+
+    def new_frontier(self):
+        """Spilling FIFO frontier, prioritized by an earlier run's page scores if available."""
+        frontier = SpillingFrontier(self.settings.frontier_memory_limit, self.settings.frontier_spill_dir)
+        graph_file = self.settings.link_graph_file
+        if not graph_file or not Path(graph_file).exists():
+            return frontier
+        try:
+            scores = LinkGraph.load_scores(graph_file, self.settings.page_score)
+        except (OSError, ValueError, KeyError) as e:
+            logger.error(f"Ignoring unreadable link graph {graph_file}: {e}")
+            return frontier
+        logger.info(f"Prioritizing {len(scores)} known pages by {self.settings.page_score} from {graph_file}")
+        return PriorityFrontier(scores, frontier)
+
+    def write_metrics(self):
+        """Export the run metrics to the configured JSON and Prometheus files."""
+        try:
+            if self.settings.metrics_file:
+                self.metrics.write_json(self.settings.metrics_file)
+            if self.settings.prometheus_file:
+                self.metrics.write_prometheus(self.settings.prometheus_file)
+        except Exception as e:
+            logger.error(f"Error saving metrics: {e}")
+
+    def write_duplicate_report(self):
+        """Write the near-duplicate report next to the output file."""
+        report = self.duplicates.report()
+        logger.info(
+            f"Near-duplicates: {report['duplicate_count']} of "
+            f"{report['duplicate_count'] + report['pages_indexed']} pages"
+        )
+        if not self.settings.output_file:
+            return
+        report_file = Path(self.settings.output_file).with_suffix(".duplicates.json")
+        try:
+            report_file.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        except Exception as e:
+            logger.error(f"Error saving duplicate report: {e}")
+
+    def write_link_graph(self):
+        """Export the link graph with in-degree and PageRank of every page.
+
+        An existing graph file is merged in, so a run stopped by ``max_pages``
+        does not replace a full graph with a truncated one.
+        """
+        graph_file = Path(self.settings.link_graph_file)
+        try:
+            if graph_file.exists():
+                self.link_graph.merge(LinkGraph.load(graph_file))
+            summary = self.link_graph.export(graph_file)
+        except Exception as e:
+            logger.error(f"Error saving link graph: {e}")
+            return
+        logger.info(
+            f"Link graph: {summary['nodes']} pages, {summary['edges']} links; "
+            f"most central: {', '.join(summary['top_pages'][:3])}"
+        )
+
+    def write_trap_report(self):
+        """Log the pruned trap URLs and write the report next to the output file."""
+        report = self.traps.report()
+        if not report["pruned_total"]:
+            return
+        logger.info(
+            "Pruned crawler traps: "
+            + ", ".join(f"{reason}={count}" for reason, count in sorted(report["pruned"].items()))
+        )
+        if not self.settings.output_file:
+            return
+        report_file = Path(self.settings.output_file).with_suffix(".traps.json")
+        try:
+            report_file.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        except Exception as e:
+            logger.error(f"Error saving trap report: {e}")
 
-def main(url: str, output_dir: Optional[str] = None):
+def main(
+    url: str,
+    output_dir: Optional[str] = None,
+    duplicate_action: Optional[str] = None,
+    metrics_file: Optional[str] = None,
+    prometheus_file: Optional[str] = None,
+    profile_file: Optional[str] = None,
+    quiet: bool = False,
+    snapshot_file: Optional[str] = None,
+    link_graph_file: Optional[str] = None,
+    max_pages: Optional[int] = None
+):
     """CLI entry point."""
+    setup_logging(quiet=quiet)
     settings_data = {}
     if output_dir:
         settings_data["save_dir"] = Path(output_dir)
+    if duplicate_action:
+        settings_data["duplicate_action"] = duplicate_action
+    if metrics_file:
+        settings_data["metrics_file"] = Path(metrics_file)
+    if prometheus_file:
+        settings_data["prometheus_file"] = Path(prometheus_file)
+    if snapshot_file:
+        settings_data["snapshot_file"] = Path(snapshot_file)
+    if link_graph_file:
+        settings_data["link_graph_file"] = Path(link_graph_file)
+    if max_pages:
+        settings_data["max_pages"] = max_pages
     
     settings = ScraperSettings(
         base_url=url,
@@ -219,11 +701,18 @@ def main(url: str, output_dir: Optional[str] = None):
         domain = urlparse(url).netloc.split(".")[0]
         settings.output_file = settings.save_dir / f"{domain}_docs.md"
     
-    with console.status("[bold green]Initializing scraper...") as status:
+    profiler = SamplingProfiler().start() if profile_file else None
+    try:
+        # The scraper's progress bar is the only live display of the run
         scraper = DocsScraper(settings)
-        status.update("[bold yellow]Scraping documentation...")
         scraper.scrape()
-        status.update("[bold green]Scraping complete!")
+        console.print("[bold green]Scraping complete!")
+    finally:
+        stop_logging()
+        if profiler:
+            profiler.stop()
+            report = profiler.write_report(profile_file)
+            console.print(f"Profile written to: {report['folded']} (summary: {report['summary']})")
         
     console.print(f"\nDocumentation saved at: {settings.output_file}")
 
@@ -1,4 +1,4 @@
-from setuptools import setup, find_packages
+from setuptools import setup
 
 with open("README.md", "r", encoding="utf-8") as fh:
     long_description = fh.read()
@@ -12,7 +12,9 @@ setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/AIFlowML/doc_4_cursor",
-    packages=find_packages(),
+    # setup.py lives inside the package, so map the package onto this directory
+    packages=["doc_scraper"],
+    package_dir={"doc_scraper": "."},
     classifiers=[
         "Development Status :: 3 - Alpha",
         "Intended Audience :: Developers",
@@ -0,0 +1,166 @@
+"""
+Site profiles from sites_config.yaml and concurrent multi-site crawls.
+"""
+import json
+import logging
+import threading
+import time
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+import requests
+import yaml
+from requests.adapters import HTTPAdapter
+
+from .scraper import BOILERPLATE_SELECTORS, DocsScraper, ScraperSettings, crawl_progress, xpath_to_css
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SITES_CONFIG = Path(__file__).resolve().parent / "config" / "sites_config.yaml"
+
+def profile_settings(name: str, profile: Dict, defaults: Dict, save_dir: Optional[Path] = None) -> ScraperSettings:
+    """Build the settings for one site profile on top of the shared defaults.
+
+    ``selectors.content``, ``include_patterns``, ``exclude_patterns`` and
+    ``clean_patterns`` map onto the matching settings; ``regex:`` clean
+    patterns are applied to the markdown and ``xpath:`` ones are translated
+    into boilerplate selectors. Any other key is passed through as a setting.
+    """
+    data = dict(defaults)
+    data.update({
+        key: value for key, value in profile.items()
+        if key not in ("selectors", "clean_patterns")
+    })
+
+    content_selectors = profile.get("selectors", {}).get("content")
+    if content_selectors:
+        data["content_selectors"] = content_selectors
+
+    regexes, boilerplate = [], []
+    for pattern in profile.get("clean_patterns", []):
+        kind, _, expression = pattern.partition(":")
+        if kind == "regex":
+            regexes.append(expression)
+        elif kind == "xpath" and xpath_to_css(expression):
+            boilerplate.append(xpath_to_css(expression))
+        else:
+            logger.warning(f"Ignoring unsupported clean pattern in profile '{name}': {pattern}")
+    if regexes:
+        data["clean_patterns"] = regexes
+    if boilerplate:
+        data["boilerplate_selectors"] = BOILERPLATE_SELECTORS + boilerplate
+
+    if save_dir:
+        data["save_dir"] = save_dir
+    settings = ScraperSettings(**data)
+    if not settings.output_file:
+        settings.output_file = settings.save_dir / f"{name}_docs.md"
+    return settings
+
+def load_site_profiles(
+    config_path: Path = DEFAULT_SITES_CONFIG,
+    save_dir: Optional[Path] = None,
+    names: Optional[Iterable[str]] = None
+) -> Dict[str, ScraperSettings]:
+    """Load every site profile (all top-level keys except ``default``)."""
+    with open(config_path, encoding="utf-8") as f:
+        config = yaml.safe_load(f) or {}
+
+    defaults = config.get("default", {})
+    # The default base_url is a placeholder, each profile names its own site
+    defaults = {key: value for key, value in defaults.items() if key != "base_url"}
+
+    wanted = set(names) if names else None
+    profiles = {}
+    for name, profile in config.items():
+        if name == "default" or (wanted is not None and name not in wanted):
+            continue
+        if not profile.get("base_url"):
+            logger.warning(f"Skipping site profile '{name}': no base_url")
+            continue
+        profiles[name] = profile_settings(name, profile, defaults, save_dir)
+
+    if wanted:
+        missing = wanted - set(profiles)
+        if missing:
+            raise ValueError(f"Unknown or incomplete site profiles: {', '.join(sorted(missing))}")
+    return profiles
+
+def scrape_all(
+    profiles: Dict[str, ScraperSettings],
+    max_total_workers: int = 10,
+    max_sites: Optional[int] = None,
+    summary_file: Optional[Path] = None,
+    show_progress: bool = False
+) -> Dict:
+    """Crawl several sites concurrently from one process.
+
+    Every site runs its own scraper with its own ``max_workers`` limit, while
+    a shared semaphore caps the requests in flight across all sites at
+    ``max_total_workers`` and a single session reuses connection pools.
+    With ``show_progress`` all sites share one progress display with a bar
+    per site. Returns (and optionally writes) a combined run summary.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=max(len(profiles), 1), pool_maxsize=max_total_workers)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    limiter = threading.BoundedSemaphore(max_total_workers)
+
+    def run_site(name: str, settings: ScraperSettings) -> Dict:
+        started = time.time()
+        scraper, status, error = None, "ok", None
+        try:
+            # A bad profile (e.g. an invalid clean pattern) only fails its own site
+            settings.save_dir.mkdir(parents=True, exist_ok=True)
+            scraper = DocsScraper(settings, session=session, fetch_limiter=limiter,
+                                  show_progress=show_progress, progress=progress)
+            scraper.scrape()
+        except Exception as e:
+            logger.error(f"Site '{name}' failed: {e}")
+            status, error = "failed", str(e)
+        metrics = scraper.metrics.summary() if scraper else {"counters": {}, "stages": {}}
+        return {
+            "site": name,
+            "base_url": str(settings.base_url),
+            "output_file": str(settings.output_file),
+            "status": status,
+            "error": error,
+            "pages_visited": len(scraper.visited_links) if scraper else 0,
+            "pages_saved": metrics["counters"].get("pages_saved", 0),
+            "errors": sum(stage["errors"] for stage in metrics["stages"].values()),
+            "duration_seconds": round(time.time() - started, 3),
+        }
+
+    started = time.time()
+    results = []
+    progress = crawl_progress() if show_progress else None
+    with ThreadPoolExecutor(max_workers=max_sites or max(len(profiles), 1)) as executor, \
+            (progress if progress is not None else nullcontext()):
+        futures = [executor.submit(run_site, name, settings) for name, settings in profiles.items()]
+        for future in as_completed(futures):
+            result = future.result()
+            logger.info(
+                f"Finished {result['site']}: {result['pages_saved']} pages saved "
+                f"in {result['duration_seconds']}s ({result['status']})"
+            )
+            results.append(result)
+    session.close()
+
+    summary = {
+        "duration_seconds": round(time.time() - started, 3),
+        "max_total_workers": max_total_workers,
+        "sites": sorted(results, key=lambda result: result["site"]),
+        "totals": {
+            "sites": len(results),
+            "failed": sum(1 for result in results if result["status"] != "ok"),
+            "pages_visited": sum(result["pages_visited"] for result in results),
+            "pages_saved": sum(result["pages_saved"] for result in results),
+            "errors": sum(result["errors"] for result in results),
+        },
+    }
+    if summary_file:
+        Path(summary_file).write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    return summary
@@ -0,0 +1,182 @@
+"""
+Per-run snapshots of page sections and section-level diffs between runs.
+"""
+import hashlib
+import json
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple, Union
+
+_HEADING_RE = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_SETEXT_RE = re.compile(r"^\s{0,3}(=+|-+)\s*$")
+_FENCE_RE = re.compile(r"^\s{0,3}(`{3,}|~{3,})")
+
+def split_sections(markdown: str) -> List[Tuple[str, str]]:
+    """Split markdown into ``(heading path, text)`` sections.
+
+    ATX (``## Title``) and setext (``Title`` underlined with ``=`` or ``-``,
+    as markdownify writes h1 and h2) headings are recognized. The path joins
+    the enclosing headings with `` > `` (e.g. ``Install > From source``);
+    text before the first heading has the path ``""``.
+    Headings inside fenced code blocks are ignored, and a path that repeats
+    within a page gets a `` [2]``, `` [3]``... suffix so every key is unique.
+    """
+    sections: List[Tuple[str, str]] = []
+    seen: Dict[str, int] = {}
+    stack: List[Tuple[int, str]] = []
+    path, lines, fence = "", [], None
+
+    def close_section():
+        text = "\n".join(lines).strip()
+        if text or path:
+            count = seen[path] = seen.get(path, 0) + 1
+            sections.append((path if count == 1 else f"{path} [{count}]", text))
+
+    for line in markdown.splitlines():
+        fence_match = _FENCE_RE.match(line)
+        if fence_match:
+            marker = fence_match.group(1)
+            if fence is None:
+                fence = marker
+            elif marker[0] == fence[0] and len(marker) >= len(fence):
+                fence = None
+        if fence is not None or fence_match:
+            lines.append(line.rstrip())
+            continue
+        heading = _HEADING_RE.match(line)
+        setext = _SETEXT_RE.match(line) if not heading and lines and lines[-1].strip() else None
+        if heading:
+            level, title = len(heading.group(1)), heading.group(2)
+        elif setext:
+            level, title = (1 if setext.group(1)[0] == "=" else 2), lines.pop().strip()
+        else:
+            lines.append(line.rstrip())
+            continue
+        close_section()
+        while stack and stack[-1][0] >= level:
+            stack.pop()
+        stack.append((level, title))
+        path, lines = " > ".join(name for _, name in stack), []
+    close_section()
+    return sections
+
+def text_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+
+def page_record(url: str, markdown: str) -> Dict:
+    """Snapshot entry for one page: its hash and a hash per section path."""
+    sections = {path: text_hash(text) for path, text in split_sections(markdown)}
+    page_hash = text_hash(json.dumps(sections, sort_keys=True))
+    return {"url": url, "hash": page_hash, "sections": sections}
+
+class SnapshotWriter:
+    """Append one JSON line per saved page to a run snapshot file.
+
+    The file is truncated when the first page is added, so each run writes a
+    fresh snapshot; ``add`` may be called from several threads.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.pages = 0
+        self._file = None
+        self._lock = threading.Lock()
+
+    def add(self, url: str, markdown: str) -> None:
+        line = json.dumps(page_record(url, markdown), ensure_ascii=False) + "\n"
+        with self._lock:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, "w", encoding="utf-8")
+            self._file.write(line)
+            self.pages += 1
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self) -> "SnapshotWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+def _read_records(path: Union[str, Path]) -> Iterator[Tuple[int, Dict]]:
+    with open(path, "rb") as f:
+        offset = 0
+        for line in f:
+            if line.strip():
+                yield offset, json.loads(line)
+            offset += len(line)
+
+def diff_snapshots(old_path: Union[str, Path], new_path: Union[str, Path]) -> Dict:
+    """Compare two run snapshots section by section.
+
+    Only the old run's URLs, page hashes and file offsets are kept in memory;
+    the new run is streamed, pages with an unchanged hash are skipped without
+    comparing sections, and the old sections of a changed page are read back
+    from their offset. Sections are matched by heading path, so a renamed
+    heading shows up as one removed and one added section.
+
+    Returns totals plus one entry per added, removed or modified page, listing
+    the ``added``, ``removed`` and ``modified`` section paths.
+    """
+    index: Dict[str, Tuple[str, int]] = {}
+    for offset, record in _read_records(old_path):
+        index[record["url"]] = (record["hash"], offset)
+
+    changes: List[Dict] = []
+    pages = {"added": 0, "removed": 0, "modified": 0, "unchanged": 0}
+    sections = {"added": 0, "removed": 0, "modified": 0}
+
+    def report(url: str, status: str, added=(), removed=(), modified=()):
+        pages[status] += 1
+        sections["added"] += len(added)
+        sections["removed"] += len(removed)
+        sections["modified"] += len(modified)
+        changes.append({
+            "url": url,
+            "status": status,
+            "added": list(added),
+            "removed": list(removed),
+            "modified": list(modified),
+        })
+
+    with open(old_path, "rb") as old_file:
+        for _, record in _read_records(new_path):
+            url = record["url"]
+            previous = index.pop(url, None)
+            if previous is None:
+                report(url, "added", added=record["sections"])
+                continue
+            page_hash, offset = previous
+            if page_hash == record["hash"]:
+                pages["unchanged"] += 1
+                continue
+            old_file.seek(offset)
+            old_sections = json.loads(old_file.readline())["sections"]
+            new_sections = record["sections"]
+            report(
+                url, "modified",
+                added=[path for path in new_sections if path not in old_sections],
+                removed=[path for path in old_sections if path not in new_sections],
+                modified=[
+                    path for path, digest in new_sections.items()
+                    if path in old_sections and old_sections[path] != digest
+                ],
+            )
+
+        for url, (_, offset) in index.items():
+            old_file.seek(offset)
+            report(url, "removed", removed=json.loads(old_file.readline())["sections"])
+
+    return {
+        "old": str(old_path),
+        "new": str(new_path),
+        "pages": pages,
+        "sections": sections,
+        "changes": changes,
+    }
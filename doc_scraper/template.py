@@ -0,0 +1,108 @@
+"""
+Site template learning: detects blocks repeated across pages of a crawl.
+"""
+import hashlib
+import math
+import threading
+from collections import Counter
+from typing import List, Optional, Set, Tuple
+
+from bs4 import Comment, NavigableString, Tag
+
+# Elements considered as candidate template blocks
+BLOCK_TAGS = {
+    "div", "section", "aside", "nav", "header", "footer",
+    "ul", "ol", "dl", "table", "p", "form",
+}
+
+class TemplateLearner:
+    """Learns the blocks a site repeats on every page and strips them.
+
+    The first ``sample_pages`` pages are fingerprinted: every block element is
+    hashed bottom-up from its tag names and normalized text, so each page costs
+    a single DOM traversal. Blocks that occur on at least ``min_ratio`` of the
+    sampled pages form the site template and are removed from every later page
+    before conversion.
+    """
+
+    def __init__(self, sample_pages: int = 10, min_ratio: float = 0.6, min_chars: int = 20):
+        self.sample_pages = sample_pages
+        self.min_ratio = min_ratio
+        self.min_chars = min_chars
+        self.pages_sampled = 0
+        self.blocks_removed = 0
+        self._counts: Counter = Counter()
+        self._template: Optional[Set[bytes]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def learned(self) -> bool:
+        """Whether sampling is over and the template is in use."""
+        return self._template is not None
+
+    @property
+    def template_size(self) -> int:
+        """Number of distinct blocks in the learned template."""
+        return len(self._template) if self._template else 0
+
+    def _fingerprint(self, node: Tag, blocks: List[Tuple[bytes, Tag]]) -> Tuple[bytes, int]:
+        """Hash a subtree, collecting block elements in post-order."""
+        digest = hashlib.blake2b(node.name.encode("utf-8"), digest_size=8)
+        length = 0
+        for child in node.children:
+            if isinstance(child, Tag):
+                child_digest, child_length = self._fingerprint(child, blocks)
+                digest.update(child_digest)
+                length += child_length
+            elif isinstance(child, NavigableString) and not isinstance(child, Comment):
+                text = " ".join(child.split())
+                if text:
+                    digest.update(text.encode("utf-8"))
+                    length += len(text)
+
+        value = digest.digest()
+        if node.name in BLOCK_TAGS and length >= self.min_chars:
+            blocks.append((value, node))
+        return value, length
+
+    def blocks(self, element: Tag) -> List[Tuple[bytes, Tag]]:
+        """Fingerprints of the block elements below ``element``."""
+        blocks: List[Tuple[bytes, Tag]] = []
+        for child in element.find_all(True, recursive=False):
+            self._fingerprint(child, blocks)
+        return blocks
+
+    def _learn(self, blocks: List[Tuple[bytes, Tag]]) -> None:
+        with self._lock:
+            if self._template is not None:
+                return
+            self._counts.update({digest for digest, _ in blocks})
+            self.pages_sampled += 1
+            if self.pages_sampled >= self.sample_pages:
+                threshold = max(2, math.ceil(self.min_ratio * self.pages_sampled))
+                self._template = {
+                    digest for digest, count in self._counts.items() if count >= threshold
+                }
+                self._counts.clear()
+
+    def process(self, element: Tag) -> int:
+        """Sample or strip a page's content element in place.
+
+        Returns the number of template blocks removed.
+        """
+        blocks = self.blocks(element)
+        if self._template is None:
+            self._learn(blocks)
+            return 0
+
+        removed = 0
+        # Post-order puts parents after their children; walk it backwards so
+        # a removed parent takes its descendants with it.
+        for digest, node in reversed(blocks):
+            if digest in self._template and not node.decomposed:
+                node.decompose()
+                removed += 1
+        if removed:
+            with self._lock:
+                self.blocks_removed += removed
+        return removed
@@ -0,0 +1,17 @@
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+
+def test_cli_import_skips_heavy_dependencies():
+    """Test that importing the CLI does not load the scraper stack or configure logging."""
+    code = (
+        "import sys, logging, doc_scraper.cli; "
+        "print(sorted(m for m in ('requests', 'bs4', 'markdownify', 'pydantic') if m in sys.modules)); "
+        "print(len(logging.getLogger().handlers))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    assert result.stdout.split() == ["[]", "0"]
@@ -0,0 +1,75 @@
+from bs4 import BeautifulSoup
+from markdownify import markdownify as md
+from doc_scraper.convert import FastMarkdownConverter, code_language
+
+def article(html):
+    return BeautifulSoup(f"<article>{html}</article>", "html.parser").article
+
+def test_code_language_hints():
+    """Test language detection for common highlighter markups."""
+    soup = BeautifulSoup(
+        '<pre id="a"><code class="language-python">x</code></pre>'
+        '<div class="highlight-bash notranslate"><div class="highlight"><pre id="b">ls</pre></div></div>'
+        '<pre id="c" class="lang-js">1</pre>'
+        '<pre id="d">plain</pre>',
+        "html.parser"
+    )
+    assert code_language(soup.find(id="a")) == "python"
+    assert code_language(soup.find(id="b").parent) == "bash"
+    assert code_language(soup.find(id="c")) == "js"
+    assert code_language(soup.find(id="d")) is None
+
+def test_code_blocks_keep_language_and_indentation():
+    """Test fenced code inside list items, with line numbers removed."""
+    element = article(
+        "<ol><li><p>Install</p><pre><code class='language-bash'>pip install x\n  --upgrade</code></pre></li></ol>"
+        "<div class='highlight'><table class='highlighttable'><tr>"
+        "<td class='linenos'><pre>1\n2</pre></td><td class='code'><pre>a = 1\nb = '```'</pre></td>"
+        "</tr></table></div>"
+    )
+    markdown = FastMarkdownConverter().convert(element)
+    assert "   ```bash\n   pip install x\n     --upgrade\n   ```" in markdown
+    assert "````\na = 1\nb = '```'\n````" in markdown
+    assert "1\n2" not in markdown
+    assert "mdblock" not in markdown
+
+def test_tables_become_pipe_tables():
+    """Test header detection, inline markup, escaping and colspan."""
+    element = article(
+        "<table><thead><tr><th>Name</th><th>Description</th></tr></thead><tbody>"
+        "<tr><td><code>api_key</code></td><td>See <a href='/auth'>auth</a> | docs</td></tr>"
+        "<tr><td colspan='2'><strong>Deprecated</strong></td></tr>"
+        "</tbody></table>"
+    )
+    assert FastMarkdownConverter().convert(element) == (
+        "| Name | Description |\n"
+        "| --- | --- |\n"
+        "| `api_key` | See [auth](/auth) \\| docs |\n"
+        "| **Deprecated** |  |"
+    )
+
+def test_prose_matches_markdownify():
+    """Test that pages without code or tables convert exactly as before."""
+    html = "<h1>Guide</h1><p>Some <em>snake_case</em> text with <a href='/x'>a link</a>.</p><ul><li>one</li><li>two</li></ul>"
+    assert FastMarkdownConverter().convert(article(html)) == md(f"<article>{html}</article>")
+
+def test_tables_with_code_use_markdownify():
+    """Test that block code inside a table cell is kept, not left as a placeholder."""
+    html = (
+        "<p>Before</p><pre>top = 1</pre>"
+        "<table><tr><th>Example</th><th>Meaning</th></tr>"
+        "<tr><td><pre><code>x = 1</code></pre></td><td>set x</td></tr></table>"
+        "<table><tr><td><div class='highlight'><pre>y = 2</pre></div></td></tr></table>"
+    )
+    markdown = FastMarkdownConverter().convert(article(html))
+    assert "mdblock" not in markdown
+    assert "```\ntop = 1\n```" in markdown
+    assert "x = 1" in markdown and "set x" in markdown
+    assert "y = 2" in markdown
+
+def test_inline_highlight_stays_prose():
+    """Test that an inline .highlight span is not turned into a code block."""
+    html = '<p>Use <span class="highlight">this</span> word inline.</p>'
+    markdown = FastMarkdownConverter().convert(article(html))
+    assert markdown == "Use this word inline."
+    assert markdown == md(f"<article>{html}</article>").strip("\n")
@@ -0,0 +1,34 @@
+from doc_scraper.dedup import NearDuplicateIndex, simhash, hamming_distance
+
+PAGE = (
+    "Install the client library with pip and configure your API key before "
+    "creating the first agent. Agents combine a model, tools and memory, and "
+    "every run returns a structured response that can be streamed to the user."
+)
+
+def test_simhash_similar_pages_are_close():
+    """Test that a small edit keeps fingerprints close and new text does not."""
+    edited = PAGE.replace("first agent", "first assistant")
+    other = "Pricing plans are billed monthly and include a free tier for small teams " * 3
+    assert hamming_distance(simhash(PAGE), simhash(edited)) < hamming_distance(simhash(PAGE), simhash(other))
+
+def test_index_flags_near_duplicates():
+    """Test that mirrored pages are reported against the first copy."""
+    index = NearDuplicateIndex(max_distance=3, min_words=5)
+    assert index.add("https://docs.example.com/v1/agents", PAGE) is None
+    assert index.add("https://docs.example.com/v2/agents", PAGE + " ") == "https://docs.example.com/v1/agents"
+    assert index.add("https://docs.example.com/pricing", "Completely different page about pricing plans and billing cycles") is None
+
+    report = index.report()
+    assert report["pages_indexed"] == 2
+    assert report["duplicates"] == [{
+        "url": "https://docs.example.com/v2/agents",
+        "duplicate_of": "https://docs.example.com/v1/agents",
+        "distance": 0,
+    }]
+
+def test_index_ignores_short_pages():
+    """Test that stub pages are never flagged as duplicates."""
+    index = NearDuplicateIndex(min_words=20)
+    assert index.add("https://docs.example.com/a", "Coming soon") is None
+    assert index.add("https://docs.example.com/b", "Coming soon") is None
@@ -0,0 +1,88 @@
+import threading
+from doc_scraper.distributed import DistributedScraper, SQLiteCrawlStore
+from doc_scraper.scraper import DocsScraper, ScraperSettings
+
+BASE_URL = "https://docs.example.com/"
+
+def fake_site(self, url):
+    """Six pages: the root links to every page, every page links back to the root."""
+    links = "".join(f'<a href="/page-{i}">Page {i}</a>' for i in range(1, 6))
+    return f"<article><p>Content of {url}</p>{links}</article>"
+
+def test_leases_are_exclusive_and_expire(tmp_path):
+    """Test that leased URLs go to one worker and come back when the lease expires."""
+    store = SQLiteCrawlStore(tmp_path / "frontier.db", lease_seconds=60)
+    other = SQLiteCrawlStore(tmp_path / "frontier.db", lease_seconds=60)
+    assert store.add(["a", "b", "c"]) == 3
+    assert store.add(["a", "d"]) == 1
+
+    assert store.lease("w1", 2) == ["a", "b"]
+    assert other.lease("w2", 10) == ["c", "d"]
+    assert store.lease("w1", 10) == []
+
+    store.complete("a", "w1", "content of a")
+    # w1 died holding "b": once its lease expires another worker picks it up
+    store.conn.execute("UPDATE urls SET lease_expires = 0 WHERE url = 'b'")
+    assert other.lease("w2", 10) == ["b"]
+    # Late completions from the dead worker are ignored, content included
+    store.complete("b", "w1", "stale content of b")
+    assert store.stats()["leased"] == 3
+    assert store.stats()["pages"] == 1
+
+    for url in ("b", "c", "d"):
+        other.complete(url, "w2")
+    assert store.is_done()
+    assert list(store.pages()) == [("a", "content of a")]
+
+def test_failed_urls_are_retried_then_given_up(tmp_path):
+    """Test that a URL is requeued on failure until max_attempts is reached."""
+    store = SQLiteCrawlStore(tmp_path / "frontier.db", max_attempts=2)
+    store.add(["a"])
+    store.fail(store.lease("w1", 1)[0], "w1")
+    assert store.stats()["pending"] == 1
+    store.fail(store.lease("w1", 1)[0], "w1")
+    assert store.stats()["failed"] == 1
+    assert store.is_done()
+
+def test_workers_share_the_frontier(tmp_path, monkeypatch):
+    """Test that concurrent workers crawl every page exactly once between them."""
+    monkeypatch.setattr(DocsScraper, "fetch_page", fake_site)
+    frontier = tmp_path / "frontier.db"
+    SQLiteCrawlStore(frontier).add([BASE_URL])
+
+    def run_worker(worker_id):
+        settings = ScraperSettings(base_url=BASE_URL, max_workers=2, save_dir=tmp_path)
+        store = SQLiteCrawlStore(frontier)
+        DistributedScraper(settings, store, worker_id=worker_id, poll_interval=0.01).scrape()
+        store.close()
+
+    workers = [threading.Thread(target=run_worker, args=(f"w{i}",)) for i in range(2)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+
+    store = SQLiteCrawlStore(frontier)
+    assert store.stats() == {"pending": 0, "leased": 0, "done": 6, "failed": 0, "pages": 6}
+    assert store.export(tmp_path / "docs.md") == 6
+    docs = (tmp_path / "docs.md").read_text()
+    assert docs.count("Content of") == 6
+    assert "# Page 3" in docs
+
+def test_failed_fetches_are_retried_by_the_store(tmp_path, monkeypatch):
+    """Test that a fetch error hands the URL back until max_attempts is used up."""
+    attempts = []
+
+    def flaky_site(self, url):
+        if url.endswith("/page-2"):
+            attempts.append(url)
+            raise ConnectionError("connection reset")
+        return fake_site(self, url)
+
+    monkeypatch.setattr(DocsScraper, "fetch_page", flaky_site)
+    settings = ScraperSettings(base_url=BASE_URL, max_workers=2, save_dir=tmp_path, retry_attempts=1)
+    store = SQLiteCrawlStore(tmp_path / "frontier.db", max_attempts=3)
+    DistributedScraper(settings, store, worker_id="w1", poll_interval=0.01).scrape()
+
+    assert len(attempts) == 3
+    assert store.stats() == {"pending": 0, "leased": 0, "done": 5, "failed": 1, "pages": 5}
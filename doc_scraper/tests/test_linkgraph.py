@@ -0,0 +1,115 @@
+import json
+
+import pytest
+
+from doc_scraper.linkgraph import LinkGraph
+from doc_scraper.scraper import DocsScraper, ScraperSettings
+from doc_scraper.urlset import PriorityFrontier
+
+BASE = "https://docs.example.com"
+
+def star_graph() -> LinkGraph:
+    graph = LinkGraph()
+    graph.add_links("root", ["a", "b", "hub"])
+    graph.add_links("a", ["hub", "a"])
+    graph.add_links("b", ["hub"])
+    graph.add_links("hub", ["root"])
+    return graph
+
+def test_in_degree_and_pagerank():
+    """Test that the page most linked to ranks highest and scores sum to one."""
+    graph = star_graph()
+    assert len(graph) == 4
+    assert graph.edge_count == 6  # the self-link is dropped
+
+    in_degree = graph.scores("in_degree")
+    assert in_degree == {"root": 1, "a": 1, "b": 1, "hub": 3}
+
+    pagerank = graph.scores("pagerank")
+    assert sum(pagerank.values()) == pytest.approx(1.0)
+    assert max(pagerank, key=pagerank.get) == "hub"
+    assert pagerank["a"] == pytest.approx(pagerank["b"])
+
+    with pytest.raises(ValueError):
+        graph.scores("clicks")
+
+def test_export_and_load_scores(tmp_path):
+    """Test the exported nodes, edges and summary round-trip to scores."""
+    graph = star_graph()
+    graph.add_links("b", [])  # re-crawling a page adds no edges
+    path = tmp_path / "graphs" / "links.json"
+
+    summary = graph.export(path)
+
+    assert summary["nodes"] == 4 and summary["edges"] == 6
+    assert summary["top_pages"][0] == "hub"
+    data = json.loads(path.read_text())
+    assert data["nodes"][0] == {
+        "url": "root", "crawled": True, "in_degree": 1, "pagerank": data["nodes"][0]["pagerank"]
+    }
+    assert [graph.urls[s] for s, t in data["edges"] if graph.urls[t] == "hub"] == ["root", "a", "b"]
+    assert LinkGraph.load_scores(path, "in_degree")["hub"] == 3
+    assert LinkGraph.load_scores(path)["hub"] == pytest.approx(graph.scores()["hub"], abs=1e-9)
+
+def test_merge_keeps_links_of_pages_not_recrawled(tmp_path):
+    """Test that an earlier graph fills in pages this run did not crawl."""
+    star_graph().export(tmp_path / "links.json")
+    graph = LinkGraph()
+    graph.add_links("root", ["a", "new"])  # root dropped its links to b and hub
+
+    graph.merge(LinkGraph.load(tmp_path / "links.json"))
+
+    edges = {(graph.urls[s], graph.urls[t]) for s, t in zip(graph._sources, graph._targets)}
+    assert edges == {("root", "a"), ("root", "new"), ("a", "hub"), ("b", "hub"), ("hub", "root")}
+    assert graph.scores("in_degree") == {"root": 1, "a": 1, "new": 1, "b": 0, "hub": 2}
+
+def test_priority_frontier_orders_scored_urls_first():
+    """Test that scored URLs come out best first, then the rest in FIFO order."""
+    with PriorityFrontier({"low": 0.1, "high": 0.9, "mid": 0.5}) as frontier:
+        for url in ["new1", "low", "new2", "high", "mid"]:
+            frontier.push(url)
+        assert len(frontier) == 5
+        assert frontier.pop_batch(2) == ["high", "mid"]
+        assert frontier.pop_batch(10) == ["low", "new1", "new2"]
+        assert not frontier
+
+def test_budgeted_rerun_fetches_central_pages_first(monkeypatch, tmp_path):
+    """Test that a second run with a page budget follows the first run's PageRank."""
+    guides = [f"{BASE}/docs/guide{i}" for i in range(4)]
+    core = f"{BASE}/docs/core"
+    links = {f"{BASE}/docs/": guides + [core], core: [f"{BASE}/docs/"]}
+    links.update({guide: [core, f"{BASE}/docs/"] for guide in guides})
+    fetched = []
+
+    def fake_fetch(self, url):
+        fetched.append(url)
+        anchors = "".join(f'<a href="{link}">link</a>' for link in links[url])
+        return f"<article><h1>{url}</h1><p>Text of {url}</p>{anchors}</article>"
+
+    monkeypatch.setattr(DocsScraper, "fetch_page", fake_fetch)
+
+    def run(max_pages):
+        fetched.clear()
+        settings = ScraperSettings(
+            base_url=f"{BASE}/docs/",
+            output_file=tmp_path / f"docs{max_pages}.md",
+            link_graph_file=tmp_path / "links.json",
+            max_pages=max_pages,
+            max_workers=1,
+            template_sample_pages=0
+        )
+        DocsScraper(settings, show_progress=False).scrape()
+        return list(fetched)
+
+    first = run(0)
+    assert sorted(first) == sorted(links)
+    scores = LinkGraph.load_scores(tmp_path / "links.json")
+    assert sorted(scores, key=scores.get, reverse=True)[:2] == [f"{BASE}/docs/", core]
+
+    full = LinkGraph.load(tmp_path / "links.json")
+
+    assert run(2) == [f"{BASE}/docs/", core]
+    # The budgeted run is merged into the full graph rather than replacing it
+    merged = LinkGraph.load(tmp_path / "links.json")
+    assert merged.edge_count == full.edge_count
+    assert merged.scores() == pytest.approx(full.scores())
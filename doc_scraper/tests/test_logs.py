@@ -0,0 +1,43 @@
+import logging
+
+import pytest
+
+from doc_scraper.logs import setup_logging, stop_logging
+
+@pytest.fixture
+def root_logger():
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    yield root
+    stop_logging()
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+def test_quiet_logging_batches_console_output(root_logger, tmp_path, capsys):
+    """Test that quiet mode writes every record to the file but summarizes the console."""
+    setup_logging(str(tmp_path), quiet=True, summary_interval=60)
+    log = logging.getLogger("doc_scraper.scraper")
+    for i in range(100):
+        log.info(f"Processed: {i + 1}, To visit: 0")
+    log.warning("No content found for https://docs.example.com/empty")
+    log.error("Failed to fetch https://docs.example.com/broken")
+    stop_logging()
+
+    console = capsys.readouterr().err.splitlines()
+    assert len(console) == 2
+    assert "Failed to fetch" in console[0]
+    assert "101 messages" in console[1]
+    assert "INFO: 100, WARNING: 1" in console[1]
+    assert "last: No content found" in console[1]
+    assert len((tmp_path / "scraper.log").read_text().splitlines()) == 102
+
+def test_setup_logging_replaces_its_handlers(root_logger, tmp_path, capsys):
+    """Test that repeated setup, as in several runs in one process, logs each line once."""
+    before = len(root_logger.handlers)
+    for quiet in (False, False, True, False):
+        setup_logging(str(tmp_path), quiet=quiet)
+    assert len(root_logger.handlers) == before + 2
+
+    logging.getLogger("doc_scraper.scraper").info("Saved documentation")
+    assert len(capsys.readouterr().err.splitlines()) == 1
+    assert len((tmp_path / "scraper.log").read_text().splitlines()) == 1
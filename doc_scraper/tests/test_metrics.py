@@ -0,0 +1,41 @@
+import json
+import pytest
+from doc_scraper.metrics import CrawlMetrics
+
+def test_stage_timing_and_errors():
+    """Test that stages record latency, errors and sizes."""
+    metrics = CrawlMetrics(buckets=(0.1, 1.0))
+    with metrics.stage("fetch"):
+        pass
+    with pytest.raises(ValueError):
+        with metrics.stage("fetch"):
+            raise ValueError("boom")
+    metrics.add_bytes("markdown", 1000, 250)
+    metrics.inc("fetch_retries", 2)
+    metrics.set_gauge("to_visit", 10)
+    metrics.set_gauge("to_visit", 4)
+    
+    summary = metrics.summary()
+    assert summary["stages"]["fetch"]["latency"]["count"] == 2
+    assert summary["stages"]["fetch"]["errors"] == 1
+    assert summary["stages"]["markdown"]["bytes_in"] == 1000
+    assert summary["stages"]["markdown"]["bytes_out"] == 250
+    assert summary["counters"] == {"fetch_retries": 2}
+    assert summary["gauges"]["to_visit"] == {"last": 4, "max": 10}
+
+def test_exports(tmp_path):
+    """Test the JSON and Prometheus text exports."""
+    metrics = CrawlMetrics(buckets=(0.1, 1.0))
+    metrics.observe("parse", 0.05)
+    metrics.observe("parse", 0.5)
+    
+    metrics.write_json(tmp_path / "metrics.json")
+    assert json.loads((tmp_path / "metrics.json").read_text())["stages"]["parse"]["latency"]["buckets"] == {
+        "0.1": 1, "1.0": 2, "+Inf": 2
+    }
+    
+    metrics.write_prometheus(tmp_path / "metrics.prom")
+    text = (tmp_path / "metrics.prom").read_text()
+    assert '# TYPE doc_scraper_stage_duration_seconds histogram' in text
+    assert 'doc_scraper_stage_duration_seconds_bucket{stage="parse",le="0.1"} 1' in text
+    assert 'doc_scraper_stage_duration_seconds_count{stage="parse"} 2' in text
@@ -0,0 +1,21 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from doc_scraper.profiling import SamplingProfiler
+
+def busy_worker(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        sum(range(100))
+
+def test_profiler_samples_worker_threads(tmp_path):
+    """Test that pool threads are sampled and merged under one root."""
+    with SamplingProfiler(interval=0.001) as profiler:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            list(executor.map(busy_worker, [0.2, 0.2]))
+    
+    report = profiler.write_report(tmp_path / "run.folded")
+    lines = report["folded"].read_text().splitlines()
+    worker_lines = [line for line in lines if "busy_worker" in line]
+    assert worker_lines
+    assert all(line.startswith("ThreadPoolExecutor;") for line in worker_lines)
+    assert "test_profiling.py:busy_worker" in report["summary"].read_text()
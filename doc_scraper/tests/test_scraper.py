@@ -1,6 +1,33 @@
+import io
 import pytest
+import requests
 from pathlib import Path
-from doc_scraper.scraper import DocsScraper, ScraperSettings
+from bs4 import BeautifulSoup
+from doc_scraper.scraper import DocsScraper, PageSkipped, ScraperSettings, xpath_to_css
+
+class FakeSession:
+    """Session serving canned responses and recording the requests made."""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.calls = []
+
+    def _response(self, method, url):
+        self.calls.append((method, url))
+        headers, body = self.pages[url]
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response.headers.update(headers)
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.raw = io.BytesIO(b"" if method == "HEAD" else body)
+        return response
+
+    def get(self, url, **kwargs):
+        return self._response("GET", url)
+
+    def head(self, url, **kwargs):
+        return self._response("HEAD", url)
 
 def test_scraper_settings():
     """Test scraper settings initialization."""
@@ -39,4 +66,79 @@ def test_clean_content():
     assert "On this page" not in cleaned
     assert "5 min read" not in cleaned
     assert "Some real content here" in cleaned
-    assert "More content" in cleaned 
\ No newline at end of file
+    assert "More content" in cleaned 
+
+def test_extract_content_removes_boilerplate():
+    """Test that page chrome is pruned from the content element."""
+    settings = ScraperSettings(base_url="https://docs.example.com")
+    scraper = DocsScraper(settings)
+    
+    soup = BeautifulSoup("""
+    <div class="docs-content">
+        <nav><a href="/docs/a">A</a></nav>
+        <div class="sidebar">Sidebar links</div>
+        <h1>Agents</h1>
+        <p>Real content</p>
+        <div class="toc">On this page</div>
+        <div class="protocol-spec">Wire format</div>
+        <form><button>Try it</button></form>
+        <aside class="starlight-aside"><p>This deletes all your data irreversibly.</p></aside>
+        <aside class="sidebar">More guides</aside>
+        <footer>Copyright</footer>
+    </div>
+    """, "html.parser")
+    
+    content = scraper.extract_content(soup)
+    text = content.get_text()
+    assert "Real content" in text
+    assert "Agents" in text
+    assert "Sidebar links" not in text
+    assert "On this page" not in text
+    assert "Copyright" not in text
+    assert "More guides" not in text
+    # Whole class names only; forms shown as examples and callouts are content
+    assert "Wire format" in text
+    assert "Try it" in text
+    assert "This deletes all your data irreversibly." in text
+
+def test_extract_content_skips_empty_matches():
+    """Test that a selector left empty after pruning falls through to the next one."""
+    settings = ScraperSettings(base_url="https://docs.example.com")
+    scraper = DocsScraper(settings)
+    
+    soup = BeautifulSoup(
+        '<article><nav>Menu</nav></article><div class="docs-content"><p>Body</p></div>',
+        "html.parser"
+    )
+    assert scraper.extract_content(soup).get_text() == "Body"
+    assert scraper.extract_content(BeautifulSoup("<div>None</div>", "html.parser")) is None
+
+def test_xpath_to_css():
+    """Test translation of the site config xpath rules."""
+    assert xpath_to_css("//nav") == "nav"
+    assert xpath_to_css("//div[@class='sidebar']") == "div[class='sidebar']"
+    assert xpath_to_css("//div[contains(@class, 'toc')]") == "div[class*='toc']"
+    assert xpath_to_css("//a[text()='Next']") is None
+
+def test_fetch_page_filters_by_headers_and_size():
+    """Test that non-HTML and oversized responses are skipped without retries."""
+    html = {"Content-Type": "text/html"}
+    session = FakeSession({
+        "https://docs.example.com/guide": (html, "<p>Café</p>".encode()),
+        "https://docs.example.com/manual.pdf": ({"Content-Type": "application/pdf"}, b"%PDF"),
+        "https://docs.example.com/big": (html, b"x" * 2048),
+        "https://docs.example.com/huge": ({**html, "Content-Length": "999999"}, b""),
+    })
+    settings = ScraperSettings(base_url="https://docs.example.com", max_page_bytes=1024)
+    scraper = DocsScraper(settings, session=session)
+
+    assert scraper.fetch_page("https://docs.example.com/guide") == "<p>Café</p>"
+    for url in ("manual.pdf", "big", "huge"):
+        with pytest.raises(PageSkipped):
+            scraper.fetch_page(f"https://docs.example.com/{url}")
+    # The PDF is rejected by the HEAD pre-check and never downloaded
+    assert ("HEAD", "https://docs.example.com/manual.pdf") in session.calls
+    assert ("GET", "https://docs.example.com/manual.pdf") not in session.calls
+    assert scraper.metrics.summary()["counters"].get("fetch_retries", 0) == 0
+    assert scraper.process_page("https://docs.example.com/big") == set()
+    assert scraper.metrics.summary()["counters"]["pages_skipped"] == 1
@@ -0,0 +1,66 @@
+import json
+from doc_scraper.scraper import DocsScraper
+from doc_scraper.sites import DEFAULT_SITES_CONFIG, load_site_profiles, scrape_all
+
+SITES_YAML = """
+default:
+  base_url: "https://docs.example.com"
+  max_workers: 2
+
+alpha:
+  base_url: "https://alpha.example.com"
+  include_patterns: ["/docs/"]
+  clean_patterns:
+    - "regex:^Edit on GitHub"
+    - "xpath://div[contains(@class, 'banner')]"
+
+beta:
+  base_url: "https://beta.example.com"
+  max_workers: 4
+"""
+
+def test_load_bundled_profiles():
+    """Test that the bundled config yields the phidata profile."""
+    profiles = load_site_profiles(DEFAULT_SITES_CONFIG)
+    phidata = profiles["phidata"]
+    assert "main .content" in phidata.content_selectors
+    assert "/docs/" in phidata.include_patterns
+    assert "div[class*='breadcrumb']" in phidata.boilerplate_selectors
+    assert phidata.output_file.name == "phidata_docs.md"
+
+def test_scrape_all_writes_per_site_outputs(tmp_path, monkeypatch):
+    """Test that every profile is crawled into its own file with a combined summary."""
+    config_file = tmp_path / "sites.yaml"
+    config_file.write_text(SITES_YAML)
+    profiles = load_site_profiles(config_file, save_dir=tmp_path)
+    assert profiles["alpha"].max_workers == 2
+    assert profiles["beta"].max_workers == 4
+    assert profiles["alpha"].clean_patterns == ["^Edit on GitHub"]
+    
+    monkeypatch.setattr(
+        DocsScraper, "fetch_page",
+        lambda self, url: f"<article><p>Edit on GitHub</p><p>Docs for {url}</p></article>"
+    )
+    summary = scrape_all(profiles, max_total_workers=2, summary_file=tmp_path / "run_summary.json")
+    
+    assert summary["totals"] == {"sites": 2, "failed": 0, "pages_visited": 2, "pages_saved": 2, "errors": 0}
+    assert json.loads((tmp_path / "run_summary.json").read_text())["totals"]["pages_saved"] == 2
+    alpha = (tmp_path / "alpha_docs.md").read_text()
+    assert "Docs for https://alpha.example.com/" in alpha
+    assert "Edit on GitHub" not in alpha
+    assert (tmp_path / "beta_docs.md").exists()
+
+def test_scrape_all_isolates_a_failing_site(tmp_path, monkeypatch):
+    """Test that a profile failing to set up is reported without stopping the others."""
+    config_file = tmp_path / "sites.yaml"
+    config_file.write_text(SITES_YAML + '  clean_patterns: ["regex:[unclosed"]\n')
+    profiles = load_site_profiles(config_file, save_dir=tmp_path)
+    monkeypatch.setattr(DocsScraper, "fetch_page", lambda self, url: f"<article><p>Docs for {url}</p></article>")
+
+    summary = scrape_all(profiles, max_total_workers=2, summary_file=tmp_path / "run_summary.json")
+
+    sites = {site["site"]: site for site in summary["sites"]}
+    assert sites["alpha"]["status"] == "ok" and sites["alpha"]["pages_saved"] == 1
+    assert sites["beta"]["status"] == "failed" and sites["beta"]["error"]
+    assert sites["beta"]["pages_visited"] == 0
+    assert json.loads((tmp_path / "run_summary.json").read_text())["totals"]["failed"] == 1
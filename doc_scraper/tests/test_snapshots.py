@@ -0,0 +1,64 @@
+import json
+
+from doc_scraper.scraper import DocsScraper, ScraperSettings
+from doc_scraper.snapshots import SnapshotWriter, diff_snapshots, split_sections
+
+BASE = "https://docs.example.com"
+
+def test_split_sections_by_heading_path():
+    """Test ATX and setext headings, fenced code and repeated headings."""
+    markdown = (
+        "Intro text\n\n"
+        "Install\n=======\n\nRun pip.\n\n"
+        "From source\n-----------\n\n```bash\n# clone first\ngit clone repo\n```\n\n"
+        "### Notes\nBuild tools needed.\n\n"
+        "## From source\nAgain.\n\n---\n\nAfter a rule."
+    )
+    sections = split_sections(markdown)
+    assert [path for path, _ in sections] == [
+        "", "Install", "Install > From source", "Install > From source > Notes", "Install > From source [2]"
+    ]
+    assert "# clone first" in sections[2][1]
+    assert sections[4][1] == "Again.\n\n---\n\nAfter a rule."
+
+def test_diff_snapshots_reports_section_changes(tmp_path):
+    """Test added, removed and modified pages and sections between two runs."""
+    with SnapshotWriter(tmp_path / "old.jsonl") as old:
+        old.add(f"{BASE}/a", "# A\nintro\n## Usage\nv1\n## Legacy\nold api")
+        old.add(f"{BASE}/b", "# B\nsame")
+        old.add(f"{BASE}/gone", "# Gone\nbye")
+    with SnapshotWriter(tmp_path / "new.jsonl") as new:
+        new.add(f"{BASE}/b", "# B\nsame")
+        new.add(f"{BASE}/a", "# A\nintro\n## Usage\nv2\n## Config\nnew option")
+        new.add(f"{BASE}/c", "# C\nfresh")
+
+    report = diff_snapshots(tmp_path / "old.jsonl", tmp_path / "new.jsonl")
+
+    assert report["pages"] == {"added": 1, "removed": 1, "modified": 1, "unchanged": 1}
+    assert report["sections"] == {"added": 2, "removed": 2, "modified": 1}
+    changes = {change["url"]: change for change in report["changes"]}
+    assert changes[f"{BASE}/a"] == {
+        "url": f"{BASE}/a", "status": "modified",
+        "added": ["A > Config"], "removed": ["A > Legacy"], "modified": ["A > Usage"]
+    }
+    assert changes[f"{BASE}/c"]["added"] == ["C"]
+    assert changes[f"{BASE}/gone"]["removed"] == ["Gone"]
+
+def test_scrape_writes_snapshot(monkeypatch, tmp_path):
+    """Test that every saved page is recorded in the run snapshot."""
+    pages = {
+        f"{BASE}/docs/": f'<article><h1>Home</h1><p>Welcome</p><a href="{BASE}/docs/guide">Guide</a></article>',
+        f"{BASE}/docs/guide": "<article><h1>Guide</h1><p>Steps</p><h2>Setup</h2><p>Install it</p></article>",
+    }
+    monkeypatch.setattr(DocsScraper, "fetch_page", lambda self, url: pages[url])
+    settings = ScraperSettings(
+        base_url=f"{BASE}/docs/",
+        output_file=tmp_path / "docs.md",
+        snapshot_file=tmp_path / "run.jsonl",
+        template_sample_pages=0
+    )
+    DocsScraper(settings, show_progress=False).scrape()
+
+    records = {record["url"]: record for record in map(json.loads, (tmp_path / "run.jsonl").read_text().splitlines())}
+    assert set(records) == set(pages)
+    assert list(records[f"{BASE}/docs/guide"]["sections"]) == ["Guide", "Guide > Setup"]
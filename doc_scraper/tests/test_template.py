@@ -0,0 +1,35 @@
+from bs4 import BeautifulSoup
+from doc_scraper.template import TemplateLearner
+
+def page(body: str) -> BeautifulSoup:
+    return BeautifulSoup(f"""
+    <article>
+        <div class="header">Product docs home, guides, reference, community forum</div>
+        <p>{body}</p>
+        <ul class="related"><li>Related: getting started with the client library</li></ul>
+    </article>
+    """, "html.parser").article
+
+def test_learns_and_strips_repeated_blocks():
+    """Test that blocks repeated on sampled pages are removed from later pages."""
+    learner = TemplateLearner(sample_pages=3, min_ratio=0.6)
+    for i in range(3):
+        assert learner.process(page(f"Sampled page number {i} with its own unique body text")) == 0
+    assert learner.learned
+    
+    content = page("A later page with content that never appeared before")
+    assert learner.process(content) == 2
+    text = content.get_text()
+    assert "A later page" in text
+    assert "Product docs home" not in text
+    assert "Related:" not in text
+
+def test_unique_blocks_are_kept():
+    """Test that nothing is stripped when pages share no blocks."""
+    learner = TemplateLearner(sample_pages=2)
+    for i in range(2):
+        learner.process(BeautifulSoup(f"<div><p>Completely unique paragraph {i} " + "x" * i * 10 + "</p></div>", "html.parser").div)
+    
+    content = BeautifulSoup("<div><p>Another unique paragraph of text</p></div>", "html.parser").div
+    assert learner.process(content) == 0
+    assert learner.template_size == 0
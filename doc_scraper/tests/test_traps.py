@@ -0,0 +1,66 @@
+import json
+from doc_scraper.scraper import DocsScraper, ScraperSettings
+from doc_scraper.traps import TrapDetector
+
+BASE = "https://docs.example.com"
+
+def test_path_repetition_and_session_ids():
+    """Test that looping paths and session-ID URLs are rejected."""
+    traps = TrapDetector(max_path_repeats=2)
+    assert traps.check(f"{BASE}/docs/guide/docs/intro") is None
+    assert traps.check(f"{BASE}/docs/a/docs/a/docs/a") == "path_repetition"
+    assert traps.check(f"{BASE}/docs/intro?PHPSESSID=abc123") == "session_id"
+    assert traps.check(f"{BASE}/docs/intro;jsessionid=abc123") == "session_id"
+
+def test_query_variants_limit_is_idempotent():
+    """Test that a path takes a limited number of query strings and rechecks are free."""
+    traps = TrapDetector(max_query_variants=3)
+    for page in range(3):
+        assert traps.check(f"{BASE}/search?q=x&page={page}") is None
+    # Same variant with reordered parameters is not a new one
+    assert traps.check(f"{BASE}/search?page=0&q=x") is None
+    assert traps.check(f"{BASE}/search?q=x&page=3") == "query_variants"
+    assert traps.check(f"{BASE}/search") is None
+    report = traps.report()
+    assert report["pruned"] == {"query_variants": 1}
+    assert report["query_variant_paths"] == ["/search"]
+
+def test_prefix_budgets():
+    """Test configured and default path-prefix budgets."""
+    traps = TrapDetector(prefix_budgets={"/blog/": 2}, default_prefix_budget=3, prefix_depth=1)
+    assert [traps.check(f"{BASE}/blog/post-{i}") for i in range(3)] == [None, None, "prefix_budget"]
+    assert traps.check(f"{BASE}/blog/post-0") is None
+    assert [traps.check(f"{BASE}/docs/page-{i}") for i in range(4)] == [None, None, None, "prefix_budget"]
+    assert traps.report()["exhausted_prefixes"] == ["/blog/", "/docs"]
+
+def test_scrape_prunes_calendar_trap(tmp_path, monkeypatch):
+    """Test that an endless calendar stops at the query-variant limit and is reported."""
+    body = " ".join(f"word{i}" for i in range(200))
+
+    def fake_fetch(self, url):
+        if "?month=" in url:
+            month = int(url.rsplit("=", 1)[1])
+            # Every calendar page looks the same and links to the next month
+            return f'<article><p>Events calendar {body}</p><a href="/docs/calendar?month={month + 1}">Next</a></article>'
+        return f'<article><p>Guide {url}</p><a href="/docs/calendar?month=1">Calendar</a></article>'
+
+    monkeypatch.setattr(DocsScraper, "fetch_page", fake_fetch)
+    settings = ScraperSettings(
+        base_url=f"{BASE}/docs/",
+        output_file=tmp_path / "docs.md",
+        max_query_variants=5,
+        template_sample_pages=0
+    )
+    scraper = DocsScraper(settings, show_progress=False)
+    scraper.scrape()
+    assert len(scraper.visited_links) == 6
+    report = json.loads((tmp_path / "docs.traps.json").read_text())
+    assert report["pruned"] == {"query_variants": 1}
+    assert report["examples"]["query_variants"] == [f"{BASE}/docs/calendar?month=6"]
+
+    # With opt-in content detection the second identical calendar page ends the walk
+    settings.trap_content_distance = 3
+    scraper = DocsScraper(settings, show_progress=False)
+    scraper.scrape()
+    assert len(scraper.visited_links) == 3
+    assert scraper.traps.report()["pruned"] == {"near_identical_content": 1}
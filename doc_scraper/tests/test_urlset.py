@@ -0,0 +1,71 @@
+import pytest
+from doc_scraper.scraper import DocsScraper, ScraperSettings
+from doc_scraper.urlset import HashedURLSet, ScalableBloomFilter, SpillingFrontier, make_url_set
+
+URLS = [f"https://docs.example.com/page/{i}" for i in range(5000)]
+
+def test_hashed_url_set_grows_without_losing_urls():
+    """Test that the hash table keeps every URL across resizes."""
+    urls = HashedURLSet(capacity=16)
+    for url in URLS:
+        urls.add(url)
+    urls.add(URLS[0])
+    assert len(urls) == len(URLS)
+    assert all(url in urls for url in URLS)
+    assert "https://docs.example.com/other" not in urls
+    assert urls.nbytes <= 16 * 2 * len(URLS)
+
+def test_scalable_bloom_filter_error_rate():
+    """Test that the Bloom filter has no false negatives and few false positives."""
+    bloom = ScalableBloomFilter(initial_capacity=500, error_rate=0.01)
+    for url in URLS:
+        bloom.add(url)
+    assert len(bloom.filters) > 1
+    assert all(url in bloom for url in URLS)
+    false_positives = sum(f"https://docs.example.com/missing/{i}" in bloom for i in range(5000))
+    assert false_positives / 5000 < 0.01
+
+def test_make_url_set_rejects_unknown_backend():
+    """Test that an unknown backend name is an error."""
+    assert isinstance(make_url_set("set"), set)
+    with pytest.raises(ValueError):
+        make_url_set("redis")
+
+def test_spilling_frontier_keeps_fifo_order(tmp_path):
+    """Test that spilled URLs come back in order and the spill file is removed."""
+    with SpillingFrontier(max_in_memory=3, spill_dir=tmp_path) as frontier:
+        for url in URLS[:10]:
+            frontier.push(url)
+        assert len(frontier) == 10
+        assert frontier.spilled == 7
+        popped = frontier.pop_batch(4)
+        frontier.push(URLS[10])
+        while frontier:
+            popped += frontier.pop_batch(4)
+    assert popped == URLS[:11]
+    assert list(tmp_path.iterdir()) == []
+
+@pytest.mark.parametrize("backend", ["hash", "bloom"])
+def test_scrape_with_compact_visited_set(tmp_path, monkeypatch, backend):
+    """Test that a crawl with a compact visited set and a spilling frontier visits every page once."""
+    fetched = []
+
+    def fake_fetch(self, url):
+        fetched.append(url)
+        links = "".join(f'<a href="/docs/{i}">{i}</a>' for i in range(20))
+        return f"<article><p>Content of {url}</p>{links}</article>"
+
+    monkeypatch.setattr(DocsScraper, "fetch_page", fake_fetch)
+    settings = ScraperSettings(
+        base_url="https://docs.example.com/docs/",
+        output_file=tmp_path / "docs.md",
+        visited_backend=backend,
+        frontier_memory_limit=4,
+        frontier_spill_dir=tmp_path / "spill",
+        template_sample_pages=0
+    )
+    scraper = DocsScraper(settings, show_progress=False)
+    scraper.scrape()
+    assert sorted(fetched) == sorted(["https://docs.example.com/docs/"] + [f"https://docs.example.com/docs/{i}" for i in range(20)])
+    assert len(scraper.visited_links) == 21
+    assert scraper.metrics.summary()["gauges"]["frontier_spilled"]["max"] > 0
@@ -0,0 +1,130 @@
+"""
+Crawler trap detection: calendars, faceted search, session IDs and endless pagination.
+"""
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Set
+from urllib.parse import parse_qsl, urlparse
+
+from .dedup import NearDuplicateIndex
+from .urlset import url_hash
+
+# Query parameters that carry a session rather than select content
+SESSION_PARAMS = {"sid", "sessionid", "session_id", "phpsessid", "jsessionid", "aspsessionid", "cfid", "cftoken"}
+
+class TrapDetector:
+    """Heuristics that stop a crawl from wandering into infinite URL spaces.
+
+    ``check`` rejects a URL when a path segment repeats more than
+    ``max_path_repeats`` times (``/a/b/a/b/a/b``), when its path has already
+    been seen with ``max_query_variants`` different query strings (facets,
+    ``?page=N``, calendar dates), when it carries a session ID, or when its
+    path prefix used up its page budget. Checks are idempotent, so the same
+    URL can be checked again without using more budget. With a
+    ``content_distance``, ``check_content`` flags pages whose text is nearly
+    identical to an earlier page and their links are not followed; it is off
+    by default because templated index pages of doc sites look alike.
+
+    Every rejection is counted per rule with a few example URLs for the
+    ``report``.
+    """
+
+    def __init__(
+        self,
+        max_path_repeats: int = 3,
+        max_query_variants: int = 50,
+        prefix_budgets: Optional[Dict[str, int]] = None,
+        default_prefix_budget: int = 0,
+        prefix_depth: int = 2,
+        content_distance: Optional[int] = None,
+        max_examples: int = 10
+    ):
+        self.max_path_repeats = max_path_repeats
+        self.max_query_variants = max_query_variants
+        # Longest prefix wins when several configured prefixes match
+        self.prefix_budgets = sorted((prefix_budgets or {}).items(), key=lambda item: -len(item[0]))
+        self.default_prefix_budget = default_prefix_budget
+        self.prefix_depth = prefix_depth
+        self.content_index = NearDuplicateIndex(max_distance=content_distance) if content_distance is not None else None
+        self.max_examples = max_examples
+        self.pruned: Counter = Counter()
+        self.examples: Dict[str, List[str]] = {}
+        self._query_variants: Dict[str, Set[int]] = {}
+        self._prefix_urls: Dict[str, Set[int]] = {}
+        self._exhausted: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def _prune(self, reason: str, url: str) -> str:
+        with self._lock:
+            self.pruned[reason] += 1
+            examples = self.examples.setdefault(reason, [])
+            if len(examples) < self.max_examples and url not in examples:
+                examples.append(url)
+        return reason
+
+    def _budget_for(self, path: str):
+        for prefix, budget in self.prefix_budgets:
+            if path.startswith(prefix):
+                return prefix, budget
+        segments = [segment for segment in path.split("/") if segment][:self.prefix_depth]
+        return "/" + "/".join(segments), self.default_prefix_budget
+
+    def check(self, url: str) -> Optional[str]:
+        """Return the rule a URL breaks, or None if it may be crawled."""
+        parsed = urlparse(url)
+        segments = [segment for segment in parsed.path.split("/") if segment]
+        if segments and max(Counter(segments).values()) > self.max_path_repeats:
+            return self._prune("path_repetition", url)
+
+        params = parse_qsl(parsed.query, keep_blank_values=True)
+        if "jsessionid=" in parsed.params.lower() or any(key.lower() in SESSION_PARAMS for key, _ in params):
+            return self._prune("session_id", url)
+
+        with self._lock:
+            reason = self._count(url, parsed.path, parsed.query and params)
+        return self._prune(reason, url) if reason else None
+
+    def _count(self, url: str, path: str, params) -> Optional[str]:
+        """Charge a URL against its query-variant and prefix budgets (lock held)."""
+        if params and self.max_query_variants:
+            variants = self._query_variants.setdefault(path, set())
+            # Parameter order does not make a new variant
+            key = url_hash("&".join(sorted(f"{k}={v}" for k, v in params)))
+            if key not in variants:
+                if len(variants) >= self.max_query_variants:
+                    return "query_variants"
+                variants.add(key)
+
+        prefix, budget = self._budget_for(path)
+        if budget:
+            urls = self._prefix_urls.setdefault(prefix, set())
+            key = url_hash(url)
+            if key not in urls:
+                if len(urls) >= budget:
+                    self._exhausted.add(prefix)
+                    return "prefix_budget"
+                urls.add(key)
+        return None
+
+    def check_content(self, url: str, text: str) -> Optional[str]:
+        """Return the earlier page ``url`` is nearly identical to, if any."""
+        if self.content_index is None:
+            return None
+        original = self.content_index.add(url, text)
+        if original:
+            self._prune("near_identical_content", url)
+        return original
+
+    def report(self) -> Dict:
+        """Summary of pruned URLs suitable for JSON serialization."""
+        with self._lock:
+            return {
+                "pruned_total": sum(self.pruned.values()),
+                "pruned": dict(self.pruned),
+                "examples": {reason: list(urls) for reason, urls in self.examples.items()},
+                "query_variant_paths": sorted(
+                    path for path, variants in self._query_variants.items()
+                    if len(variants) >= self.max_query_variants
+                ),
+                "exhausted_prefixes": sorted(self._exhausted),
+            }
@@ -0,0 +1,291 @@
+"""
+Bounded-memory URL sets and crawl frontiers (disk-spilling and prioritized).
+"""
+import hashlib
+import heapq
+import itertools
+import math
+import os
+import tempfile
+from array import array
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+def url_hash(url: str, bits: int = 64) -> int:
+    """Stable hash of a URL (blake2b, not Python's per-process ``hash``)."""
+    digest = hashlib.blake2b(url.encode("utf-8"), digest_size=(bits + 7) // 8).digest()
+    return int.from_bytes(digest, "big")
+
+class HashedURLSet:
+    """Set of 64-bit URL hashes in an open-addressing table.
+
+    Each URL costs 8 bytes of table space (16 at the worst load factor)
+    instead of the full string plus set overhead. Two URLs collide with
+    probability about ``n / 2**64``, so for any realistic crawl a false
+    "already seen" is effectively impossible. Membership checks are safe
+    from other threads while one thread adds.
+    """
+
+    _EMPTY = 0
+
+    def __init__(self, capacity: int = 1 << 16):
+        size = 1 << max(4, math.ceil(math.log2(max(capacity, 1) * 2)))
+        self._table = array("Q", bytes(8 * size))
+        self._count = 0
+
+    def _key(self, url: str) -> int:
+        # 0 marks an empty slot
+        return url_hash(url) or 1
+
+    @staticmethod
+    def _probe(table: array, key: int) -> int:
+        mask = len(table) - 1
+        slot = key & mask
+        while table[slot] != HashedURLSet._EMPTY and table[slot] != key:
+            slot = (slot + 1) & mask
+        return slot
+
+    def __contains__(self, url: str) -> bool:
+        table = self._table
+        return table[self._probe(table, self._key(url))] != self._EMPTY
+
+    def add(self, url: str) -> None:
+        key = self._key(url)
+        slot = self._probe(self._table, key)
+        if self._table[slot] == key:
+            return
+        self._table[slot] = key
+        self._count += 1
+        if self._count * 2 > len(self._table):
+            self._grow()
+
+    def _grow(self) -> None:
+        table = array("Q", bytes(16 * len(self._table)))
+        for key in self._table:
+            if key != self._EMPTY:
+                table[self._probe(table, key)] = key
+        # Readers holding the old table still see a consistent snapshot
+        self._table = table
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._table) * self._table.itemsize
+
+class BloomFilter:
+    """Fixed-size Bloom filter sized for ``capacity`` items at ``error_rate``."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: int) -> Iterable[int]:
+        # Double hashing: two 64-bit halves generate all k positions; reducing
+        # them first keeps the arithmetic on small ints
+        m = self.num_bits
+        pos, step = (key >> 64) % m, ((key & 0xFFFFFFFFFFFFFFFF) % m) or 1
+        for _ in range(self.num_hashes):
+            yield pos
+            pos += step
+            if pos >= m:
+                pos -= m
+
+    def contains_key(self, key: int) -> bool:
+        bits = self.bits
+        for pos in self._positions(key):
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+    def add_key(self, key: int) -> None:
+        bits = self.bits
+        for pos in self._positions(key):
+            bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+class ScalableBloomFilter:
+    """Bloom filter that adds larger, tighter slices as it fills up.
+
+    Each new slice holds ``growth`` times more items than the previous one
+    with its error rate multiplied by ``tightening``, which keeps the overall
+    false-positive rate below ``error_rate`` however many URLs are added
+    (Almeida et al., "Scalable Bloom Filters"). A false positive means a URL
+    is wrongly treated as seen and not crawled.
+    """
+
+    def __init__(
+        self,
+        initial_capacity: int = 100_000,
+        error_rate: float = 1e-4,
+        growth: int = 2,
+        tightening: float = 0.85
+    ):
+        self.initial_capacity = initial_capacity
+        self.error_rate = error_rate
+        self.growth = growth
+        self.tightening = tightening
+        self.filters: List[BloomFilter] = []
+        self._count = 0
+        self._add_filter()
+
+    def _add_filter(self) -> None:
+        n = len(self.filters)
+        self.filters.append(BloomFilter(
+            self.initial_capacity * self.growth ** n,
+            self.error_rate * (1 - self.tightening) * self.tightening ** n
+        ))
+
+    def __contains__(self, url: str) -> bool:
+        key = url_hash(url, bits=128)
+        return any(bloom.contains_key(key) for bloom in reversed(self.filters))
+
+    def add(self, url: str) -> None:
+        key = url_hash(url, bits=128)
+        if any(bloom.contains_key(key) for bloom in reversed(self.filters)):
+            return
+        bloom = self.filters[-1]
+        if bloom.count >= bloom.capacity:
+            self._add_filter()
+            bloom = self.filters[-1]
+        bloom.add_key(key)
+        self._count += 1
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def nbytes(self) -> int:
+        return sum(len(bloom.bits) for bloom in self.filters)
+
+def make_url_set(backend: str = "set", capacity: int = 100_000, error_rate: float = 1e-4):
+    """Visited-set for a crawl: ``set``, ``hash`` (64-bit hashes) or ``bloom``."""
+    if backend == "set":
+        return set()
+    if backend == "hash":
+        return HashedURLSet(capacity)
+    if backend == "bloom":
+        return ScalableBloomFilter(capacity, error_rate)
+    raise ValueError(f"Unknown visited-set backend: {backend}")
+
+class SpillingFrontier:
+    """FIFO queue of URLs that keeps at most ``max_in_memory`` in memory.
+
+    Once the in-memory head is full, further URLs are appended to a spill
+    file and read back in chunks as the head drains, so crawl order stays
+    breadth-first. The spill file is removed by ``close``.
+    """
+
+    def __init__(self, max_in_memory: int = 100_000, spill_dir: Optional[Union[str, Path]] = None):
+        self.max_in_memory = max_in_memory
+        self.spill_dir = spill_dir
+        self._head = deque()
+        self._spill_path = None
+        self._writer = None
+        self._reader = None
+        self._spilled = 0
+
+    def push(self, url: str) -> None:
+        if not self._spilled and len(self._head) < self.max_in_memory:
+            self._head.append(url)
+            return
+        if self._writer is None:
+            if self.spill_dir:
+                Path(self.spill_dir).mkdir(parents=True, exist_ok=True)
+            fd, self._spill_path = tempfile.mkstemp(prefix="frontier-", suffix=".txt", dir=self.spill_dir)
+            os.close(fd)
+            self._writer = open(self._spill_path, "a", encoding="utf-8")
+            self._reader = open(self._spill_path, "r", encoding="utf-8")
+        self._writer.write(url + "\n")
+        self._spilled += 1
+
+    def _refill(self) -> None:
+        self._writer.flush()
+        while self._spilled and len(self._head) < self.max_in_memory:
+            self._head.append(self._reader.readline().rstrip("\n"))
+            self._spilled -= 1
+
+    def pop_batch(self, size: int) -> List[str]:
+        """Remove and return up to ``size`` URLs in FIFO order."""
+        if not self._head and self._spilled:
+            self._refill()
+        batch = []
+        while self._head and len(batch) < size:
+            batch.append(self._head.popleft())
+        return batch
+
+    @property
+    def spilled(self) -> int:
+        return self._spilled
+
+    def __len__(self) -> int:
+        return len(self._head) + self._spilled
+
+    def close(self) -> None:
+        for handle in (self._writer, self._reader):
+            if handle:
+                handle.close()
+        if self._spill_path and os.path.exists(self._spill_path):
+            os.remove(self._spill_path)
+        self._writer = self._reader = self._spill_path = None
+        self._head.clear()
+        self._spilled = 0
+
+    def __enter__(self) -> "SpillingFrontier":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+class PriorityFrontier:
+    """Frontier that hands out URLs with a known score first, best first.
+
+    URLs found in ``scores`` (e.g. PageRank from an earlier crawl) wait in a
+    heap; everything else goes to ``fallback`` and keeps its FIFO order once
+    no scored URL is waiting. The heap holds at most the scored URLs, so
+    memory stays bounded by the spilling fallback.
+    """
+
+    def __init__(self, scores: Dict[str, float], fallback: Optional[SpillingFrontier] = None):
+        self.scores = scores
+        self.fallback = fallback if fallback is not None else SpillingFrontier()
+        self._heap = []
+        self._order = itertools.count()
+
+    def push(self, url: str) -> None:
+        score = self.scores.get(url)
+        if score is None:
+            self.fallback.push(url)
+        else:
+            # Ties keep discovery order
+            heapq.heappush(self._heap, (-score, next(self._order), url))
+
+    def pop_batch(self, size: int) -> List[str]:
+        """Remove and return up to ``size`` URLs, highest score first."""
+        batch = [heapq.heappop(self._heap)[2] for _ in range(min(size, len(self._heap)))]
+        if len(batch) < size:
+            batch.extend(self.fallback.pop_batch(size - len(batch)))
+        return batch
+
+    @property
+    def spilled(self) -> int:
+        return self.fallback.spilled
+
+    def __len__(self) -> int:
+        return len(self._heap) + len(self.fallback)
+
+    def close(self) -> None:
+        self._heap.clear()
+        self.fallback.close()
+
+    def __enter__(self) -> "PriorityFrontier":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
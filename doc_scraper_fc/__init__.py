@@ -4,7 +4,15 @@ Doc Scraper FC - A documentation scraper using Firecrawl
 
 __version__ = "0.1.0"
 
-from .scraper import DocScraper
-from config import Config, load_config
+__all__ = ["DocScraper", "Config", "load_config"]
 
-__all__ = ["DocScraper", "Config", "load_config"] 
\ No newline at end of file
+def __getattr__(name):
+    """Import the public API on first use so that `version` and `--help` stay fast."""
+    if name == "DocScraper":
+        from .scraper import DocScraper
+        return DocScraper
+    if name in ("Config", "load_config"):
+        import config
+        return getattr(config, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+ 
\ No newline at end of file
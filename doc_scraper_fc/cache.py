@@ -0,0 +1,169 @@
+"""
+Persistent on-disk cache of Firecrawl responses.
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+class ResponseCache:
+    """Content-addressed cache of API responses keyed on (kind, url, params).
+
+    Each response is stored as one JSON file named after the SHA-256 of the
+    canonical request, so identical requests hit the same entry whatever the
+    order of their parameters. Entries older than ``ttl_seconds`` are treated
+    as missing (0 keeps them forever). A hit refreshes the file's mtime, and
+    when the cache grows past ``max_bytes`` the least recently used entries
+    are deleted until it is back under 90% of the limit.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path] = ".firecrawl_cache",
+        ttl_seconds: float = 86400,
+        max_bytes: int = 500 * 1024 * 1024
+    ):
+        self.directory = Path(directory)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+        self._size: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(kind: str, url: str, params: Optional[Dict] = None) -> str:
+        request = json.dumps({"kind": kind, "url": url, "params": params or {}}, sort_keys=True)
+        return hashlib.sha256(request.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, kind: str, url: str, params: Optional[Dict] = None) -> Optional[Any]:
+        """Cached response for a request, or None on a miss or expired entry."""
+        path = self._path(self.key(kind, url, params))
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self.stats["misses"] += 1
+            return None
+        if self.ttl_seconds and time.time() - entry.get("stored_at", 0) > self.ttl_seconds:
+            self._remove(path)
+            self.stats["misses"] += 1
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.stats["hits"] += 1
+        return entry["response"]
+
+    def set(self, kind: str, url: str, params: Optional[Dict], response: Any) -> bool:
+        """Store a response; returns False if it cannot be serialized."""
+        try:
+            data = json.dumps({
+                "kind": kind,
+                "url": url,
+                "params": params or {},
+                "stored_at": time.time(),
+                "response": response,
+            })
+        except (TypeError, ValueError) as e:
+            logger.debug(f"Not caching {kind} response for {url}: {e}")
+            return False
+
+        path = self._path(self.key(kind, url, params))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        old_size = path.stat().st_size if path.exists() else 0
+        # Write to a temporary file first so readers never see a partial entry
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        self.stats["stores"] += 1
+
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += len(data.encode("utf-8")) - old_size
+            if self.max_bytes and self._size > self.max_bytes:
+                self._evict()
+        return True
+
+    def get_or_call(
+        self,
+        kind: str,
+        url: str,
+        params: Optional[Dict],
+        call: Callable[[], Any],
+        store_if: Callable[[Any], bool] = bool
+    ) -> Any:
+        """Cached response, or the result of ``call()`` stored for next time.
+
+        ``store_if`` decides which responses are worth keeping, e.g. only
+        complete crawl results.
+        """
+        cached = self.get(kind, url, params)
+        if cached is not None:
+            return cached
+        response = call()
+        if store_if(response):
+            self.set(kind, url, params, response)
+        return response
+
+    def _entries(self):
+        return self.directory.glob("*/*.json")
+
+    def _scan_size(self) -> int:
+        return sum(path.stat().st_size for path in self._entries())
+
+    def _remove(self, path: Path) -> None:
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except OSError:
+            return
+        if self._size is not None:
+            self._size -= size
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until under 90% of max_bytes."""
+        entries = []
+        for path in self._entries():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        size = sum(entry[1] for entry in entries)
+        target = self.max_bytes * 0.9
+        for _, entry_size, path in entries:
+            if size <= target:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            size -= entry_size
+            self.stats["evictions"] += 1
+        self._size = size
+
+    def clear(self) -> int:
+        """Delete every entry; returns how many were removed."""
+        removed = 0
+        for path in list(self._entries()):
+            try:
+                path.unlink()
+                removed += 1
+            except OSError:
+                pass
+        self._size = 0
+        return removed
@@ -0,0 +1,22 @@
+"""
+Access to the classic doc_scraper package.
+
+Both scrapers share its metrics, profiling, near-duplicate, snapshot and
+logging modules, and hybrid mode runs its crawler. Import this module before
+importing from ``doc_scraper``: in a repository checkout the classic package
+sits next to this one and is found even when it has not been installed.
+"""
+import sys
+from pathlib import Path
+
+try:
+    import doc_scraper  # noqa: F401
+except ImportError:
+    checkout = Path(__file__).resolve().parent.parent
+    if not (checkout / "doc_scraper" / "__init__.py").exists():
+        raise ImportError(
+            "doc_scraper_fc needs the classic scraper: install it with "
+            "`pip install -e doc_scraper` from the repository root"
+        )
+    sys.path.append(str(checkout))
+    import doc_scraper  # noqa: F401
@@ -2,19 +2,27 @@
 Command-line interface for the enhanced documentation scraper.
 """
 import asyncio
+import logging
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 import typer
-from rich.console import Console
 
-from scraper import main as scraper_main
-from config import load_config
-from logs import setup_logging
+# Keep module import light: the scraper (firecrawl), the config models
+# (pydantic, yaml, dotenv) and rich are only imported by the commands that
+# need them, so `version` and `--help` start fast.
 
-# Initialize logger and console
-logger = setup_logging()
-console = Console()
+logger = logging.getLogger(__name__)
+
+def setup_logging(config) -> None:
+    """Set up the shared logging with this package's console format and rotation."""
+    from doc_scraper.logs import setup_logging as setup_shared_logging
+    setup_shared_logging(
+        quiet=config.logging.quiet,
+        summary_interval=config.logging.summary_interval,
+        console_format="%(levelname)s - %(message)s",
+        backup_count=5
+    )
 
 app = typer.Typer(
     help="Enhanced documentation scraper with LLM-optimized output using Firecrawl"
@@ -36,7 +44,8 @@ def scrape(
     batch_size: Optional[int] = typer.Option(
         None,
         "--batch-size", "-b",
-        help="Number of URLs to process in parallel"
+        help="Set scraping.batch_size in the config (a scrape or crawl is a single Firecrawl job; "
+             "only `hybrid` uses it)"
     ),
     max_depth: Optional[int] = typer.Option(
         None,
@@ -47,36 +56,289 @@ def scrape(
         None,
         "--javascript/--no-javascript", "-j/-nj",
         help="Enable/disable JavaScript rendering"
+    ),
+    crawl: bool = typer.Option(
+        False,
+        "--crawl",
+        help="Crawl the site instead of scraping the single page"
+    ),
+    metrics: Optional[Path] = typer.Option(
+        None,
+        "--metrics",
+        help="Write a JSON summary of per-stage metrics to this file"
+    ),
+    prometheus: Optional[Path] = typer.Option(
+        None,
+        "--prometheus",
+        help="Write run metrics in Prometheus text format to this file"
+    ),
+    profile: Optional[Path] = typer.Option(
+        None,
+        "--profile",
+        help="Sample all threads during the run and write collapsed stacks (flamegraph input) to this file"
+    ),
+    snapshot: Optional[Path] = typer.Option(
+        None,
+        "--snapshot",
+        help="Record a hash per page section in this JSON Lines file for `diff`"
+    ),
+    quiet: bool = typer.Option(
+        False,
+        "--quiet", "-q",
+        help="Log through a background queue and print periodic summaries instead of a line per page"
     )
 ):
     """
     Scrape documentation from a website and format it for LLMs.
     """
+    from rich.console import Console
+    from scraper import main as scraper_main
+    from config import load_config
+    import classic  # noqa: F401
+    from doc_scraper.logs import stop_logging
+
     try:
-        # Load configuration
-        config = load_config(config_file) if config_file else load_config()
-        
-        # Override configuration with CLI options
-        if batch_size is not None:
-            config.scraping.batch_size = batch_size
-        if max_depth is not None:
-            config.scraping.max_depth = max_depth
-        if javascript is not None:
-            config.scraping.javascript = javascript
+        # Load configuration, with the CLI options taking precedence
+        config = load_config(config_file, overrides={
+            "scraping": {"batch_size": batch_size, "max_depth": max_depth, "javascript": javascript},
+            "output": {"snapshot_file": str(snapshot) if snapshot else None},
+            "logging": {"quiet": quiet or None}
+        })
+        setup_logging(config)
         
         # Run scraper
-        asyncio.run(scraper_main(url, output_dir))
+        asyncio.run(scraper_main(url, output_dir, is_crawl=crawl, metrics_file=metrics,
+                                 prometheus_file=prometheus, profile_file=profile, config=config))
         
+    except Exception as e:
+        logger.error(f"Error during scraping: {e}")
+        Console().print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+    finally:
+        stop_logging()
+
+@app.command("scrape-all")
+def scrape_all(
+    sites_file: Path = typer.Argument(..., help="YAML file with one profile (base_url, patterns, limits) per site"),
+    output_dir: Optional[Path] = typer.Option(
+        None,
+        "--output-dir", "-o",
+        help="Parent directory for the per-site outputs and the run summary"
+    ),
+    site: Optional[List[str]] = typer.Option(
+        None,
+        "--site", "-s",
+        help="Only crawl these profiles (repeatable)"
+    ),
+    max_concurrent: int = typer.Option(
+        3,
+        "--max-concurrent", "-m",
+        help="Maximum number of crawl jobs running at the same time"
+    ),
+    config_file: Optional[Path] = typer.Option(
+        None,
+        "--config", "-c",
+        help="Path to custom configuration file"
+    ),
+    quiet: bool = typer.Option(
+        False,
+        "--quiet", "-q",
+        help="Log through a background queue and print periodic summaries instead of a line per page"
+    )
+):
+    """
+    Crawl every site profile concurrently from one process.
+    """
+    import json
+    from rich.console import Console
+    from config import load_config
+    import classic  # noqa: F401
+    from doc_scraper.logs import stop_logging
+    from sites import load_sites, scrape_all as run_all
+
+    console = Console()
+    try:
+        config = load_config(config_file, overrides={"logging": {"quiet": quiet or None}})
+        setup_logging(config)
+        sites = load_sites(sites_file, config, output_dir, site)
+        if not sites:
+            console.print("[yellow]No site profiles with a base_url found.[/yellow]")
+            raise typer.Exit(1)
+        summary_dir = Path(output_dir or config.output.directory or "scraped_docs")
+        summary_dir.mkdir(parents=True, exist_ok=True)
+        summary_file = summary_dir / "run_summary.json"
+        summary = asyncio.run(run_all(sites, max_concurrent, summary_file, show_progress=True))
+    except typer.Exit:
+        raise
     except Exception as e:
         logger.error(f"Error during scraping: {e}")
         console.print(f"[red]Error: {e}[/red]")
         raise typer.Exit(1)
+    finally:
+        stop_logging()
+
+    console.print(json.dumps(summary["totals"], indent=2))
+    console.print(f"\nRun summary saved at: {summary_file}")
+    if summary["totals"]["failed"]:
+        raise typer.Exit(1)
+
+@app.command()
+def hybrid(
+    url: str = typer.Argument(..., help="URL of the documentation site to scrape"),
+    output_dir: Optional[Path] = typer.Option(
+        None,
+        "--output-dir", "-o",
+        help="Directory to save scraped documentation"
+    ),
+    min_content_chars: Optional[int] = typer.Option(
+        None,
+        "--min-content-chars",
+        help="Render pages with less extracted content than this with Firecrawl"
+    ),
+    batch_size: Optional[int] = typer.Option(
+        None,
+        "--batch-size", "-b",
+        help="Number of pages rendered with Firecrawl in parallel"
+    ),
+    metrics: Optional[Path] = typer.Option(
+        None,
+        "--metrics",
+        help="Write a JSON summary of the Firecrawl stage metrics to this file"
+    ),
+    config_file: Optional[Path] = typer.Option(
+        None,
+        "--config", "-c",
+        help="Path to custom configuration file"
+    ),
+    snapshot: Optional[Path] = typer.Option(
+        None,
+        "--snapshot",
+        help="Record a hash per page section in this JSON Lines file for `diff`"
+    ),
+    quiet: bool = typer.Option(
+        False,
+        "--quiet", "-q",
+        help="Log through a background queue and print periodic summaries instead of a line per page"
+    )
+):
+    """
+    Crawl with plain HTTP first and use Firecrawl only for pages it cannot read.
+    """
+    import json
+    from rich.console import Console
+    from config import load_config
+    from hybrid import hybrid_scrape
+    import classic  # noqa: F401
+    from doc_scraper.logs import stop_logging
+
+    console = Console()
+    try:
+        config = load_config(config_file, overrides={
+            "hybrid": {"min_content_chars": min_content_chars},
+            "scraping": {"batch_size": batch_size},
+            "output": {
+                "metrics_file": str(metrics) if metrics else None,
+                "snapshot_file": str(snapshot) if snapshot else None
+            },
+            "logging": {"quiet": quiet or None}
+        })
+        setup_logging(config)
+        summary = asyncio.run(hybrid_scrape(config, url, output_dir))
+    except Exception as e:
+        logger.error(f"Error during scraping: {e}")
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+    finally:
+        stop_logging()
+
+    console.print(json.dumps({key: value for key, value in summary.items() if key != "firecrawl_failed"}, indent=2))
+    if summary["firecrawl_failed"]:
+        console.print(f"[yellow]{len(summary['firecrawl_failed'])} pages could not be rendered[/yellow]")
+
+@app.command()
+def diff(
+    old_snapshot: Path = typer.Argument(..., help="Snapshot of the earlier run"),
+    new_snapshot: Path = typer.Argument(..., help="Snapshot of the later run"),
+    output: Optional[Path] = typer.Option(
+        None,
+        "--output", "-o",
+        help="Write the JSON report to this file instead of stdout"
+    )
+):
+    """
+    Report the pages and sections added, removed or modified between two runs.
+    """
+    import json
+    from rich.console import Console
+    import classic  # noqa: F401
+    from doc_scraper.snapshots import diff_snapshots
+
+    console = Console(stderr=True)
+    try:
+        report = diff_snapshots(old_snapshot, new_snapshot)
+    except (OSError, ValueError, KeyError) as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+
+    if output:
+        output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    else:
+        typer.echo(json.dumps(report, indent=2))
+    pages, sections = report["pages"], report["sections"]
+    console.print(
+        f"Pages: {pages['added']} added, {pages['removed']} removed, {pages['modified']} modified, "
+        f"{pages['unchanged']} unchanged; sections: {sections['added']} added, "
+        f"{sections['removed']} removed, {sections['modified']} modified"
+    )
+
+@app.command("clear-cache")
+def clear_cache(
+    config_file: Optional[Path] = typer.Option(
+        None,
+        "--config", "-c",
+        help="Path to custom configuration file"
+    )
+):
+    """Delete all cached Firecrawl responses."""
+    from cache import ResponseCache
+    from config import load_config
+
+    config = load_config(config_file)
+    removed = ResponseCache(config.cache.directory).clear()
+    typer.echo(f"Removed {removed} cached responses from {config.cache.directory}")
+
+@app.command("validate-config")
+def validate_config(
+    config_file: Optional[Path] = typer.Option(
+        None,
+        "--config", "-c",
+        help="Path to custom configuration file"
+    )
+):
+    """Load and validate the configuration without starting a scrape."""
+    from pydantic import ValidationError
+    from config import load_config
+
+    try:
+        config = load_config(config_file)
+    except (OSError, ValueError, ValidationError) as e:
+        typer.echo(f"Invalid configuration: {e}", err=True)
+        raise typer.Exit(1)
+    
+    typer.echo(
+        f"Configuration OK: base_url={config.scraping.base_url or '-'}, "
+        f"max_pages={config.scraping.max_pages}, max_depth={config.scraping.max_depth}, "
+        f"api_key={'set' if config.scraping.api_key else 'missing'}"
+    )
 
 @app.command()
 def version():
     """Show the version of doc-scraper-fc."""
-    from . import __version__
-    console.print(f"doc-scraper-fc version: {__version__}")
+    try:
+        from . import __version__
+    except ImportError:  # run as a top-level module from the package directory
+        from __init__ import __version__
+    typer.echo(f"doc-scraper-fc version: {__version__}")
 
 if __name__ == "__main__":
     app() 
\ No newline at end of file
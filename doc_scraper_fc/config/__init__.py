@@ -2,14 +2,19 @@
 Configuration management for the documentation scraper.
 """
 import os
+import re
+import json
+import logging
+import threading
 import yaml
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional, Dict, Any
-from dotenv import load_dotenv
-from rich import print
+from typing import List, Optional, Dict, Any, Literal, Tuple, Union
 
 from pydantic import BaseModel, Field, ConfigDict
 
+logger = logging.getLogger(__name__)
+
 def find_env_file() -> Path:
     """Find the closest .env file starting from the current directory."""
     current_dir = Path(__file__).resolve().parent
@@ -18,7 +23,7 @@ def find_env_file() -> Path:
     # First check in the package directory
     env_file = package_dir / '.env'
     if env_file.exists():
-        print(f"[green]Found .env file in package directory: {env_file}[/green]")
+        logger.debug(f"Found .env file in package directory: {env_file}")
         return env_file
     
     # If not found, look in parent directories
@@ -26,22 +31,35 @@ def find_env_file() -> Path:
     while root_dir.parent != root_dir:  # Stop at filesystem root
         env_file = root_dir / '.env'
         if env_file.exists():
-            print(f"[yellow]Found .env file in parent directory: {env_file}[/yellow]")
+            logger.debug(f"Found .env file in parent directory: {env_file}")
             return env_file
         root_dir = root_dir.parent
     
-    print("[red]No .env file found[/red]")
+    logger.debug("No .env file found")
     return package_dir / '.env'
 
-# Load environment variables from the closest .env file
-env_file = find_env_file()
-load_dotenv(env_file)
+@lru_cache(maxsize=None)
+def load_env() -> Path:
+    """Load environment variables from the closest .env file, once per process.
+
+    Deferred until configuration is actually built so that importing this
+    module neither walks the filesystem nor touches the environment.
+    """
+    from dotenv import load_dotenv
+
+    env_file = find_env_file()
+    load_dotenv(env_file)
+    return env_file
+
+def _default_api_key() -> str:
+    load_env()
+    return os.getenv("FIRECRAWL_API_KEY", "")
 
 class ScrapingConfig(BaseModel):
     """Scraping configuration settings."""
     model_config = ConfigDict(protected_namespaces=())
     
-    api_key: str = Field(default_factory=lambda: os.getenv("FIRECRAWL_API_KEY", ""))
+    api_key: str = Field(default_factory=_default_api_key)
     base_url: str = Field(default="", description="Base URL to scrape")
     max_depth: int = Field(3, description="Maximum crawling depth")
     max_pages: int = Field(10, description="Maximum number of pages to crawl")
@@ -49,6 +67,12 @@ class ScrapingConfig(BaseModel):
     formats: List[str] = Field(default_factory=lambda: ["markdown"])
     javascript: bool = Field(True, description="Enable JavaScript rendering")
     timeout: int = Field(30000, description="Request timeout in milliseconds")
+    options: Dict[str, Any] = Field(
+        default_factory=lambda: {"onlyMainContent": True, "removeBase64Images": True},
+        description="Extra Firecrawl scrape options sent with every scrape and crawl"
+    )
+    retry_attempts: int = Field(3, description="Attempts per scrape or crawl status request before giving up")
+    retry_backoff: float = Field(2.0, description="Seconds before the first retry, doubled after each failure")
     mobile: bool = Field(False, description="Enable mobile device emulation")
     location: Dict[str, Any] = Field(
         default_factory=lambda: {
@@ -88,6 +112,21 @@ class OutputConfig(BaseModel):
     model_config = ConfigDict(protected_namespaces=())
     
     directory: Optional[str] = None
+    save_individual_pages: bool = Field(True, description="Save each page as a separate file")
+    save_merged_file: bool = Field(True, description="Save all content in a single merged file")
+    merged_file_prefix: str = Field("firecrawl_docs", description="Prefix for the merged file")
+    file_format: str = Field("markdown", description="Output format of saved pages")
+    add_metadata: bool = Field(True, description="Include a metadata header in saved files")
+    add_timestamps: bool = Field(True, description="Add timestamps to file names")
+    duplicate_action: Optional[Literal["drop", "link"]] = Field(
+        None, description="Handling of near-duplicate pages: 'drop', 'link' or None to keep them"
+    )
+    duplicate_distance: int = Field(3, description="Maximum SimHash bit distance for near-duplicates")
+    metrics_file: Optional[str] = Field(None, description="JSON file for the per-stage metrics summary")
+    prometheus_file: Optional[str] = Field(None, description="Prometheus text file for the run metrics")
+    snapshot_file: Optional[str] = Field(
+        None, description="JSON Lines file recording a hash per page section, compared between runs with `diff`"
+    )
     template: str = Field(
         default=(
             "# {title}\n\n"
@@ -100,6 +139,34 @@ class OutputConfig(BaseModel):
         )
     )
 
+class CacheConfig(BaseModel):
+    """Local cache of Firecrawl responses."""
+    model_config = ConfigDict(protected_namespaces=())
+    
+    enabled: bool = Field(False, description="Reuse stored responses for identical requests")
+    directory: str = Field(".firecrawl_cache", description="Directory for cached responses")
+    ttl_seconds: int = Field(86400, description="Age after which a cached response is refetched (0 = never)")
+    max_size_mb: int = Field(500, description="Least recently used responses are evicted above this size")
+
+class HybridConfig(BaseModel):
+    """Hybrid mode: classic fetch first, Firecrawl only for pages it cannot read."""
+    model_config = ConfigDict(protected_namespaces=())
+    
+    min_content_chars: int = Field(
+        200, description="Pages with less extracted markdown than this are rendered with Firecrawl"
+    )
+    classic_workers: int = Field(5, description="Concurrent requests of the classic crawl")
+    classic_timeout: int = Field(10, description="Classic request timeout in seconds")
+
+class LoggingConfig(BaseModel):
+    """Console output settings."""
+    model_config = ConfigDict(protected_namespaces=())
+    
+    quiet: bool = Field(
+        False, description="Queue log records and print periodic summaries instead of a line per page"
+    )
+    summary_interval: float = Field(10.0, description="Seconds between console summaries in quiet mode")
+
 class Config(BaseModel):
     """Main configuration."""
     model_config = ConfigDict(protected_namespaces=())
@@ -108,14 +175,81 @@ class Config(BaseModel):
     extraction: ExtractionConfig = Field(default_factory=ExtractionConfig)
     patterns: PatternsConfig = Field(default_factory=PatternsConfig)
     output: OutputConfig = Field(default_factory=OutputConfig)
+    cache: CacheConfig = Field(default_factory=CacheConfig)
+    hybrid: HybridConfig = Field(default_factory=HybridConfig)
+    logging: LoggingConfig = Field(default_factory=LoggingConfig)
+
+DEFAULT_CONFIG_FILE = Path(__file__).resolve().parent / "default_config.yaml"
+
+_ENV_PATTERN = re.compile(r"\$\{(\w+)(?::-([^}]*))?\}")
+_config_cache: Dict[Tuple, Config] = {}
+_config_lock = threading.Lock()
 
-def load_config() -> Config:
-    """Load configuration with API key from .env file."""
-    # Load default config from YAML
-    config_path = Path(__file__).resolve().parent / "default_config.yaml"
-    if config_path.exists():
-        with open(config_path) as f:
-            config_data = yaml.safe_load(f)
-            return Config(**config_data)
+def expand_env(value: Any) -> Any:
+    """Replace ``${VAR}`` and ``${VAR:-default}`` in every string of a YAML tree.
+
+    Unset variables without a default expand to an empty string, so e.g. a
+    missing ``FIRECRAWL_API_KEY`` is reported as a missing key.
+    """
+    if isinstance(value, str):
+        return _ENV_PATTERN.sub(lambda m: os.getenv(m.group(1), m.group(2) or ""), value)
+    if isinstance(value, dict):
+        return {key: expand_env(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [expand_env(item) for item in value]
+    return value
+
+def merge_overrides(data: Dict[str, Any], overrides: Dict[str, Any]) -> Dict[str, Any]:
+    """Deep-merge ``overrides`` into ``data``; None values are ignored."""
+    merged = dict(data)
+    for key, value in overrides.items():
+        if value is None:
+            continue
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_overrides(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+def load_config(
+    config_file: Optional[Union[str, Path]] = None,
+    overrides: Optional[Dict[str, Any]] = None
+) -> Config:
+    """
+    Load, validate and cache the configuration.
+    
+    Reads ``config_file`` (the packaged default_config.yaml when omitted),
+    expands environment variables from the environment and the closest .env
+    file, deep-merges ``overrides`` such as CLI options, e.g.
+    ``{"scraping": {"max_depth": 2}}``, and validates the result.
+    
+    The validated Config is cached on the file's path and modification time
+    and the overrides, so repeated loads in one process skip the YAML parse
+    and validation. Each call returns its own deep copy, which callers may
+    modify freely.
+    
+    Args:
+        config_file: YAML configuration file
+        overrides: Nested values that take precedence over the file
+    """
+    path = Path(config_file).resolve() if config_file else DEFAULT_CONFIG_FILE
+    try:
+        mtime = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        if config_file:
+            raise
+        mtime = None  # packaged defaults missing: use the model defaults
+    key = (str(path), mtime, json.dumps(overrides or {}, sort_keys=True, default=str))
     
-    return Config() 
\ No newline at end of file
+    with _config_lock:
+        config = _config_cache.get(key)
+        if config is None:
+            load_env()
+            data = {}
+            if mtime is not None:
+                with open(path) as f:
+                    data = expand_env(yaml.safe_load(f) or {})
+            config = Config(**merge_overrides(data, overrides or {}))
+            _config_cache[key] = config
+            logger.debug(f"Loaded configuration from {path}")
+    return config.model_copy(deep=True)
@@ -0,0 +1,111 @@
+"""
+Hybrid crawl: classic fetch and extraction first, Firecrawl only where needed.
+"""
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from rich import print
+
+from config import Config
+from scraper import DocScraper
+
+def import_classic():
+    """Import the classic scraper, which hybrid mode runs first."""
+    import classic  # noqa: F401
+    from doc_scraper.scraper import DocsScraper, ScraperSettings
+    return DocsScraper, ScraperSettings
+
+async def hybrid_scrape(
+    config: Config,
+    url: Optional[str] = None,
+    output_dir: Optional[Path] = None,
+    scraper: Optional[DocScraper] = None
+) -> Dict:
+    """
+    Crawl a site with the classic scraper and render only what it could not read.
+
+    The classic crawl follows links and extracts content without API calls.
+    Pages where it finds no content, or less than ``hybrid.min_content_chars``
+    characters (typically pages rendered client-side), are then scraped with
+    Firecrawl in batches of ``scraping.batch_size`` concurrent requests.
+
+    Args:
+        config: Scraper configuration
+        url: Site to crawl (defaults to config.scraping.base_url)
+        output_dir: Directory for both outputs and the summary
+        scraper: Firecrawl scraper to use for the fallback pages
+    """
+    DocsScraper, ScraperSettings = import_classic()
+    url = url or config.scraping.base_url
+    root = Path(output_dir or config.output.directory or "scraped_docs")
+    root.mkdir(parents=True, exist_ok=True)
+
+    settings = ScraperSettings(
+        base_url=url,
+        save_dir=root,
+        output_file=root / f"{urlparse(url).netloc.split('.')[0]}_docs.md",
+        max_workers=config.hybrid.classic_workers,
+        timeout=config.hybrid.classic_timeout,
+        include_patterns=config.patterns.include,
+        exclude_patterns=config.patterns.exclude,
+        min_content_chars=config.hybrid.min_content_chars,
+        duplicate_action=config.output.duplicate_action,
+        duplicate_distance=config.output.duplicate_distance
+    )
+    if scraper is None:
+        # Created up front so a missing API key fails before the crawl
+        fc_config = config.model_copy(deep=True)
+        fc_config.output.directory = str(root)
+        scraper = DocScraper(fc_config)
+    # Both stages record into one run snapshot, closed with the Firecrawl scraper
+    classic = DocsScraper(settings, show_progress=False, snapshots=scraper.snapshots)
+    started = time.time()
+    # The scraper may be shared, so only count the calls made here
+    counters = scraper.metrics.summary()["counters"]
+    requests_before = counters.get("api_requests", 0)
+    cache_hits_before = counters.get("cache_hits", 0)
+
+    print(f"[blue]Classic crawl of {url}...[/blue]")
+    await asyncio.get_running_loop().run_in_executor(None, classic.scrape)
+    classic_metrics = classic.metrics.summary()["counters"]
+    fallback_urls = list(dict.fromkeys(classic.low_content_urls))
+    print(f"[green]Classic crawl saved {classic_metrics.get('pages_saved', 0)} pages; "
+          f"{len(fallback_urls)} need rendering[/green]")
+
+    rendered: List[Dict] = []
+    failed: List[str] = []
+    batch_size = max(config.scraping.batch_size, 1)
+    for start in range(0, len(fallback_urls), batch_size):
+        batch = fallback_urls[start:start + batch_size]
+        results = await asyncio.gather(*(scraper.scrape_url(page_url) for page_url in batch))
+        for page_url, result in zip(batch, results):
+            if not result or not result.get("markdown"):
+                failed.append(page_url)
+                continue
+            result.setdefault("metadata", {}).setdefault("sourceURL", page_url)
+            rendered.append(result)
+        print(f"[blue]Rendered {min(start + batch_size, len(fallback_urls))}/{len(fallback_urls)} pages[/blue]")
+
+    if rendered:
+        scraper.save_results(rendered, base_filename="rendered")
+    scraper.close()
+    scraper.write_metrics()
+    counters = scraper.metrics.summary()["counters"]
+
+    summary = {
+        "base_url": url,
+        "duration_seconds": round(time.time() - started, 3),
+        "classic_output": str(settings.output_file),
+        "classic_pages_saved": classic_metrics.get("pages_saved", 0),
+        "classic_low_content": len(fallback_urls),
+        "firecrawl_requests": counters.get("api_requests", 0) - requests_before,
+        "firecrawl_cache_hits": counters.get("cache_hits", 0) - cache_hits_before,
+        "firecrawl_pages_saved": len(rendered),
+        "firecrawl_failed": failed,
+    }
+    (root / "hybrid_summary.json").write_text(json.dumps(summary, indent=2))
+    return summary
@@ -3,11 +3,12 @@ import asyncio
 from pathlib import Path
 from firecrawl import FirecrawlApp
 from dotenv import load_dotenv
-import os
-import yaml
 from datetime import datetime
 from rich import print
 
+from cache import ResponseCache
+from config import load_config
+
 # Check .env file location
 def find_env_file():
     """Find and print the location of the .env file being used."""
@@ -34,19 +35,21 @@ env_file = find_env_file()
 if env_file:
     load_dotenv(env_file)
 
-def load_config(config_path="config/default_config.yaml"):
-    """Load configuration from YAML file."""
-    with open(config_path, 'r') as f:
-        config = yaml.safe_load(f)
-        
-        # Handle environment variables
-        if '${FIRECRAWL_API_KEY}' in str(config):
-            api_key = os.getenv('FIRECRAWL_API_KEY')
-            if not api_key:
-                raise ValueError("FIRECRAWL_API_KEY not found in environment variables")
-            config['scraping']['api_key'] = api_key
-            
-        return config
+def create_cache(config):
+    """Response cache from the `cache` section, or None when disabled."""
+    if not config.cache.enabled:
+        return None
+    return ResponseCache(
+        config.cache.directory,
+        ttl_seconds=config.cache.ttl_seconds,
+        max_bytes=config.cache.max_size_mb * 1024 * 1024
+    )
+
+def cached_call(cache, kind, url, params, call, store_if=bool):
+    """Serve a request from the cache when possible, otherwise call the API."""
+    if cache is None:
+        return call()
+    return cache.get_or_call(kind, url, params, call, store_if)
 
 def create_markdown_section(title, url, content):
     """Create a markdown section with proper formatting."""
@@ -79,8 +82,8 @@ async def test_scrape():
     config = load_config()
     
     # Setup variables from config
-    base_url = config['scraping']['base_url']
-    output_dir = Path(config['output']['directory'])
+    base_url = config.scraping.base_url
+    output_dir = Path(config.output.directory or "scraped_docs")
     output_dir.mkdir(exist_ok=True)
     
     test_urls = [
@@ -90,11 +93,12 @@ async def test_scrape():
     ]
     
     # Initialize Firecrawl
-    api_key = config['scraping']['api_key']
+    api_key = config.scraping.api_key
     if not api_key:
         raise ValueError("FIRECRAWL_API_KEY not found in environment variables")
     
     app = FirecrawlApp(api_key=api_key)
+    cache = create_cache(config)
     
     # Prepare merged content if needed
     merged_content = []
@@ -104,32 +108,34 @@ async def test_scrape():
     for url in test_urls:
         try:
             print(f"\nScraping {url}...")
-            result = app.scrape_url(url, params={
-                'formats': config['scraping']['formats'],
-                **config['scraping']['options']
-            })
+            params = {
+                'formats': config.scraping.formats,
+                **config.scraping.options
+            }
+            result = cached_call(cache, "scrape", url, params,
+                                 lambda: app.scrape_url(url, params=params))
             
             if result:
                 title = result.get('metadata', {}).get('title', 'Untitled')
                 content = result.get('markdown', '')
                 
                 # Add to merged content if enabled
-                if config['output']['save_merged_file']:
+                if config.output.save_merged_file:
                     section = create_markdown_section(title, url, content)
                     merged_content.append(section)
                     print(f"✓ Added content to merged file from {url}")
                 
                 # Save individual file if enabled
-                if config['output']['save_individual_pages']:
+                if config.output.save_individual_pages:
                     filename = url.split('/')[-1] or 'index'
-                    if config['output']['add_timestamps']:
+                    if config.output.add_timestamps:
                         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                         filename = f"{filename}_{timestamp}"
                     
                     output_file = output_dir / f"{filename}.md"
                     
                     # Create content with or without metadata
-                    if config['output']['add_metadata']:
+                    if config.output.add_metadata:
                         file_content = create_markdown_file(title, url, content)
                     else:
                         file_content = content
@@ -145,16 +151,19 @@ async def test_scrape():
     try:
         # Start crawl job
         print("Starting crawl job...")
-        crawl_response = app.crawl_url(
-            base_url,
-            params={
-                'limit': config['scraping']['max_pages'],
-                'maxDepth': config['scraping']['max_depth'],
-                'scrapeOptions': {
-                    'formats': config['scraping']['formats'],
-                    **config['scraping']['options']
-                }
+        crawl_params = {
+            'limit': config.scraping.max_pages,
+            'maxDepth': config.scraping.max_depth,
+            'scrapeOptions': {
+                'formats': config.scraping.formats,
+                **config.scraping.options
             }
+        }
+        # Only complete crawls are cached, never a first page of results
+        crawl_response = cached_call(
+            cache, "crawl_response", base_url, crawl_params,
+            lambda: app.crawl_url(base_url, params=crawl_params),
+            store_if=lambda response: isinstance(response, dict) and 'data' in response and not response.get('next')
         )
         
         if isinstance(crawl_response, dict):
@@ -177,23 +186,23 @@ async def test_scrape():
                         continue
                     
                     # Add to merged content if enabled
-                    if config['output']['save_merged_file']:
+                    if config.output.save_merged_file:
                         section = create_markdown_section(title, source_url, content)
                         merged_content.append(section)
                         print(f"✓ Added content to merged file from {source_url}")
                     
                     # Save individual file if enabled
-                    if config['output']['save_individual_pages']:
+                    if config.output.save_individual_pages:
                         # Create filename from URL
                         filename = source_url.replace(base_url, '').strip('/').replace('/', '_') or 'index'
-                        if config['output']['add_timestamps']:
+                        if config.output.add_timestamps:
                             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                             filename = f"{filename}_{timestamp}"
                         
                         output_file = output_dir / f"crawl_{filename}.md"
                         
                         # Create content with or without metadata
-                        if config['output']['add_metadata']:
+                        if config.output.add_metadata:
                             file_content = create_markdown_file(title, source_url, content)
                         else:
                             file_content = content
@@ -210,9 +219,9 @@ async def test_scrape():
             print("Response:", crawl_response)
         
         # Save merged content if enabled
-        if config['output']['save_merged_file'] and merged_content:
+        if config.output.save_merged_file and merged_content:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            merged_filename = f"{config['output']['merged_file_prefix']}_{timestamp}.md"
+            merged_filename = f"{config.output.merged_file_prefix}_{timestamp}.md"
             output_file = output_dir / merged_filename
             
             # Create final document
@@ -2,7 +2,11 @@
 Enhanced documentation scraper using Firecrawl.
 """
 import os
+import json
 import asyncio
+import functools
+import logging
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Dict, List, Optional, Union
 from datetime import datetime
@@ -10,26 +14,137 @@ from datetime import datetime
 from firecrawl import FirecrawlApp
 from rich import print
 from rich.progress import Progress, SpinnerColumn, TextColumn
-from dotenv import load_dotenv
 
-from config import Config
+from cache import ResponseCache
+from config import Config, load_config
+import classic  # noqa: F401  (makes doc_scraper importable from a checkout)
+from doc_scraper.dedup import NearDuplicateIndex
+from doc_scraper.metrics import CrawlMetrics
+from doc_scraper.profiling import SamplingProfiler
+from doc_scraper.snapshots import SnapshotWriter
 
-# Load environment variables
-load_dotenv()
+logger = logging.getLogger(__name__)
+
+def request_progress() -> Progress:
+    """Transient display with a spinner per request in flight."""
+    return Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        transient=True,
+    )
 
 class DocScraper:
     """Enhanced documentation scraper with Firecrawl integration."""
     
-    def __init__(self, config: Config):
-        """Initialize the scraper with configuration."""
+    def __init__(
+        self,
+        config: Config,
+        app: Optional[FirecrawlApp] = None,
+        show_progress: bool = True,
+        progress: Optional[Progress] = None
+    ):
+        """
+        Initialize the scraper with configuration.
+        
+        Args:
+            config: Scraper configuration
+            app: Firecrawl client to reuse (e.g. shared by a multi-site run)
+            show_progress: Show a spinner while requests are in flight
+            progress: Running progress display to add the spinners to (e.g.
+                shared by a multi-site run); by default the scraper starts its
+                own on the first request and stops it in close()
+        """
         self.config = config
         self.api_key = config.scraping.api_key
         if not self.api_key:
             raise ValueError("API key not found in configuration")
         
-        self.app = FirecrawlApp(api_key=self.api_key)
+        self.app = app or FirecrawlApp(api_key=self.api_key)
+        self.show_progress = show_progress
         self.output_dir = Path(config.output.directory or "scraped_docs")
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.duplicates = (
+            NearDuplicateIndex(max_distance=config.output.duplicate_distance)
+            if config.output.duplicate_action else None
+        )
+        self.metrics = CrawlMetrics()
+        self.cache = (
+            ResponseCache(
+                config.cache.directory,
+                ttl_seconds=config.cache.ttl_seconds,
+                max_bytes=config.cache.max_size_mb * 1024 * 1024
+            )
+            if config.cache.enabled else None
+        )
+        self.crawl_complete = False
+        self._checkpointed = 0
+        # Pages restored from a checkpoint whose files an earlier run already wrote
+        self._persisted: Dict[int, Dict] = {}
+        self._partial_checkpoint = False
+        self.quiet = config.logging.quiet
+        self.snapshots = SnapshotWriter(config.output.snapshot_file) if config.output.snapshot_file else None
+        self.progress = progress
+        self._owns_progress = False
+
+    @contextmanager
+    def _spinner(self, description: str):
+        """Spinner task around a request, or nothing when progress is off.
+
+        All requests share one live display, started on first use, instead
+        of rendering a new one per call.
+        """
+        if not self.show_progress:
+            yield
+            return
+        if self.progress is None:
+            self.progress = request_progress()
+            self.progress.start()
+            self._owns_progress = True
+        task = self.progress.add_task(description=description, total=None)
+        try:
+            yield
+        finally:
+            self.progress.remove_task(task)
+
+    def close(self) -> None:
+        """Finish the run snapshot and stop the progress display this scraper started."""
+        if self.snapshots:
+            self.snapshots.close()
+        if self._owns_progress:
+            self.progress.stop()
+            self.progress = None
+            self._owns_progress = False
+
+    async def _call(self, func, *args, **kwargs):
+        """Run a blocking Firecrawl client call without blocking the event loop.
+
+        Every call is counted as ``api_requests``, retries included; responses
+        served from the cache never get here.
+        """
+        self.metrics.inc("api_requests")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+    async def _retry(self, stage: str, func, *args, **kwargs):
+        """``_call`` timed as ``stage``, retried with exponential backoff.
+
+        Makes ``scraping.retry_attempts`` attempts, sleeping ``retry_backoff``
+        seconds after the first failure and doubling the delay each time; the
+        last exception is re-raised.
+        """
+        attempts = max(1, self.config.scraping.retry_attempts)
+        for attempt in range(attempts):
+            try:
+                with self.metrics.stage(stage):
+                    return await self._call(func, *args, **kwargs)
+            except Exception as e:
+                if attempt == attempts - 1:
+                    raise
+                delay = self.config.scraping.retry_backoff * 2 ** attempt
+                self.metrics.inc(f"{stage}_retries")
+                logger.warning(f"{stage} failed ({e}), retrying in {delay:g}s "
+                               f"({attempt + 1}/{attempts - 1})")
+                await asyncio.sleep(delay)
 
     async def scrape_url(self, url: str, formats: List[str] = None) -> Dict:
         """
@@ -42,18 +157,22 @@ class DocScraper:
         try:
             params = {
                 'formats': formats or self.config.scraping.formats,
-                'onlyMainContent': True,
-                'removeBase64Images': True
+                **self.config.scraping.options
             }
             
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                transient=True,
-            ) as progress:
-                progress.add_task(description=f"Scraping {url}...", total=None)
-                result = self.app.scrape_url(url, params=params)
+            if self.cache:
+                cached = self.cache.get("scrape", url, params)
+                if cached is not None:
+                    self.metrics.inc("cache_hits")
+                    return cached
+            
+            with self._spinner(f"Scraping {url}..."):
+                result = await self._retry("scrape_url", self.app.scrape_url, url, params=params)
             
+            if isinstance(result, dict):
+                self.metrics.add_bytes("scrape_url", bytes_out=len(result.get('markdown') or ''))
+                if self.cache and self.cache.set("scrape", url, params, result):
+                    self.metrics.inc("cache_stores")
             return result
         except Exception as e:
             print(f"[red]Error scraping {url}: {str(e)}[/red]")
@@ -70,6 +189,12 @@ class DocScraper:
         """
         Crawl a website and scrape its pages.
         
+        Each page of status results is fetched with retries. Pages collected
+        so far are checkpointed in the output directory together with the
+        ``next`` cursor, so a crawl whose status requests keep failing returns
+        its partial results and a later call with the same arguments resumes
+        from the cursor instead of starting a new crawl job.
+        
         Args:
             url: Base URL to crawl (defaults to config.scraping.base_url)
             max_pages: Maximum number of pages to crawl
@@ -77,43 +202,155 @@ class DocScraper:
             include_paths: List of URL patterns to include
             exclude_paths: List of URL patterns to exclude
         """
-        try:
-            url = url or self.config.scraping.base_url
-            params = {
-                'limit': max_pages or self.config.scraping.max_pages,
-                'maxDepth': max_depth or self.config.scraping.max_depth,
-                'includePaths': include_paths or self.config.patterns.include,
-                'excludePaths': exclude_paths or self.config.patterns.exclude,
-                'scrapeOptions': {
-                    'formats': self.config.scraping.formats,
-                    'onlyMainContent': True,
-                    'removeBase64Images': True
-                }
+        self.crawl_complete = False
+        url = url or self.config.scraping.base_url
+        params = {
+            'limit': max_pages or self.config.scraping.max_pages,
+            'maxDepth': max_depth or self.config.scraping.max_depth,
+            'includePaths': include_paths or self.config.patterns.include,
+            'excludePaths': exclude_paths or self.config.patterns.exclude,
+            'scrapeOptions': {
+                'formats': self.config.scraping.formats,
+                **self.config.scraping.options
             }
+        }
+        results = []
+        try:
+            if self.cache:
+                cached = self.cache.get("crawl", url, params)
+                if cached is not None:
+                    self.metrics.inc("cache_hits")
+                    self.metrics.set_gauge("crawl_results", len(cached))
+                    self.crawl_complete = True
+                    return cached
             
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                transient=True,
-            ) as progress:
-                progress.add_task(description=f"Crawling {url}...", total=None)
-                
-                # Start crawl job
-                crawl_job = self.app.crawl_url(url, params=params, poll_interval=10)
+            with self._spinner(f"Crawling {url}..."):
+                checkpoint = self.load_checkpoint(url, params)
+                if checkpoint:
+                    results, cursor = checkpoint
+                    logger.warning(f"Resuming crawl of {url} from checkpoint ({len(results)} pages)")
+                else:
+                    # Starting a job is not retried: a failed request may still
+                    # have created it, and a second one would be billed again
+                    with self.metrics.stage("crawl_url"):
+                        crawl_job = await self._call(self.app.crawl_url, url, params=params, poll_interval=10)
+                    results.extend(crawl_job.data)
+                    cursor = crawl_job.next
                 
-                # Get results
-                results = []
-                while True:
-                    if not crawl_job.next:
-                        results.extend(crawl_job.data)
-                        break
+                # Follow the pagination cursor, checkpointing after each page
+                while cursor:
+                    self.metrics.set_gauge("crawl_results", len(results))
+                    self.save_checkpoint(url, params, cursor, results)
+                    crawl_job = await self._retry("crawl_status", self.app.get_crawl_status, cursor)
                     results.extend(crawl_job.data)
-                    crawl_job = self.app.get_crawl_status(crawl_job.next)
+                    cursor = crawl_job.next
+                self.metrics.set_gauge("crawl_results", len(results))
             
+            self.crawl_complete = True
+            self.clear_checkpoint()
+            if self.cache:
+                self.cache_crawl(url, params, results)
             return results
         except Exception as e:
             print(f"[red]Error crawling {url}: {str(e)}[/red]")
-            return []
+            if results:
+                logger.warning(f"Keeping {len(results)} pages collected before the error; "
+                               f"run the crawl again to resume from {self.checkpoint_file}")
+                self._partial_checkpoint = self.checkpoint_file.exists()
+            return results
+
+    @property
+    def checkpoint_file(self) -> Path:
+        return self.output_dir / "crawl_checkpoint.json"
+
+    @property
+    def checkpoint_pages_file(self) -> Path:
+        return self.output_dir / "crawl_checkpoint.jsonl"
+
+    def save_checkpoint(self, url: str, params: Dict, cursor: str, results: List[Dict]) -> None:
+        """Record the pagination cursor and the pages collected so far.
+
+        Pages are appended to a JSON Lines file, so each checkpoint only
+        writes the pages that are new since the last one; the small state file
+        is replaced atomically and its page count tells a resume how many of
+        the appended lines belong to the cursor.
+        """
+        written = self._checkpointed
+        if written == 0 or written > len(results):
+            self.checkpoint_pages_file.write_text("")
+            written = 0
+        with open(self.checkpoint_pages_file, "a", encoding="utf-8") as f:
+            for result in results[written:]:
+                f.write(json.dumps(result) + "\n")
+        self._checkpointed = len(results)
+        
+        state = {"url": url, "params": params, "next": cursor, "pages": len(results),
+                 "saved": len(self._persisted), "updated_at": datetime.now().isoformat()}
+        tmp = self.checkpoint_file.with_suffix(".tmp")
+        tmp.write_text(json.dumps(state, indent=2))
+        os.replace(tmp, self.checkpoint_file)
+
+    def load_checkpoint(self, url: str, params: Dict) -> Optional[tuple]:
+        """Pages and cursor of an interrupted crawl of the same request, if any."""
+        try:
+            state = json.loads(self.checkpoint_file.read_text())
+        except (OSError, ValueError):
+            return None
+        if state.get("url") != url or state.get("params") != params or not state.get("next"):
+            return None
+        
+        results = []
+        try:
+            with open(self.checkpoint_pages_file, encoding="utf-8") as f:
+                for line in f:
+                    if len(results) == state["pages"]:
+                        break
+                    results.append(json.loads(line))
+        except (OSError, ValueError) as e:
+            print(f"[red]Ignoring unreadable crawl checkpoint: {str(e)}[/red]")
+            return None
+        if len(results) < state["pages"]:
+            return None
+        self._checkpointed = len(results)
+        self._persisted = {id(result): result for result in results[:state.get("saved", 0)]}
+        return results, state["next"]
+
+    def mark_checkpoint_saved(self) -> None:
+        """Record that every checkpointed page has been written to the output.
+
+        A resumed crawl returns those pages again so the result is complete,
+        but ``save_results`` does not write them a second time.
+        """
+        try:
+            state = json.loads(self.checkpoint_file.read_text())
+            state["saved"] = state["pages"]
+            tmp = self.checkpoint_file.with_suffix(".tmp")
+            tmp.write_text(json.dumps(state, indent=2))
+            os.replace(tmp, self.checkpoint_file)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Could not update crawl checkpoint: {e}")
+
+    def clear_checkpoint(self) -> None:
+        """Remove the checkpoint of a crawl that has completed."""
+        self._checkpointed = 0
+        for path in (self.checkpoint_file, self.checkpoint_pages_file):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def cache_crawl(self, url: str, params: Dict, results: List[Dict]) -> None:
+        """Cache a completed crawl, and each page as a single-page scrape.
+
+        The crawl's scrape options are the same request ``scrape_url`` makes,
+        so later scrapes of any crawled page are served from the cache too.
+        """
+        if self.cache.set("crawl", url, params, results):
+            self.metrics.inc("cache_stores")
+        for result in results:
+            source_url = isinstance(result, dict) and result.get('metadata', {}).get('sourceURL')
+            if source_url:
+                self.cache.set("scrape", source_url, params['scrapeOptions'], result)
 
     def save_results(self, results: Union[Dict, List[Dict]], base_filename: str = "docs") -> None:
         """
@@ -128,6 +365,7 @@ class DocScraper:
         if isinstance(results, dict):
             results = [results]
         
+        saved = 0
         for i, result in enumerate(results):
             if not result:
                 continue
@@ -137,6 +375,21 @@ class DocScraper:
             metadata = result.get('metadata', {})
             source_url = metadata.get('sourceURL', f'page_{i}')
             
+            # Saved by the run that stopped at the checkpoint; only the run
+            # snapshot still needs it
+            if id(result) in self._persisted:
+                self.metrics.inc("pages_already_saved")
+                if self.snapshots:
+                    self.snapshots.add(source_url, markdown)
+                continue
+            
+            # Skip or link near-duplicates of pages already saved
+            original = self.duplicates.add(source_url, markdown) if self.duplicates else None
+            if original:
+                if self.config.output.duplicate_action == "drop":
+                    continue
+                markdown = f"Duplicate of: {original}"
+            
             # Create filename
             filename = f"{base_filename}_{timestamp}_{i}.md"
             filepath = self.output_dir / filename
@@ -153,18 +406,84 @@ date_scraped: {timestamp}
             
             # Save to file
             try:
-                filepath.write_text(content)
-                print(f"[green]Saved content to {filepath}[/green]")
+                with self.metrics.stage("save"):
+                    filepath.write_text(content)
+                self.metrics.add_bytes("save", bytes_in=len(markdown), bytes_out=len(content))
+                self.metrics.inc("pages_saved")
+                saved += 1
+                if self.snapshots:
+                    with self.metrics.stage("snapshot"):
+                        self.snapshots.add(source_url, markdown)
+                if not self.quiet:
+                    print(f"[green]Saved content to {filepath}[/green]")
             except Exception as e:
                 print(f"[red]Error saving to {filepath}: {str(e)}[/red]")
+        
+        if self.quiet:
+            print(f"[green]Saved {saved} files to {self.output_dir}[/green]")
+        if self._partial_checkpoint:
+            self.mark_checkpoint_saved()
+            self._partial_checkpoint = False
 
-async def main(url: str, output_dir: Optional[Path] = None, is_crawl: bool = False):
-    """Main entry point for the scraper."""
-    config = Config(
-        scraping={"base_url": url},
-        output={"directory": str(output_dir) if output_dir else None}
-    )
+    def write_metrics(self) -> None:
+        """Export the run metrics to the configured JSON and Prometheus files."""
+        try:
+            if self.config.output.metrics_file:
+                self.metrics.write_json(self.config.output.metrics_file)
+            if self.config.output.prometheus_file:
+                self.metrics.write_prometheus(self.config.output.prometheus_file, prefix="doc_scraper_fc")
+        except Exception as e:
+            print(f"[red]Error saving metrics: {str(e)}[/red]")
+
+    def save_duplicate_report(self) -> Optional[Path]:
+        """Write the near-duplicate report for this run to the output directory."""
+        if not self.duplicates:
+            return None
+        
+        report = self.duplicates.report()
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filepath = self.output_dir / f"duplicates_{timestamp}.json"
+        try:
+            filepath.write_text(json.dumps(report, indent=2))
+            print(f"[green]Near-duplicates found: {report['duplicate_count']} "
+                  f"(report: {filepath})[/green]")
+        except Exception as e:
+            print(f"[red]Error saving to {filepath}: {str(e)}[/red]")
+            return None
+        return filepath
+
+async def main(
+    url: str,
+    output_dir: Optional[Path] = None,
+    is_crawl: bool = False,
+    metrics_file: Optional[Path] = None,
+    prometheus_file: Optional[Path] = None,
+    profile_file: Optional[Path] = None,
+    config: Optional[Config] = None
+):
+    """
+    Main entry point for the scraper.
+    
+    Args:
+        config: Configuration to run with (loaded with load_config when omitted);
+            the URL and output arguments take precedence over it
+    """
+    output = {
+        "directory": output_dir,
+        "metrics_file": metrics_file,
+        "prometheus_file": prometheus_file
+    }
+    output = {key: str(value) for key, value in output.items() if value}
+    if config is None:
+        config = load_config(overrides={"scraping": {"base_url": url}, "output": output})
+    else:
+        # Copy the already validated sections rather than validating the whole config again
+        config = config.model_copy(update={
+            "scraping": config.scraping.model_copy(update={"base_url": url}),
+            "output": config.output.model_copy(update=output)
+        })
     scraper = DocScraper(config)
+    profiler = SamplingProfiler().start() if profile_file else None
     
     try:
         if is_crawl:
@@ -174,12 +493,20 @@ async def main(url: str, output_dir: Optional[Path] = None, is_crawl: bool = Fal
         
         if results:
             scraper.save_results(results)
+            scraper.save_duplicate_report()
             print("[green]Scraping completed successfully![/green]")
         else:
             print("[yellow]No results found.[/yellow]")
             
     except Exception as e:
         print(f"[red]Error during scraping: {str(e)}[/red]")
+    finally:
+        scraper.close()
+        scraper.write_metrics()
+        if profiler:
+            profiler.stop()
+            report = profiler.write_report(profile_file)
+            print(f"Profile written to: {report['folded']} (summary: {report['summary']})")
 
 if __name__ == "__main__":
     import argparse
@@ -187,7 +514,12 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Enhanced documentation scraper")
     parser.add_argument("url", help="URL to scrape")
     parser.add_argument("--output", "-o", help="Output directory", type=Path)
+    parser.add_argument("--config", help="Configuration file (defaults to config/default_config.yaml)", type=Path)
     parser.add_argument("--crawl", "-c", help="Crawl the site instead of single page scrape", action="store_true")
+    parser.add_argument("--metrics", help="JSON file for the per-stage metrics summary", type=Path)
+    parser.add_argument("--prometheus", help="Prometheus text file for the run metrics", type=Path)
+    parser.add_argument("--profile", help="Collapsed-stack profile of all threads for this run", type=Path)
     
     args = parser.parse_args()
-    asyncio.run(main(args.url, args.output, args.crawl)) 
\ No newline at end of file
+    asyncio.run(main(args.url, args.output, args.crawl, args.metrics, args.prometheus, args.profile,
+                     config=load_config(args.config))) 
\ No newline at end of file
@@ -0,0 +1,153 @@
+"""
+Concurrent crawls of several documentation sites from one process.
+"""
+import asyncio
+import json
+import time
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+import yaml
+from firecrawl import FirecrawlApp
+from rich import print
+
+from config import Config
+from scraper import DocScraper, request_progress
+
+def load_sites(
+    sites_file: Path,
+    base_config: Config,
+    output_dir: Optional[Path] = None,
+    names: Optional[Iterable[str]] = None
+) -> Dict[str, Config]:
+    """
+    Build one configuration per site profile.
+
+    Reads the same profile format as the classic scraper's sites_config.yaml:
+    every top-level key except ``default`` is a site with a ``base_url`` and
+    optional ``include_patterns``, ``exclude_patterns``, ``max_pages`` and
+    ``max_depth``, which become that site's own limits.
+
+    Args:
+        sites_file: YAML file with the site profiles
+        base_config: Configuration shared by every site
+        output_dir: Parent directory for the per-site output directories
+        names: Only load these profiles
+    """
+    with open(sites_file) as f:
+        profiles = yaml.safe_load(f) or {}
+
+    wanted = set(names) if names else None
+    root = Path(output_dir or base_config.output.directory or "scraped_docs")
+    sites = {}
+    for name, profile in profiles.items():
+        if name == "default" or (wanted is not None and name not in wanted):
+            continue
+        if not profile.get("base_url"):
+            print(f"[yellow]Skipping site profile '{name}': no base_url[/yellow]")
+            continue
+
+        config = base_config.model_copy(deep=True)
+        config.scraping.base_url = profile["base_url"]
+        for key in ("max_pages", "max_depth"):
+            if key in profile:
+                setattr(config.scraping, key, profile[key])
+        if "include_patterns" in profile:
+            config.patterns.include = profile["include_patterns"]
+        if "exclude_patterns" in profile:
+            config.patterns.exclude = profile["exclude_patterns"]
+        config.output.directory = str(root / name)
+        sites[name] = config
+
+    if wanted and wanted - set(sites):
+        raise ValueError(f"Unknown or incomplete site profiles: {', '.join(sorted(wanted - set(sites)))}")
+    return sites
+
+async def scrape_all(
+    sites: Dict[str, Config],
+    max_concurrent: int = 3,
+    summary_file: Optional[Path] = None,
+    show_progress: bool = False
+) -> Dict:
+    """
+    Crawl every site concurrently with one shared Firecrawl client.
+
+    At most ``max_concurrent`` crawl jobs run at once across all sites, while
+    each site keeps its own page and depth limits and output directory.
+
+    Args:
+        sites: Site name to configuration, as returned by load_sites
+        max_concurrent: Maximum number of crawl jobs in flight
+        summary_file: Where to write the combined run summary
+        show_progress: Show one shared display with a spinner per running crawl
+    """
+    if not sites:
+        return {
+            "duration_seconds": 0.0,
+            "max_concurrent": max_concurrent,
+            "sites": [],
+            "totals": {"sites": 0, "failed": 0, "pages": 0},
+        }
+
+    app = FirecrawlApp(api_key=next(iter(sites.values())).scraping.api_key)
+    limit = asyncio.Semaphore(max_concurrent)
+
+    async def run_site(name: str, config: Config) -> Dict:
+        async with limit:
+            started = time.time()
+            try:
+                scraper = DocScraper(config, app=app, show_progress=show_progress, progress=progress)
+                try:
+                    results = await scraper.crawl_site()
+                    if results:
+                        scraper.save_results(results, base_filename=name)
+                finally:
+                    scraper.close()
+            except Exception as e:
+                # One failing site must not lose the other sites' summaries
+                print(f"[red]Site {name} failed: {e}[/red]")
+                return {
+                    "site": name,
+                    "base_url": config.scraping.base_url,
+                    "output_dir": config.output.directory,
+                    "status": "failed",
+                    "error": str(e),
+                    "pages": 0,
+                    "errors": 1,
+                    "duration_seconds": round(time.time() - started, 3),
+                }
+            metrics = scraper.metrics.summary()
+            errors = sum(stage["errors"] for stage in metrics["stages"].values())
+            print(f"[green]Finished {name}: {len(results)} pages[/green]")
+            return {
+                "site": name,
+                "base_url": config.scraping.base_url,
+                "output_dir": str(scraper.output_dir),
+                "status": (
+                    "failed" if errors and not results
+                    else "ok" if scraper.crawl_complete else "partial"
+                ),
+                "error": None,
+                "pages": len(results),
+                "errors": errors,
+                "duration_seconds": round(time.time() - started, 3),
+            }
+
+    started = time.time()
+    progress = request_progress() if show_progress else None
+    with progress if progress is not None else nullcontext():
+        results = await asyncio.gather(*(run_site(name, config) for name, config in sites.items()))
+    summary = {
+        "duration_seconds": round(time.time() - started, 3),
+        "max_concurrent": max_concurrent,
+        "sites": list(results),
+        "totals": {
+            "sites": len(results),
+            "failed": sum(1 for result in results if result["status"] != "ok"),
+            "pages": sum(result["pages"] for result in results),
+        },
+    }
+    if summary_file:
+        Path(summary_file).write_text(json.dumps(summary, indent=2))
+    return summary
@@ -0,0 +1,12 @@
+"""
+Shared fixtures for the Firecrawl scraper tests.
+"""
+import pytest
+from unittest.mock import patch, MagicMock
+
+@pytest.fixture
+def mock_firecrawl_client():
+    with patch("scraper.FirecrawlApp") as mock_client:
+        mock_instance = MagicMock()
+        mock_client.return_value = mock_instance
+        yield mock_instance
@@ -0,0 +1,86 @@
+"""
+Tests for the Firecrawl response cache.
+"""
+import os
+import json
+import time
+import pytest
+from unittest.mock import MagicMock
+
+from cache import ResponseCache
+from config import Config
+from scraper import DocScraper
+
+@pytest.fixture
+def config(tmp_path):
+    return Config(
+        scraping={"base_url": "https://docs.example.com", "api_key": "test-key"},
+        output={"directory": str(tmp_path / "output")},
+        cache={"enabled": True, "directory": str(tmp_path / "cache")}
+    )
+
+def test_cache_key_ignores_parameter_order(tmp_path):
+    """Test that identical requests share an entry and other params miss."""
+    cache = ResponseCache(tmp_path)
+    cache.set("scrape", "https://a", {"formats": ["markdown"], "onlyMainContent": True}, {"markdown": "A"})
+
+    assert cache.get("scrape", "https://a", {"onlyMainContent": True, "formats": ["markdown"]}) == {"markdown": "A"}
+    assert cache.get("scrape", "https://a", {"formats": ["html"]}) is None
+    assert cache.stats["hits"] == 1 and cache.stats["misses"] == 1
+
+def test_cache_ttl_and_lru_eviction(tmp_path):
+    """Test that expired entries miss and the least recently used are evicted."""
+    cache = ResponseCache(tmp_path, ttl_seconds=60, max_bytes=2000)
+    cache.set("scrape", "https://old", None, {"markdown": "x"})
+    entry = next(tmp_path.glob("*/*.json"))
+    data = json.loads(entry.read_text())
+    data["stored_at"] -= 120
+    entry.write_text(json.dumps(data))
+    assert cache.get("scrape", "https://old") is None
+
+    for i in range(3):
+        cache.set("scrape", f"https://page/{i}", None, {"markdown": "x" * 500})
+        path = cache._path(cache.key("scrape", f"https://page/{i}"))
+        os.utime(path, (time.time() - 100 + i, time.time() - 100 + i))
+    # Reading page 0 makes it the most recently used entry
+    assert cache.get("scrape", "https://page/0")
+    cache.set("scrape", "https://page/3", None, {"markdown": "x" * 500})
+
+    assert cache.get("scrape", "https://page/1") is None
+    assert cache.get("scrape", "https://page/0") is not None
+    assert cache.get("scrape", "https://page/3") is not None
+    assert cache.stats["evictions"] >= 1
+
+@pytest.mark.asyncio
+async def test_scrape_url_uses_cache(mock_firecrawl_client, config):
+    """Test that a repeated scrape is served without calling the API."""
+    # Setup
+    mock_firecrawl_client.scrape_url.return_value = {"markdown": "# Page", "metadata": {"title": "Page"}}
+
+    # Execute
+    first = await DocScraper(config).scrape_url("https://docs.example.com/page")
+    scraper = DocScraper(config)
+    second = await scraper.scrape_url("https://docs.example.com/page")
+
+    # Assert
+    assert first == second
+    mock_firecrawl_client.scrape_url.assert_called_once()
+    assert scraper.metrics.summary()["counters"]["cache_hits"] == 1
+
+@pytest.mark.asyncio
+async def test_crawl_seeds_scrape_cache(mock_firecrawl_client, config):
+    """Test that a completed crawl is cached and its pages serve later scrapes."""
+    # Setup
+    page = {"markdown": "# Guide", "metadata": {"sourceURL": "https://docs.example.com/guide"}}
+    mock_firecrawl_client.crawl_url.return_value = MagicMock(data=[page], next=None)
+
+    # Execute
+    scraper = DocScraper(config)
+    assert await scraper.crawl_site() == [page]
+    assert await scraper.crawl_site() == [page]
+    scraped = await scraper.scrape_url("https://docs.example.com/guide")
+
+    # Assert
+    mock_firecrawl_client.crawl_url.assert_called_once()
+    mock_firecrawl_client.scrape_url.assert_not_called()
+    assert scraped == page
@@ -0,0 +1,27 @@
+"""
+Tests for the command-line interface.
+"""
+import subprocess
+import sys
+from pathlib import Path
+
+PACKAGE_DIR = Path(__file__).resolve().parents[1]
+
+def test_cli_import_skips_heavy_dependencies():
+    """Test that importing the CLI neither loads firecrawl nor reads .env files."""
+    code = (
+        "import sys, cli; "
+        "print(sorted(m for m in ('firecrawl', 'dotenv', 'scraper', 'config') if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=PACKAGE_DIR, capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "[]"
+
+def test_version_command():
+    """Test that the version command runs from the package directory."""
+    result = subprocess.run(
+        [sys.executable, "cli.py", "version"], cwd=PACKAGE_DIR, capture_output=True, text=True
+    )
+    assert result.returncode == 0
+    assert "doc-scraper-fc version" in result.stdout
@@ -0,0 +1,77 @@
+"""
+Tests for configuration loading.
+"""
+import os
+import pytest
+from unittest.mock import patch, MagicMock
+
+import config as config_module
+from config import load_config
+from scraper import DocScraper, main
+
+CONFIG_YAML = """
+scraping:
+  api_key: ${TEST_FC_API_KEY}
+  base_url: "${TEST_FC_BASE_URL:-https://docs.example.com}"
+  max_depth: 2
+output:
+  directory: "out"
+  save_merged_file: false
+"""
+
+@pytest.fixture
+def config_file(tmp_path, monkeypatch):
+    monkeypatch.setenv("TEST_FC_API_KEY", "secret-key")
+    monkeypatch.delenv("TEST_FC_BASE_URL", raising=False)
+    path = tmp_path / "config.yaml"
+    path.write_text(CONFIG_YAML)
+    return path
+
+def test_load_config_expands_env_and_merges_overrides(config_file):
+    """Test that ${VAR} references are expanded and overrides win over the file."""
+    config = load_config(config_file, overrides={"scraping": {"max_depth": 5, "batch_size": None}})
+
+    assert config.scraping.api_key == "secret-key"
+    assert config.scraping.base_url == "https://docs.example.com"
+    assert config.scraping.max_depth == 5
+    assert config.scraping.batch_size == 10
+    assert config.output.save_merged_file is False
+
+def test_load_config_caches_validated_config(config_file):
+    """Test that unchanged files are parsed once and callers get independent copies."""
+    with patch.object(config_module.yaml, "safe_load", wraps=config_module.yaml.safe_load) as safe_load:
+        first = load_config(config_file)
+        first.scraping.max_depth = 9
+        second = load_config(config_file)
+        assert safe_load.call_count == 1
+        assert second.scraping.max_depth == 2
+
+        config_file.write_text(CONFIG_YAML.replace("max_depth: 2", "max_depth: 4"))
+        stat = config_file.stat()
+        os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert load_config(config_file).scraping.max_depth == 4
+        assert safe_load.call_count == 2
+
+@pytest.mark.asyncio
+async def test_main_runs_with_given_config(config_file, tmp_path):
+    """Test that main crawls with the loaded config instead of building its own."""
+    # Setup
+    config = load_config(config_file, overrides={"scraping": {"max_depth": 1}})
+    with patch("scraper.FirecrawlApp") as mock_client, \
+         patch("scraper.DocScraper", wraps=DocScraper) as mock_scraper:
+        mock_instance = MagicMock()
+        mock_client.return_value = mock_instance
+        mock_instance.crawl_url.return_value = MagicMock(data=[], next=None)
+
+        # Execute
+        await main("https://docs.example.com/v2", tmp_path, is_crawl=True, config=config)
+
+    # Assert
+    mock_client.assert_called_once_with(api_key="secret-key")
+    params = mock_instance.crawl_url.call_args.kwargs["params"]
+    assert params["maxDepth"] == 1
+    run_config = mock_scraper.call_args.args[0]
+    assert run_config.scraping.base_url == "https://docs.example.com/v2"
+    assert run_config.output.directory == str(tmp_path)
+    assert run_config.output.save_merged_file is False
+    assert config.output.directory == "out"  # the caller's config is left as it was
@@ -0,0 +1,116 @@
+"""
+Tests for the hybrid classic + Firecrawl mode.
+"""
+import json
+import pytest
+
+from config import Config
+from hybrid import hybrid_scrape, import_classic
+
+DocsScraper, _ = import_classic()
+
+PAGES = {
+    "https://docs.example.com/": (
+        "<article><p>" + "Plenty of server-rendered text. " * 20 + "</p>"
+        "<a href='/docs/guide'>Guide</a><a href='/docs/app'>App</a><a href='/docs/widget'>Widget</a></article>"
+    ),
+    "https://docs.example.com/docs/guide": "<article><p>" + "Guide content rendered on the server. " * 20 + "</p></article>",
+    # Client-side rendered pages: an empty shell and a loading placeholder
+    "https://docs.example.com/docs/app": "<div id='root'></div><script src='/app.js'></script>",
+    "https://docs.example.com/docs/widget": "<article><p>Loading...</p></article>",
+}
+
+@pytest.fixture
+def config(tmp_path):
+    return Config(
+        scraping={"base_url": "https://docs.example.com/", "api_key": "test-key", "batch_size": 1},
+        output={"directory": str(tmp_path)},
+        hybrid={"min_content_chars": 100}
+    )
+
+@pytest.mark.asyncio
+async def test_hybrid_renders_only_low_content_pages(mock_firecrawl_client, config, tmp_path, monkeypatch):
+    """Test that only pages the classic crawl could not read go to Firecrawl."""
+    # Setup
+    monkeypatch.setattr(DocsScraper, "fetch_page", lambda self, url: PAGES[url])
+    mock_firecrawl_client.scrape_url.side_effect = lambda url, params: (
+        {"markdown": f"# Rendered {url}", "metadata": {"title": "App"}} if url.endswith("/app") else None
+    )
+
+    # Execute
+    summary = await hybrid_scrape(config)
+
+    # Assert
+    requested = sorted(call.args[0] for call in mock_firecrawl_client.scrape_url.call_args_list)
+    assert requested == ["https://docs.example.com/docs/app", "https://docs.example.com/docs/widget"]
+    assert summary["classic_pages_saved"] == 2
+    assert summary["firecrawl_pages_saved"] == 1
+    assert summary["firecrawl_failed"] == ["https://docs.example.com/docs/widget"]
+    classic_output = (tmp_path / "docs_docs.md").read_text()
+    assert "Guide content" in classic_output
+    assert "Loading" not in classic_output
+    rendered = list(tmp_path.glob("rendered_*.md"))
+    assert len(rendered) == 1
+    assert "source_url: https://docs.example.com/docs/app" in rendered[0].read_text()
+    assert json.loads((tmp_path / "hybrid_summary.json").read_text())["firecrawl_requests"] == 2
+
+@pytest.mark.asyncio
+async def test_hybrid_counts_only_uncached_requests(mock_firecrawl_client, config, tmp_path, monkeypatch):
+    """Test that pages served from the response cache are not reported as Firecrawl requests."""
+    # Setup
+    monkeypatch.setattr(DocsScraper, "fetch_page", lambda self, url: PAGES[url])
+    mock_firecrawl_client.scrape_url.side_effect = lambda url, params: (
+        {"markdown": f"# Rendered {url}", "metadata": {"title": "App"}} if url.endswith("/app") else None
+    )
+    config.cache.enabled = True
+    config.cache.directory = str(tmp_path / "cache")
+
+    # Execute
+    first = await hybrid_scrape(config)
+    second = await hybrid_scrape(config)
+
+    # Assert: the rendered page is cached, the failed one is requested again
+    assert (first["firecrawl_requests"], first["firecrawl_cache_hits"]) == (2, 0)
+    assert (second["firecrawl_requests"], second["firecrawl_cache_hits"]) == (1, 1)
+    assert mock_firecrawl_client.scrape_url.call_count == 3
+
+@pytest.mark.asyncio
+async def test_hybrid_follows_links_of_shell_pages(mock_firecrawl_client, config, monkeypatch):
+    """Test that links in the navigation of a client-rendered shell page are still crawled."""
+    # Setup: every page is an empty shell, only the start page has navigation
+    nav = "<nav><a href='/docs/one.html'>One</a><a href='/docs/two.html'>Two</a></nav>"
+    shells = {
+        "https://docs.example.com/": f"{nav}<div id='root'></div>",
+        "https://docs.example.com/docs/one.html": "<div id='root'></div>",
+        "https://docs.example.com/docs/two.html": "<div id='root'></div>",
+    }
+    monkeypatch.setattr(DocsScraper, "fetch_page", lambda self, url: shells[url])
+    mock_firecrawl_client.scrape_url.side_effect = lambda url, params: {"markdown": f"# Rendered {url}"}
+
+    # Execute
+    summary = await hybrid_scrape(config)
+
+    # Assert
+    requested = sorted(call.args[0] for call in mock_firecrawl_client.scrape_url.call_args_list)
+    assert requested == sorted(shells)
+    assert summary["classic_low_content"] == 3
+    assert summary["firecrawl_pages_saved"] == 3
+
+@pytest.mark.asyncio
+async def test_hybrid_snapshot_records_both_stages(mock_firecrawl_client, config, tmp_path, monkeypatch):
+    """Test that classic and rendered pages end up in one run snapshot."""
+    # Setup
+    monkeypatch.setattr(DocsScraper, "fetch_page", lambda self, url: PAGES[url])
+    mock_firecrawl_client.scrape_url.side_effect = lambda url, params: (
+        {"markdown": f"# Rendered {url}", "metadata": {"title": "App"}} if url.endswith("/app") else None
+    )
+    config.output.snapshot_file = str(tmp_path / "run.jsonl")
+
+    # Execute
+    await hybrid_scrape(config)
+
+    # Assert
+    records = [json.loads(line) for line in (tmp_path / "run.jsonl").read_text().splitlines()]
+    assert sorted(record["url"] for record in records) == [
+        "https://docs.example.com/", "https://docs.example.com/docs/app", "https://docs.example.com/docs/guide"
+    ]
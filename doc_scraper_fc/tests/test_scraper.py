@@ -1,7 +1,9 @@
 """
 Tests for the enhanced documentation scraper.
 """
+import asyncio
 import os
+import json
 import pytest
 from pathlib import Path
 from unittest.mock import AsyncMock, patch, MagicMock
@@ -9,13 +11,6 @@ from unittest.mock import AsyncMock, patch, MagicMock
 from scraper import DocScraper
 from config import Config
 
-@pytest.fixture
-def mock_firecrawl_client():
-    with patch("scraper.FirecrawlApp") as mock_client:
-        mock_instance = MagicMock()
-        mock_client.return_value = mock_instance
-        yield mock_instance
-
 @pytest.fixture
 def config():
     return Config(
@@ -122,4 +117,160 @@ async def test_full_scrape_flow(mock_firecrawl_client, config, tmp_path):
     content = saved_files[0].read_text()
     assert "# Test Content" in content
     assert "Test Page" in content
-    assert "https://docs.example.com/test" in content
\ No newline at end of file
+    assert "https://docs.example.com/test" in content
+
+@pytest.mark.asyncio
+async def test_save_results_drops_near_duplicates(mock_firecrawl_client, config, tmp_path):
+    """Test that near-duplicate pages are not saved twice."""
+    # Setup
+    config.output.directory = str(tmp_path)
+    config.output.duplicate_action = "drop"
+    markdown = " ".join(f"word{i}" for i in range(50))
+    results = [
+        {"markdown": markdown, "metadata": {"title": "V1", "sourceURL": "https://docs.example.com/v1/page"}},
+        {"markdown": markdown, "metadata": {"title": "V2", "sourceURL": "https://docs.example.com/v2/page"}}
+    ]
+    
+    # Execute
+    scraper = DocScraper(config)
+    scraper.save_results(results)
+    report_file = scraper.save_duplicate_report()
+    
+    # Assert
+    assert len(list(tmp_path.glob("*.md"))) == 1
+    assert "https://docs.example.com/v2/page" in report_file.read_text()
+
+
+@pytest.mark.asyncio
+async def test_crawl_metrics(mock_firecrawl_client, config, tmp_path):
+    """Test that Firecrawl calls are recorded per stage and exported."""
+    # Setup
+    config.output.metrics_file = str(tmp_path / "metrics.json")
+    first_page = MagicMock(data=[{"markdown": "# Page 1"}], next="cursor-1")
+    last_page = MagicMock(data=[{"markdown": "# Page 2"}], next=None)
+    mock_firecrawl_client.crawl_url.return_value = first_page
+    mock_firecrawl_client.get_crawl_status.return_value = last_page
+    
+    # Execute
+    scraper = DocScraper(config)
+    await scraper.crawl_site()
+    scraper.write_metrics()
+    
+    # Assert
+    summary = json.loads((tmp_path / "metrics.json").read_text())
+    assert summary["stages"]["crawl_url"]["latency"]["count"] == 1
+    assert summary["stages"]["crawl_status"]["latency"]["count"] == 1
+    assert summary["gauges"]["crawl_results"]["last"] == 2
+
+@pytest.mark.asyncio
+async def test_scrape_url_retries(mock_firecrawl_client, config):
+    """Test that a failed scrape is retried before giving up."""
+    # Setup
+    config.scraping.retry_backoff = 0
+    mock_firecrawl_client.scrape_url.side_effect = [Exception("502 Bad Gateway"), {"markdown": "# Page"}]
+    
+    # Execute
+    scraper = DocScraper(config)
+    result = await scraper.scrape_url("https://docs.example.com/page")
+    
+    # Assert
+    assert result == {"markdown": "# Page"}
+    assert mock_firecrawl_client.scrape_url.call_count == 2
+    assert scraper.metrics.summary()["counters"]["scrape_url_retries"] == 1
+
+@pytest.mark.asyncio
+async def test_crawl_keeps_partial_results_and_resumes(mock_firecrawl_client, config, tmp_path):
+    """Test that a failing status page keeps earlier pages and a rerun resumes from the cursor."""
+    # Setup
+    config.output.directory = str(tmp_path)
+    config.scraping.retry_backoff = 0
+    first_page = MagicMock(data=[{"markdown": "# Page 1"}], next="cursor-1")
+    second_page = MagicMock(data=[{"markdown": "# Page 2"}], next="cursor-2")
+    last_page = MagicMock(data=[{"markdown": "# Page 3"}], next=None)
+    mock_firecrawl_client.crawl_url.return_value = first_page
+    mock_firecrawl_client.get_crawl_status.side_effect = (
+        [second_page] + [Exception("timeout")] * 3 + [last_page]
+    )
+    
+    # Execute
+    scraper = DocScraper(config)
+    partial = await scraper.crawl_site()
+    checkpoint = json.loads((tmp_path / "crawl_checkpoint.json").read_text())
+    resumed_scraper = DocScraper(config)
+    resumed = await resumed_scraper.crawl_site()
+    
+    # Assert
+    assert partial == [{"markdown": "# Page 1"}, {"markdown": "# Page 2"}]
+    assert not scraper.crawl_complete
+    assert checkpoint["next"] == "cursor-2" and checkpoint["pages"] == 2
+    assert resumed == partial + [{"markdown": "# Page 3"}]
+    assert resumed_scraper.crawl_complete
+    mock_firecrawl_client.crawl_url.assert_called_once()
+    assert mock_firecrawl_client.get_crawl_status.call_args_list[-1].args == ("cursor-2",)
+    assert not (tmp_path / "crawl_checkpoint.json").exists()
+    assert not (tmp_path / "crawl_checkpoint.jsonl").exists()
+
+@pytest.mark.asyncio
+async def test_requests_share_one_progress_display(mock_firecrawl_client, config):
+    """Test that concurrent scrapes add spinner tasks to a single live display."""
+    # Setup
+    mock_firecrawl_client.scrape_url.return_value = {"markdown": "# Page"}
+    
+    # Execute
+    with patch("scraper.Progress") as mock_progress:
+        scraper = DocScraper(config)
+        await asyncio.gather(*(scraper.scrape_url(f"https://docs.example.com/{i}") for i in range(3)))
+        await scraper.scrape_url("https://docs.example.com/last")
+        scraper.close()
+    
+    # Assert
+    mock_progress.assert_called_once()
+    progress = mock_progress.return_value
+    progress.start.assert_called_once()
+    assert progress.add_task.call_count == 4
+    assert progress.remove_task.call_count == 4
+    progress.stop.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_quiet_save_prints_one_summary(mock_firecrawl_client, config, tmp_path, capsys):
+    """Test that quiet mode replaces the per-file messages with one summary line."""
+    # Setup
+    config.output.directory = str(tmp_path)
+    config.logging.quiet = True
+    results = [{"markdown": f"# Page {i}", "metadata": {"sourceURL": f"https://docs.example.com/{i}"}}
+               for i in range(5)]
+    
+    # Execute
+    DocScraper(config).save_results(results)
+    
+    # Assert
+    output = capsys.readouterr().out
+    assert "Saved content to" not in output
+    assert "Saved 5 files to" in output
+    assert len(list(tmp_path.glob("*.md"))) == 5
+
+@pytest.mark.asyncio
+async def test_resumed_crawl_does_not_save_checkpointed_pages_again(mock_firecrawl_client, config, tmp_path):
+    """Test that pages saved after a partial crawl are not written again by the resumed run."""
+    # Setup
+    config.output.directory = str(tmp_path)
+    config.scraping.retry_backoff = 0
+    config.scraping.retry_attempts = 1
+    mock_firecrawl_client.crawl_url.return_value = MagicMock(data=[{"markdown": "# Page 1"}], next="cursor-1")
+    mock_firecrawl_client.get_crawl_status.side_effect = [
+        Exception("timeout"), MagicMock(data=[{"markdown": "# Page 2"}], next=None)
+    ]
+    
+    # Execute
+    scraper = DocScraper(config)
+    scraper.save_results(await scraper.crawl_site(), base_filename="partial")
+    resumed_scraper = DocScraper(config)
+    resumed = await resumed_scraper.crawl_site()
+    resumed_scraper.save_results(resumed, base_filename="resumed")
+    
+    # Assert
+    assert len(resumed) == 2
+    assert [path.read_text().split("---")[-1].strip() for path in sorted(tmp_path.glob("*.md"))] == [
+        "# Page 1", "# Page 2"
+    ]
+    assert resumed_scraper.metrics.summary()["counters"]["pages_already_saved"] == 1
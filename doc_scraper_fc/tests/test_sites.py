@@ -0,0 +1,89 @@
+"""
+Tests for multi-site crawls.
+"""
+import json
+import pytest
+from unittest.mock import patch, MagicMock
+
+from config import Config
+from sites import load_sites, scrape_all
+
+SITES_YAML = """
+default:
+  base_url: "https://docs.example.com"
+
+alpha:
+  base_url: "https://alpha.example.com"
+  max_pages: 5
+  include_patterns: ["/docs/"]
+
+beta:
+  base_url: "https://beta.example.com"
+"""
+
+@pytest.fixture
+def config():
+    return Config(scraping={"api_key": "test-key", "max_pages": 10})
+
+def test_load_sites(config, tmp_path):
+    """Test that each profile gets its own limits and output directory."""
+    sites_file = tmp_path / "sites.yaml"
+    sites_file.write_text(SITES_YAML)
+    
+    sites = load_sites(sites_file, config, tmp_path)
+    
+    assert sorted(sites) == ["alpha", "beta"]
+    assert sites["alpha"].scraping.max_pages == 5
+    assert sites["alpha"].patterns.include == ["/docs/"]
+    assert sites["beta"].scraping.max_pages == 10
+    assert sites["beta"].output.directory == str(tmp_path / "beta")
+    assert config.scraping.base_url == ""
+
+@pytest.mark.asyncio
+async def test_scrape_all(config, tmp_path):
+    """Test that all sites are crawled with one shared client and summarized."""
+    sites_file = tmp_path / "sites.yaml"
+    sites_file.write_text(SITES_YAML)
+    sites = load_sites(sites_file, config, tmp_path)
+    
+    with patch("sites.FirecrawlApp") as mock_client:
+        client = MagicMock()
+        client.crawl_url.return_value = MagicMock(
+            data=[{"markdown": "# Page", "metadata": {"title": "Page", "sourceURL": "https://x"}}],
+            next=None
+        )
+        mock_client.return_value = client
+        summary = await scrape_all(sites, max_concurrent=2, summary_file=tmp_path / "run_summary.json")
+    
+    mock_client.assert_called_once()
+    assert client.crawl_url.call_count == 2
+    assert summary["totals"] == {"sites": 2, "failed": 0, "pages": 2}
+    assert len(list((tmp_path / "alpha").glob("alpha_*.md"))) == 1
+    assert json.loads((tmp_path / "run_summary.json").read_text())["totals"]["pages"] == 2
+
+@pytest.mark.asyncio
+async def test_scrape_all_isolates_a_failing_site(config, tmp_path):
+    """Test that one failing site is recorded as failed while the others are saved."""
+    sites_file = tmp_path / "sites.yaml"
+    sites_file.write_text(SITES_YAML)
+    sites = load_sites(sites_file, config, tmp_path)
+    # Setup: beta's output directory cannot be created
+    (tmp_path / "beta").write_text("not a directory")
+    
+    # Execute
+    with patch("sites.FirecrawlApp") as mock_client:
+        client = MagicMock()
+        client.crawl_url.return_value = MagicMock(
+            data=[{"markdown": "# Page", "metadata": {"title": "Page", "sourceURL": "https://x"}}],
+            next=None
+        )
+        mock_client.return_value = client
+        summary = await scrape_all(sites, max_concurrent=2, summary_file=tmp_path / "run_summary.json")
+    
+    # Assert
+    results = {site["site"]: site for site in summary["sites"]}
+    assert results["alpha"]["status"] == "ok"
+    assert results["beta"]["status"] == "failed"
+    assert results["beta"]["error"]
+    assert summary["totals"] == {"sites": 2, "failed": 1, "pages": 1}
+    assert json.loads((tmp_path / "run_summary.json").read_text())["totals"]["failed"] == 1
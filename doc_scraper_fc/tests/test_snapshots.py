@@ -0,0 +1,48 @@
+"""
+Tests for run snapshots and section diffs.
+"""
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from config import Config
+from scraper import DocScraper
+
+PACKAGE_DIR = Path(__file__).resolve().parents[1]
+
+def run(tmp_path, name, pages):
+    config = Config(
+        scraping={"base_url": "https://docs.example.com", "api_key": "test-key"},
+        output={"directory": str(tmp_path / name), "snapshot_file": str(tmp_path / f"{name}.jsonl")}
+    )
+    scraper = DocScraper(config, show_progress=False)
+    scraper.save_results([
+        {"markdown": markdown, "metadata": {"sourceURL": f"https://docs.example.com/{url}"}}
+        for url, markdown in pages.items()
+    ])
+    scraper.close()
+    return tmp_path / f"{name}.jsonl"
+
+def test_diff_command_reports_changed_sections(mock_firecrawl_client, tmp_path):
+    """Test that snapshots of two runs are compared section by section."""
+    # Setup
+    old = run(tmp_path, "old", {"guide": "# Guide\nintro\n## Setup\npip install x", "faq": "# FAQ\nnone"})
+    new = run(tmp_path, "new", {"guide": "# Guide\nintro\n## Setup\nuv add x", "api": "# API\nendpoints"})
+
+    # Execute
+    result = subprocess.run(
+        [sys.executable, "cli.py", "diff", str(old), str(new)],
+        cwd=PACKAGE_DIR, capture_output=True, text=True
+    )
+
+    # Assert
+    assert result.returncode == 0, result.stderr
+    report = json.loads(result.stdout)
+    assert report["pages"] == {"added": 1, "removed": 1, "modified": 1, "unchanged": 0}
+    changes = {change["url"].rsplit("/", 1)[1]: change for change in report["changes"]}
+    assert changes["guide"]["modified"] == ["Guide > Setup"]
+    assert changes["api"]["added"] == ["API"]
+    assert changes["faq"]["removed"] == ["FAQ"]